@@ -0,0 +1,347 @@
+import datetime
+import decimal
+
+import numpy as np
+
+# Integers up to this magnitude convert to float64 exactly
+FLOAT_EXACT_LIMIT = 2 ** 53
+
+
+class StringColumn:
+    """
+    Strings stored Arrow-style as one UTF-8 buffer plus an offsets array, so a
+    column of a million values costs two allocations instead of a million str objects.
+    """
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_values(cls, values):
+        encoded = [b"" if value is None else value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.offsets.nbytes
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode("utf-8")
+
+    def to_list(self):
+        data = self.data.tobytes()
+        offsets = self.offsets.tolist()
+        return [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def take(self, indices):
+        """Gather the strings at the given positions into a new column without decoding them."""
+        starts = self.offsets[indices]
+        lengths = self.offsets[indices + 1] - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Byte positions of every gathered string, laid out back to back
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return StringColumn(self.data[positions], offsets)
+
+    @classmethod
+    def concatenate(cls, columns):
+        data = np.concatenate([column.data for column in columns])
+        offsets = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for column in columns:
+            offsets.append(column.offsets[1:] + base)
+            base += column.offsets[-1]
+        return cls(data, np.concatenate(offsets))
+
+
+def column_array(values):
+    """
+    Convert the fetched values of one column to compact typed storage. Numbers
+    only become float64 when that keeps them exact: Decimals, and integers too
+    large for a float mixed with floats, stay Python objects so keys and filters
+    compare the values Oracle stored.
+    :return: Tuple of the array (NumPy or StringColumn) and a boolean null mask, or None if there are no nulls.
+    """
+    present = [value for value in values if value is not None]
+    nulls = np.fromiter((value is None for value in values), dtype=bool, count=len(values)) \
+        if len(present) < len(values) else None
+
+    if present and all(isinstance(value, str) for value in present):
+        return StringColumn.from_values(values), nulls
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        try:
+            return np.array([0 if value is None else value for value in values], dtype=np.int64), nulls
+        except OverflowError:
+            pass
+    elif all(isinstance(value, float) or (isinstance(value, int) and not isinstance(value, bool)
+                                          and -FLOAT_EXACT_LIMIT <= value <= FLOAT_EXACT_LIMIT)
+             for value in present):
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64), nulls
+    elif all(isinstance(value, datetime.datetime) for value in present):
+        return np.array(values, dtype="datetime64[us]"), nulls
+
+    # LOBs, RAW and mixed columns stay as Python objects
+    return np.fromiter(values, dtype=object, count=len(values)), nulls
+
+
+class Row:
+    """Lightweight view of one row of a ColumnarResult; values are read from the columns on access."""
+    __slots__ = ("result", "index")
+
+    def __init__(self, result, index):
+        self.result = result
+        self.index = index
+
+    def __getitem__(self, column):
+        return self.result.value(self.index, column)
+
+    def __len__(self):
+        return len(self.result.columns)
+
+    def __iter__(self):
+        return (self.result.value(self.index, column) for column in range(len(self.result.columns)))
+
+
+class ColumnarResult:
+    """
+    Query result held column by column in typed arrays: int64/float64/datetime64
+    NumPy arrays, StringColumn for text, plus a null mask per column. Cells are
+    only turned into Python objects (and strings for display) when read.
+    """
+    __slots__ = ("columns", "arrays", "nulls", "length")
+
+    def __init__(self, columns, arrays, nulls=None, length=None):
+        self.columns = list(columns)
+        self.arrays = list(arrays)
+        self.nulls = list(nulls) if nulls is not None else [None] * len(self.arrays)
+        self.length = length if length is not None else (len(self.arrays[0]) if self.arrays else 0)
+
+    @classmethod
+    def from_rows(cls, rows, columns):
+        """Build a result from fetched row tuples and their column names."""
+        if not rows:
+            return cls(columns, [np.array([], dtype=object) for _ in columns], length=0)
+        converted = [column_array(values) for values in zip(*rows)]
+        return cls(columns, [array for array, _ in converted], [nulls for _, nulls in converted], len(rows))
+
+    @classmethod
+    def from_arrow(cls, table):
+        """Build a result from a pyarrow Table without going through Python row tuples."""
+        import pyarrow
+
+        arrays = []
+        nulls = []
+        for column in table.columns:
+            column = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+            column_type = column.type
+            mask = column.is_null().to_numpy(zero_copy_only=False) if column.null_count else None
+            if pyarrow.types.is_string(column_type) or pyarrow.types.is_large_string(column_type):
+                offset_type = np.int64 if pyarrow.types.is_large_string(column_type) else np.int32
+                _, offsets, data = column.buffers()
+                offsets = np.frombuffer(offsets, dtype=offset_type)[column.offset:column.offset + len(column) + 1]
+                data = np.frombuffer(data, dtype=np.uint8) if data is not None else np.zeros(0, dtype=np.uint8)
+                array = StringColumn(data[offsets[0]:offsets[-1]], (offsets - offsets[0]).astype(np.int64))
+            elif pyarrow.types.is_integer(column_type):
+                array = column.cast(pyarrow.int64()).fill_null(0).to_numpy()
+            elif pyarrow.types.is_decimal(column_type):
+                array = cls.decimal_array(column, pyarrow)
+            elif pyarrow.types.is_floating(column_type):
+                array = column.cast(pyarrow.float64()).fill_null(np.nan).to_numpy()
+            elif pyarrow.types.is_timestamp(column_type) or pyarrow.types.is_date(column_type):
+                array = column.cast(pyarrow.timestamp("us")).to_numpy(zero_copy_only=False)
+            else:
+                array = np.fromiter(column.to_pylist(), dtype=object, count=len(column))
+            arrays.append(array)
+            nulls.append(mask)
+        return cls(table.column_names, arrays, nulls, table.num_rows)
+
+    @staticmethod
+    def decimal_array(column, pyarrow):
+        """
+        Store an Arrow decimal column exactly: int64 for whole numbers that fit
+        (NUMBER(38) values may not), Python ints or Decimals otherwise. Whole
+        values of a column with a scale (e.g. COUNT(*) or a plain NUMBER) become
+        ints, as the driver returns them row by row.
+        """
+        if column.type.scale == 0:
+            try:
+                return column.cast(pyarrow.int64()).fill_null(0).to_numpy()
+            except pyarrow.ArrowInvalid:
+                values = [None if value is None else int(value) for value in column.to_pylist()]
+                return np.fromiter(values, dtype=object, count=len(values))
+        values = [value if value is None or value != value.to_integral_value() else int(value)
+                  for value in column.to_pylist()]
+        return column_array(values)[0]
+
+    @classmethod
+    def concatenate(cls, results):
+        """Join results with the same columns (e.g. fetched batch by batch) into one."""
+        results = list(results)
+        non_empty = [result for result in results if len(result)]
+        if len(non_empty) <= 1:
+            return non_empty[0] if non_empty else results[0]
+        results = non_empty
+
+        arrays = []
+        nulls = []
+        for index in range(len(results[0].columns)):
+            parts = cls.typed_parts(results, index)
+            if all(isinstance(part, StringColumn) for part in parts):
+                arrays.append(StringColumn.concatenate(parts))
+            elif cls.compatible(parts):
+                arrays.append(np.concatenate(parts))
+            else:
+                # Batches typed differently (e.g. a batch of only nulls) fall back to objects
+                values = [value for result in results for value in result.column_values(index)]
+                arrays.append(np.fromiter(values, dtype=object, count=len(values)))
+            masks = [result.nulls[index] for result in results]
+            if any(mask is not None for mask in masks):
+                nulls.append(np.concatenate([mask if mask is not None else np.zeros(len(result), dtype=bool)
+                                             for mask, result in zip(masks, results)]))
+            else:
+                nulls.append(None)
+        return cls(results[0].columns, arrays, nulls, sum(len(result) for result in results))
+
+    @classmethod
+    def typed_parts(cls, results, index):
+        """
+        Arrays of one column across results, where batches holding only nulls
+        (typed arbitrarily, e.g. a single patched row) take the type of the others.
+        """
+        parts = [result.arrays[index] for result in results]
+        empty = [result.nulls[index] is not None and result.nulls[index].all() for result in results]
+        typed = [part for part, is_empty in zip(parts, empty) if not is_empty]
+        if not typed or len(typed) == len(parts) or \
+                not (all(isinstance(part, StringColumn) for part in typed) or cls.compatible(typed)):
+            return parts
+        template = typed[0]
+        return [cls.null_array(template, len(part)) if is_empty else part for part, is_empty in zip(parts, empty)]
+
+    @staticmethod
+    def null_array(template, length):
+        """Placeholder values of the type of template for rows that are null."""
+        if isinstance(template, StringColumn):
+            return StringColumn(np.zeros(0, dtype=np.uint8), np.zeros(length + 1, dtype=np.int64))
+        return np.zeros(length, dtype=template.dtype)
+
+    @staticmethod
+    def compatible(parts):
+        """
+        Whether column batches can be joined as one NumPy array. Integer and float
+        batches become float64 when their integers convert exactly.
+        """
+        if any(isinstance(part, StringColumn) for part in parts):
+            return False
+        dtypes = {part.dtype for part in parts}
+        if len(dtypes) == 1:
+            return True
+        return {dtype.kind for dtype in dtypes} <= {"i", "f"} and all(
+            not len(part) or -FLOAT_EXACT_LIMIT <= part.min() and part.max() <= FLOAT_EXACT_LIMIT
+            for part in parts if part.dtype.kind == "i"
+        )
+
+    @property
+    def nbytes(self):
+        """Memory used by the column buffers."""
+        return sum(array.nbytes for array in self.arrays) + \
+            sum(mask.nbytes for mask in self.nulls if mask is not None)
+
+    def __len__(self):
+        return self.length
+
+    def value(self, row, column):
+        """Return a cell as a Python value (None for nulls)."""
+        nulls = self.nulls[column]
+        if nulls is not None and nulls[row]:
+            return None
+        value = self.arrays[column][row]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def display(self, row, column):
+        """Format a cell for display; called at paint time, so only visible cells are formatted."""
+        return str(self.value(row, column))
+
+    def row(self, index):
+        return Row(self, index)
+
+    def rows(self):
+        """Iterate over the rows as tuples, e.g. for exporting."""
+        for index in range(self.length):
+            yield tuple(self.value(index, column) for column in range(len(self.columns)))
+
+    def column_values(self, column):
+        """Return a column as a list of Python values."""
+        array = self.arrays[column]
+        values = array.to_list() if isinstance(array, StringColumn) else array.tolist()
+        nulls = self.nulls[column]
+        if nulls is not None:
+            values = [None if is_null else value for value, is_null in zip(values, nulls.tolist())]
+        return values
+
+    def column_array(self, column):
+        """Return a column as a NumPy array for graphing (NaN/NaT for nulls, objects for text)."""
+        array = self.arrays[column]
+        if isinstance(array, StringColumn):
+            return np.array(self.column_values(column), dtype=object)
+        if array.dtype == object:
+            values = self.column_values(column)
+            if values and all(value is None or isinstance(value, (int, float, decimal.Decimal)) for value in values):
+                # Exact numbers kept as objects are plotted as floats
+                return np.array([np.nan if value is None else float(value) for value in values], dtype=np.float64)
+            return array
+        nulls = self.nulls[column]
+        if nulls is not None and array.dtype.kind in "iu":
+            array = array.astype(np.float64)
+            array[nulls] = np.nan
+        return array
+
+    def take(self, indices):
+        """Return a new result holding the given rows, in the given order (used to filter and sort)."""
+        indices = np.asarray(indices, dtype=np.int64)
+        arrays = [array.take(indices) for array in self.arrays]
+        nulls = [mask[indices] if mask is not None else None for mask in self.nulls]
+        return ColumnarResult(self.columns, arrays, nulls, len(indices))
+
+    def replace_rows(self, indices, rows):
+        """
+        Return a new result where the rows at the given positions are replaced by
+        the rows of another result with the same columns, in the same order.
+        """
+        order = np.arange(self.length, dtype=np.int64)
+        order[np.asarray(indices, dtype=np.int64)] = self.length + np.arange(len(rows), dtype=np.int64)
+        return ColumnarResult.concatenate([self, rows]).take(order)
+
+    def remove_rows(self, indices):
+        """Return a new result without the rows at the given positions."""
+        keep = np.ones(self.length, dtype=bool)
+        keep[np.asarray(indices, dtype=np.int64)] = False
+        return self.take(np.flatnonzero(keep))
+
+    def argsort(self, column, descending=False):
+        """
+        Row order that sorts the result by one column, stable like ORDER BY ..., ROWID.
+        Nulls sort last when ascending and first when descending, as in Oracle.
+        """
+        array = self.arrays[column]
+        keys = array.to_list() if isinstance(array, StringColumn) else array
+        nulls = self.nulls[column]
+        present = np.flatnonzero(~nulls) if nulls is not None else np.arange(self.length)
+        missing = np.flatnonzero(nulls) if nulls is not None else np.zeros(0, dtype=np.int64)
+
+        if isinstance(keys, np.ndarray) and keys.dtype != object:
+            sort_keys = keys[present]
+            if sort_keys.dtype.kind == "M":
+                sort_keys = sort_keys.view(np.int64)
+            # Negating keeps equal keys in their original order, unlike reversing
+            order = present[np.argsort(-sort_keys if descending else sort_keys, kind="stable")]
+        else:
+            order = np.array(sorted(present.tolist(), key=keys.__getitem__, reverse=descending), dtype=np.int64)
+        parts = (missing, order) if descending else (order, missing)
+        return np.concatenate(parts).astype(np.int64)
@@ -0,0 +1,317 @@
+import csv
+import datetime
+import decimal
+import json
+import os
+import time
+
+DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d.%m.%Y", "%d/%m/%Y", "%d-%b-%y")
+
+
+def convert_value(value, column):
+    """
+    Convert a value read from a file to the Python type matching an Oracle column.
+    :param value: Raw value; strings are parsed, other types are passed through.
+    :param column: ColumnMetadata of the target column.
+    :return: Converted value; None for empty strings and for blank numbers or dates.
+              Text keeps its leading and trailing spaces.
+    """
+    if not isinstance(value, str):
+        return value
+    if value == "":
+        return None
+    # Surrounding spaces are only ignored when parsing; text keeps them
+    text = value.strip()
+    if column.is_numeric:
+        if text == "":
+            return None
+        if column.data_type == "INTEGER" or column.scale == 0:
+            return int(text)
+        return decimal.Decimal(text)
+    if column.is_date:
+        return parse_date(text) if text else None
+    return value
+
+
+def parse_date(value):
+    """
+    Parse a date written in ISO format or one of DATE_FORMATS.
+    :raises ValueError: If the value is not a recognized date.
+    """
+    value = value.strip()
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognized date {value!r}")
+
+
+def read_csv_chunks(path, chunk_size, delimiter=","):
+    """
+    Read a CSV file with a header row in chunks of rows.
+    :return: Generator of (header, list of row tuples).
+    """
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield header, chunk
+                chunk = []
+        if chunk:
+            yield header, chunk
+
+
+def read_parquet_chunks(path, chunk_size):
+    """
+    Read a Parquet file in record batches. Requires pyarrow.
+    :return: Generator of (header, list of row tuples).
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Importing Parquet files requires the pyarrow package.")
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        columns = [column.to_pylist() for column in batch.columns]
+        yield batch.schema.names, list(zip(*columns))
+
+
+def read_chunks(path, chunk_size):
+    """Pick the reader for a file from its extension."""
+    if os.path.splitext(path)[1].lower() == ".parquet":
+        return read_parquet_chunks(path, chunk_size)
+    return read_csv_chunks(path, chunk_size)
+
+
+def import_file(db, table_name, path, chunk_size=10000, cancel_event=None, progress_callback=None):
+    """
+    Stream a CSV or Parquet file into a table. The file is read in chunks, each
+    value is converted to its column's type, and every chunk is inserted with one
+    executemany batch, so memory stays bounded by the chunk size.
+    :param db: OracleDatabase to load into.
+    :param table_name: Name of the target table.
+    :param path: Path of a .csv (with a header row) or .parquet file.
+    :param chunk_size: Rows read, converted and inserted at a time.
+    :param cancel_event: threading.Event that stops the import after the current chunk.
+    :param progress_callback: Called after each chunk with a dictionary of rows, errors and rows_per_second.
+    :return: Dictionary of rows read, rows imported, errors (row number, message) and seconds.
+    """
+    metadata = db.get_table_metadata(table_name)
+    if metadata is None:
+        raise ValueError(f"Table {table_name} does not exist.")
+
+    start = time.perf_counter()
+    rows_read = 0
+    imported = 0
+    errors = []
+    header_columns = None
+
+    for header, chunk in read_chunks(path, chunk_size):
+        if cancel_event is not None and cancel_event.is_set():
+            break
+
+        # Map the file's header to the table's columns once
+        if header_columns is None:
+            header_columns = []
+            for name in header:
+                column = metadata.column(name.strip())
+                if column is None:
+                    raise ValueError(f"Column {name} does not exist in table {table_name}.")
+                header_columns.append(column)
+
+        batch = []
+        batch_rows = []
+        for row_offset, values in enumerate(chunk):
+            if len(values) != len(header_columns):
+                # zip would pair the values with the wrong columns or drop some
+                errors.append((rows_read + row_offset + 1,
+                               f"Expected {len(header_columns)} values, found {len(values)}."))
+                continue
+            try:
+                batch.append({column.name: convert_value(value, column)
+                              for column, value in zip(header_columns, values)})
+                batch_rows.append(rows_read + row_offset + 1)
+            except (ValueError, ArithmeticError) as e:
+                errors.append((rows_read + row_offset + 1, str(e)))
+
+        batch_errors = db.add_entries(table_name, batch, batch_size=chunk_size)
+        for index, message in batch_errors:
+            errors.append((batch_rows[index] if index is not None else None, message))
+        # An error without a row index means the whole batch failed
+        failed = len(batch) if any(index is None for index, _ in batch_errors) else len(batch_errors)
+        imported += len(batch) - failed
+        rows_read += len(chunk)
+
+        if progress_callback is not None:
+            elapsed = time.perf_counter() - start
+            progress_callback({"rows": rows_read, "errors": len(errors),
+                               "rows_per_second": rows_read / elapsed if elapsed else 0})
+
+    return {"rows": rows_read, "imported": imported, "errors": errors,
+            "seconds": time.perf_counter() - start}
+
+
+def format_value(value):
+    """Format a value for text output (CSV and JSON Lines)."""
+    if value is None:
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+class CsvWriter:
+    def __init__(self, path, columns, metadata):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, rows):
+        self.writer.writerows([["" if value is None else format_value(value) for value in row] for row in rows])
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesWriter:
+    def __init__(self, path, columns, metadata):
+        self.file = open(path, "w", encoding="utf-8")
+        self.columns = columns
+
+    def write(self, rows):
+        self.file.writelines(
+            json.dumps({column: format_value(value) for column, value in zip(self.columns, row)}) + "\n"
+            for row in rows
+        )
+
+    def close(self):
+        self.file.close()
+
+
+class ArrowWriter:
+    """Writes Parquet or Arrow IPC files with a schema derived from the table metadata. Requires pyarrow."""
+    def __init__(self, path, columns, metadata, file_format):
+        try:
+            import pyarrow as pa
+            import pyarrow.ipc
+            import pyarrow.parquet
+        except ImportError:
+            raise ValueError("Exporting Parquet and Arrow files requires the pyarrow package.")
+
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([(column, self.arrow_type(metadata.column(column) if metadata else None))
+                                 for column in columns])
+        if file_format == "parquet":
+            self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pyarrow.ipc.new_file(path, self.schema)
+
+    def arrow_type(self, column):
+        """Map an Oracle column type to an Arrow type."""
+        if column is None:
+            return self.pa.string()
+        if column.is_numeric:
+            if column.data_type == "INTEGER" or column.scale == 0:
+                return self.pa.int64()
+            return self.pa.float64()
+        if column.is_date:
+            return self.pa.timestamp("us")
+        return self.pa.string()
+
+    def write(self, rows):
+        arrays = {}
+        for index, field in enumerate(self.schema):
+            values = [row[index] for row in rows]
+            if field.type == self.pa.string():
+                values = [None if value is None else str(value) for value in values]
+            elif field.type == self.pa.float64():
+                values = [None if value is None else float(value) for value in values]
+            arrays[field.name] = values
+        self.writer.write_table(self.pa.Table.from_pydict(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+EXPORT_FORMATS = {
+    ".csv": lambda path, columns, metadata: CsvWriter(path, columns, metadata),
+    ".jsonl": lambda path, columns, metadata: JsonLinesWriter(path, columns, metadata),
+    ".parquet": lambda path, columns, metadata: ArrowWriter(path, columns, metadata, "parquet"),
+    ".arrow": lambda path, columns, metadata: ArrowWriter(path, columns, metadata, "arrow"),
+}
+
+
+def export_table(db, table_name, path, filters=None, sort_column=None, sort_order="ASC", batch_size=10000,
+                 cancel_event=None, progress_callback=None, sort_keys=None):
+    """
+    Stream a table view (with its filters and sort) into a CSV, JSON Lines,
+    Parquet or Arrow file. Rows are fetched from a server-side cursor and written
+    one batch at a time, so memory use does not depend on the table size.
+    A cancelled or failed export removes its partial file.
+    :param db: OracleDatabase to read from.
+    :param table_name: Name of the table.
+    :param path: Output path; the extension (.csv, .jsonl, .parquet, .arrow) selects the format.
+    :param filters: Dictionary of column-value pairs for filtering.
+    :param sort_column: Column to sort by.
+    :param sort_order: Sort order ('ASC' or 'DESC').
+    :param batch_size: Rows fetched and written at a time.
+    :param cancel_event: threading.Event that stops the export after the current batch.
+    :param progress_callback: Called after each batch with a dictionary of rows and rows_per_second.
+    :param sort_keys: List of (column, descending) pairs, most significant first, e.g. the
+                      columns of a view sorted by several header clicks; replaces sort_column and sort_order.
+    :return: Dictionary of rows written, seconds and whether the export was cancelled.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {extension or path}.")
+
+    metadata = db.get_table_metadata(table_name)
+    start = time.perf_counter()
+    rows_written = 0
+    cancelled = False
+    completed = False
+    writer = None
+    try:
+        for rows, columns in db.stream_table_data(table_name, filters, sort_column, sort_order, batch_size,
+                                                  sort_keys=sort_keys):
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+            if writer is None:
+                writer = EXPORT_FORMATS[extension](path, columns, metadata)
+            writer.write(rows)
+            rows_written += len(rows)
+
+            if progress_callback is not None:
+                elapsed = time.perf_counter() - start
+                progress_callback({"rows": rows_written, "rows_per_second": rows_written / elapsed if elapsed else 0})
+
+        if writer is None and not cancelled:
+            # Empty result: still write a file with the header
+            columns = metadata.column_names if metadata else []
+            writer = EXPORT_FORMATS[extension](path, columns, metadata)
+        completed = True
+    finally:
+        if writer is not None:
+            writer.close()
+            # A fetch or encoding error must not leave a truncated file that looks like a complete export
+            if not completed and os.path.exists(path):
+                os.remove(path)
+
+    if cancelled and os.path.exists(path):
+        os.remove(path)
+    return {"rows": rows_written, "seconds": time.perf_counter() - start, "cancelled": cancelled}
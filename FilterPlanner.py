@@ -0,0 +1,241 @@
+import datetime
+import decimal
+
+from DataTransfer import parse_date
+
+FILTER_MODES = ("contains", "prefix", "exact")
+
+
+class Filter:
+    """A filter field value and its matching mode. Plain strings are treated as 'contains' filters."""
+    __slots__ = ("value", "mode")
+
+    def __init__(self, value, mode="contains"):
+        if mode not in FILTER_MODES:
+            raise ValueError(f"Unknown filter mode {mode}.")
+        self.value = value
+        self.mode = mode
+
+    def __str__(self):
+        return str(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __repr__(self):
+        return f"Filter({self.value!r}, {self.mode!r})"
+
+
+def as_filter(value):
+    return value if isinstance(value, Filter) else Filter(value)
+
+
+class RangeCondition:
+    """Number or date column between two optional bounds; equality uses the same value for both."""
+    __slots__ = ("low", "high", "include_low", "include_high")
+
+    def __init__(self, low=None, high=None, include_low=True, include_high=True):
+        self.low = low
+        self.high = high
+        self.include_low = include_low
+        self.include_high = include_high
+
+    def within(self, other):
+        """Whether every value matching this range also matches other."""
+        if other.low is not None:
+            if self.low is None or self.low < other.low or \
+                    (self.low == other.low and self.include_low and not other.include_low):
+                return False
+        if other.high is not None:
+            if self.high is None or self.high > other.high or \
+                    (self.high == other.high and self.include_high and not other.include_high):
+                return False
+        return True
+
+
+class TextCondition:
+    """Text match on a column's value (numbers and dates as their text)."""
+    __slots__ = ("mode", "value", "case_sensitive", "text_index")
+
+    def __init__(self, mode, value, case_sensitive=False, text_index=False):
+        self.mode = mode
+        self.value = value
+        self.case_sensitive = case_sensitive
+        self.text_index = text_index
+
+    def within(self, other):
+        """Whether every value matching this condition also matches other."""
+        if (self.mode, self.case_sensitive, self.text_index) != (other.mode, other.case_sensitive, other.text_index):
+            return False
+        value, other_value = self.value, other.value
+        if not self.case_sensitive:
+            value, other_value = value.upper(), other_value.upper()
+        if self.mode == "contains":
+            return other_value in value
+        if self.mode == "prefix":
+            return value.startswith(other_value)
+        return value == other_value
+
+
+def escape_like(value):
+    """Escape the LIKE wildcards in a value typed by the user."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class FilterPlanner:
+    """
+    Chooses a predicate for each filter field from the column's type and indexes,
+    instead of UPPER(column) LIKE '%value%' everywhere:
+    - numbers and dates use equality or a range ("5", ">= 10", "1..20", "2024-01-31"),
+      which can use a B-tree index;
+    - exact text uses equality;
+    - prefix text uses UPPER(column) LIKE 'VALUE%', which a function-based index on
+      UPPER(column) can range scan; it stays case-insensitive whatever the indexes,
+      so creating or dropping an index never changes the rows a filter returns;
+    - contains text uses CONTAINS() when the column has an Oracle Text (CONTEXT)
+      index, and a case-insensitive LIKE '%value%' otherwise.
+    In contains (the default) and exact mode a number or date typed in a number or
+    date column is compared by value; prefix mode matches the start of the column's
+    text instead ("12" finds 12, 120 and 1234).
+    The same conditions drive the in-memory LocalQueryEngine.
+    """
+    def __init__(self, metadata=None):
+        self.metadata = metadata
+
+    def column(self, column_name):
+        return self.metadata.column(column_name) if self.metadata is not None else None
+
+    def has_text_index(self, column_name):
+        return self.metadata is not None and any(
+            index.domain_type == "CONTEXT" for index in self.metadata.indexes_leading_with(column_name)
+        )
+
+    def condition(self, column_name, value):
+        """
+        Interpret a filter field.
+        :param column_name: Column the filter applies to.
+        :param value: Filter or plain string ('contains' mode).
+        :return: RangeCondition or TextCondition.
+        """
+        filter_value = as_filter(value)
+        text = str(filter_value.value)
+        mode = filter_value.mode
+        column = self.column(column_name)
+        is_text = column is None or not (column.is_numeric or column.is_date)
+        if not is_text and mode != "prefix":
+            try:
+                return self.parse_range(text, column)
+            except (ValueError, ArithmeticError):
+                pass  # Not a number or date: match the column's text instead
+
+        text_index = mode == "contains" and is_text and self.has_text_index(column_name)
+        return TextCondition(mode, text, mode == "exact", text_index)
+
+    @staticmethod
+    def parse_value(text, column):
+        """
+        Parse a number or date typed in a filter.
+        :return: Tuple of the value and, for a date without a time, the start of the next day.
+        :raises ValueError: If the text is not a finite number or a date.
+        """
+        text = text.strip()
+        if column.is_numeric:
+            value = decimal.Decimal(text)
+            # Decimal accepts NaN and Infinity, which Oracle NUMBER cannot hold
+            if not value.is_finite():
+                raise ValueError(f"{text!r} is not a finite number")
+            return value, None
+        value = parse_date(text)
+        if ":" not in text:
+            return value, value + datetime.timedelta(days=1)
+        return value, None
+
+    def parse_range(self, text, column):
+        """Parse 'value', '=value', '>value', '>=value', '<value', '<=value' or 'low..high'."""
+        text = text.strip()
+        if ".." in text:
+            low_text, high_text = text.split("..", 1)
+            low = self.parse_value(low_text, column)[0] if low_text.strip() else None
+            high, after_high = self.parse_value(high_text, column) if high_text.strip() else (None, None)
+            if after_high is not None:
+                return RangeCondition(low, after_high, True, False)
+            return RangeCondition(low, high)
+
+        operator = "="
+        for candidate in (">=", "<=", ">", "<", "="):
+            if text.startswith(candidate):
+                operator, text = candidate, text[len(candidate):]
+                break
+        value, after = self.parse_value(text, column)
+
+        # A date without a time stands for the whole day
+        if operator == "=":
+            return RangeCondition(value, after, True, False) if after is not None else RangeCondition(value, value)
+        if operator == ">=":
+            return RangeCondition(value, None)
+        if operator == ">":
+            return RangeCondition(after, None) if after is not None else RangeCondition(value, None, False)
+        if operator == "<=":
+            return RangeCondition(None, after, True, False) if after is not None else RangeCondition(None, value)
+        return RangeCondition(None, value, True, False)
+
+    def implies(self, column_name, value, other_value):
+        """Whether the rows matching one filter value are a subset of those matching another."""
+        condition = self.condition(column_name, value)
+        other = self.condition(column_name, other_value)
+        return type(condition) is type(other) and condition.within(other)
+
+    def predicate(self, column_name, condition, bind):
+        """
+        Build the SQL predicate of a condition.
+        :return: Tuple of the predicate and its bind parameters.
+        """
+        if isinstance(condition, RangeCondition):
+            if condition.low is not None and condition.low == condition.high:
+                return f"{column_name} = :{bind}", {bind: condition.low}
+            predicates = []
+            parameters = {}
+            if condition.low is not None:
+                predicates.append(f"{column_name} {'>=' if condition.include_low else '>'} :{bind}")
+                parameters[bind] = condition.low
+            if condition.high is not None:
+                predicates.append(f"{column_name} {'<=' if condition.include_high else '<'} :{bind}_high")
+                parameters[f"{bind}_high"] = condition.high
+            return " AND ".join(predicates) or f"{column_name} IS NOT NULL", parameters
+
+        column = self.column(column_name)
+        expression = column_name
+        if column is not None and (column.is_numeric or column.is_date):
+            expression = f"TO_CHAR({column_name})"
+        if condition.text_index:
+            # Braces make Oracle Text treat the value literally instead of as query operators
+            return f"CONTAINS({column_name}, :{bind}) > 0", {bind: "{" + condition.value.replace("}", "}}") + "}"}
+        if condition.mode == "exact":
+            return f"{expression} = :{bind}", {bind: condition.value}
+
+        pattern = escape_like(condition.value if condition.case_sensitive else condition.value.upper()) + "%"
+        if condition.mode == "contains":
+            pattern = "%" + pattern
+        if not condition.case_sensitive:
+            expression = f"UPPER({expression})"
+        return f"{expression} LIKE :{bind} ESCAPE '\\'", {bind: pattern}
+
+    def plan(self, filters):
+        """
+        Build the WHERE clause for a dictionary of column-filter pairs.
+        :return: Tuple of the clause (empty when there are no filters) and its bind parameters.
+        """
+        predicates = []
+        parameters = {}
+        for column_name, value in (filters or {}).items():
+            if not value:  # Only add filters with non-empty values
+                continue
+            predicate, predicate_parameters = self.predicate(
+                column_name, self.condition(column_name, value), f"filter{len(predicates)}"
+            )
+            predicates.append(predicate)
+            parameters.update(predicate_parameters)
+
+        if not predicates:
+            return "", parameters
+        return " WHERE " + " AND ".join(predicates), parameters
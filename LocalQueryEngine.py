@@ -0,0 +1,289 @@
+import numpy as np
+
+from ColumnarResult import ColumnarResult, StringColumn
+from FilterPlanner import FilterPlanner, RangeCondition
+
+
+def find_rows(column, needle, rows=None, anchor="contains"):
+    """
+    Find the rows of a StringColumn containing a byte string, without decoding
+    any value: candidate positions of the first byte are found over the whole
+    buffer at once and narrowed byte by byte.
+    :param column: StringColumn to search.
+    :param needle: Bytes to look for.
+    :param rows: Sorted row numbers to search instead of the whole column.
+    :param anchor: 'contains', 'prefix' (match at the start) or 'exact' (whole value).
+    :return: Sorted array of matching row numbers.
+    """
+    if rows is not None:
+        searched = column.take(rows)
+    else:
+        searched = column
+    data, offsets = searched.data, searched.offsets
+    length = len(needle)
+    if length == 0:
+        if anchor == "exact":
+            matched = np.flatnonzero(offsets[1:] == offsets[:-1])
+        else:
+            matched = np.arange(len(searched), dtype=np.int64)
+        return rows[matched] if rows is not None else matched
+    if len(data) < length:
+        return np.zeros(0, dtype=np.int64)
+
+    positions = np.flatnonzero(data[:len(data) - length + 1] == needle[0])
+    for index in range(1, length):
+        positions = positions[data[positions + index] == needle[index]]
+
+    # Map byte positions back to rows and drop matches that run into the next value
+    matched = np.searchsorted(offsets, positions, side="right") - 1
+    fits = positions + length <= offsets[matched + 1]
+    if anchor != "contains":
+        fits &= positions == offsets[matched]
+    if anchor == "exact":
+        fits &= positions + length == offsets[matched + 1]
+    matched = np.unique(matched[fits])
+    return rows[matched] if rows is not None else matched
+
+
+class LocalQueryEngine:
+    """
+    Filters and sorts a complete ColumnarResult in memory, interpreting each
+    filter with the same FilterPlanner conditions as the server-side query
+    (Oracle Text searches fall back to substring matching). Text matches on
+    number and date columns are left to the database (see can_filter).
+    Each column keeps the rows matched by its last filter, so a more specific
+    value (e.g. "ab" extended to "abc") only searches the rows that matched before.
+    """
+    def __init__(self, result, planner=None):
+        self.result = result
+        self.planner = planner or FilterPlanner()
+        self.text_columns = {}
+        self.matches = {}
+        self.ranks = {}
+
+    def set_result(self, result):
+        """Swap in a changed result and forget everything derived from the old one."""
+        self.result = result
+        self.text_columns.clear()
+        self.matches.clear()
+        self.ranks.clear()
+
+    def append_rows(self, rows):
+        """
+        Add rows (e.g. newly inserted) at the end of the result.
+        :return: Array of their row numbers.
+        """
+        first = len(self.result)
+        self.set_result(ColumnarResult.concatenate([self.result, rows]))
+        return np.arange(first, len(self.result), dtype=np.int64)
+
+    def replace_rows(self, indices, rows):
+        """Replace rows of the result with their edited values."""
+        self.set_result(self.result.replace_rows(indices, rows))
+
+    def remove_rows(self, indices):
+        """Remove rows from the result; the rows after them move up."""
+        self.set_result(self.result.remove_rows(indices))
+
+    def matches_row(self, row, filters):
+        """Whether one row of the result passes every filter."""
+        single = LocalQueryEngine(self.result.take([row]), self.planner)
+        return len(single.filter(filters)) > 0
+
+    def compare(self, left, right, sort_keys):
+        """
+        Compare two rows by sort keys the way sort orders them, nulls last when
+        ascending and first when descending; ties are broken by row number.
+        :return: Negative, zero or positive.
+        """
+        for column_name, descending in sort_keys:
+            column = self.column_index(column_name)
+            left_value, right_value = self.result.value(left, column), self.result.value(right, column)
+            if left_value == right_value:
+                continue
+            if left_value is None or right_value is None:
+                order = 1 if left_value is None else -1
+            else:
+                order = -1 if left_value < right_value else 1
+            return -order if descending else order
+        return left - right
+
+    def insert_position(self, rows, row, sort_keys):
+        """
+        Position at which a row belongs among rows already ordered by sort_keys,
+        found by binary search so placing one changed row does not sort them all.
+        """
+        if not sort_keys:
+            return int(np.searchsorted(rows, row))
+        low, high = 0, len(rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self.compare(int(rows[middle]), row, sort_keys) < 0:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def column_index(self, column_name):
+        return self.result.columns.index(column_name.upper())
+
+    def text(self, column, case_sensitive):
+        """
+        UTF-8 text of a column as displayed (nulls empty), upper-cased unless
+        case_sensitive, built once per column.
+        """
+        key = (column, case_sensitive)
+        if key not in self.text_columns:
+            array = self.result.arrays[column]
+            if case_sensitive and isinstance(array, StringColumn):
+                self.text_columns[key] = array  # Nulls are already stored as empty strings
+            else:
+                values = ["" if value is None else str(value) for value in self.result.column_values(column)]
+                self.text_columns[key] = StringColumn.from_values(
+                    values if case_sensitive else [value.upper() for value in values]
+                )
+        return self.text_columns[key]
+
+    def match_range(self, column, condition, rows=None):
+        """Rows whose number or date lies in a RangeCondition; nulls never match."""
+        if rows is None:
+            rows = np.arange(len(self.result), dtype=np.int64)
+        array = self.result.arrays[column]
+        if not isinstance(array, np.ndarray) or array.dtype.kind not in "iufM":
+            # Column not loaded as numbers or dates: compare the Python values
+            values = self.result.column_values(column)
+            return rows[np.fromiter((self.in_range(values[row], condition) for row in rows), dtype=bool,
+                                    count=len(rows))]
+
+        values = array[rows]
+        nulls = self.result.nulls[column]
+        keep = ~nulls[rows] if nulls is not None else np.ones(len(rows), dtype=bool)
+        if condition.low is not None:
+            low = self.bound(condition.low, values)
+            keep &= values >= low if condition.include_low else values > low
+        if condition.high is not None:
+            high = self.bound(condition.high, values)
+            keep &= values <= high if condition.include_high else values < high
+        return rows[keep]
+
+    @staticmethod
+    def bound(value, values):
+        """Convert a range bound to the type of a column array."""
+        if values.dtype.kind == "M":
+            return np.datetime64(value, "us")
+        return float(value)
+
+    @staticmethod
+    def in_range(value, condition):
+        try:
+            if value is None:
+                return False
+            if condition.low is not None and (value < condition.low or
+                                              (value == condition.low and not condition.include_low)):
+                return False
+            if condition.high is not None and (value > condition.high or
+                                               (value == condition.high and not condition.include_high)):
+                return False
+            return True
+        except TypeError:
+            return False
+
+    def can_filter(self, filters):
+        """
+        Whether every filter selects the same rows here as in Oracle. Text
+        matches on numbers and dates compare TO_CHAR output, which depends on the
+        session's NLS settings (decimal separator, date format), so only ranges
+        and matches on text columns run locally.
+        """
+        for column_name, value in (filters or {}).items():
+            if not value or isinstance(self.planner.condition(column_name, value), RangeCondition):
+                continue
+            column = self.planner.column(column_name)
+            if column is not None:
+                if column.is_numeric or column.is_date:
+                    return False
+                continue
+            # Without metadata (custom queries) the fetched values tell the column's type
+            index = self.column_index(column_name)
+            array = self.result.arrays[index]
+            nulls = self.result.nulls[index]
+            if isinstance(array, StringColumn) or (nulls is not None and nulls.all()):
+                continue
+            if any(not isinstance(cell, str) for cell in self.result.column_values(index) if cell is not None):
+                return False
+        return True
+
+    def match(self, column_name, value):
+        """Rows matching one filter field."""
+        column = self.column_index(column_name)
+        condition = self.planner.condition(column_name, value)
+        previous = self.matches.get(column)
+        # A more specific filter only has to look at the rows the previous one matched
+        rows = None
+        if previous is not None and type(previous[0]) is type(condition) and condition.within(previous[0]):
+            rows = previous[1]
+
+        if isinstance(condition, RangeCondition):
+            matched = self.match_range(column, condition, rows)
+        else:
+            needle = condition.value if condition.case_sensitive else condition.value.upper()
+            anchor = "contains" if condition.text_index else condition.mode
+            matched = find_rows(self.text(column, condition.case_sensitive), needle.encode("utf-8"), rows, anchor)
+        self.matches[column] = (condition, matched)
+        return matched
+
+    def filter(self, filters):
+        """
+        Rows matching every non-empty filter.
+        :param filters: Dictionary of column-filter pairs, as for OracleDatabase.get_table_data.
+        :return: Sorted array of row numbers.
+        """
+        rows = None
+        for column_name, value in (filters or {}).items():
+            if not value:
+                continue
+            matched = self.match(column_name, value)
+            rows = matched if rows is None else np.intersect1d(rows, matched, assume_unique=True)
+        return np.arange(len(self.result), dtype=np.int64) if rows is None else rows
+
+    def rank(self, column, descending=False):
+        """
+        Dense rank of every row in the order of one column (equal values share
+        a rank), computed once per column and direction.
+        """
+        key = (column, descending)
+        if key not in self.ranks:
+            order = self.result.argsort(column, descending)
+            array = self.result.arrays[column]
+            if isinstance(array, np.ndarray) and array.dtype != object:
+                values = array[order]
+                changed = values[1:] != values[:-1]
+            else:
+                values = self.result.column_values(column)
+                values = [values[index] for index in order]
+                changed = np.fromiter((a != b for a, b in zip(values, values[1:])), dtype=bool,
+                                      count=max(len(values) - 1, 0))
+            nulls = self.result.nulls[column]
+            if nulls is not None:
+                # Nulls are equal to each other and differ from every value
+                null_order = nulls[order]
+                changed = (changed & ~(null_order[1:] & null_order[:-1])) | (null_order[1:] != null_order[:-1])
+            ranks = np.empty(len(order), dtype=np.int64)
+            ranks[order] = np.concatenate(([0], np.cumsum(changed)))
+            self.ranks[key] = ranks
+        return self.ranks[key]
+
+    def sort(self, rows, sort_keys):
+        """
+        Order rows by several columns. Rows that tie on every key keep their
+        current relative order (the order of the server result).
+        :param rows: Row numbers to order.
+        :param sort_keys: List of (column name, descending) pairs, most significant first.
+        :return: Reordered array of row numbers.
+        """
+        if not sort_keys or not len(rows):
+            return rows
+        # lexsort treats its last key as the most significant
+        keys = [self.rank(self.column_index(column_name), descending)[rows]
+                for column_name, descending in reversed(sort_keys)]
+        return rows[np.lexsort([np.arange(len(rows))] + keys)]
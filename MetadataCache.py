@@ -0,0 +1,132 @@
+import threading
+import time
+
+
+class ColumnMetadata:
+    """Data dictionary description of a single column."""
+    def __init__(self, name, data_type, data_length, precision=None, scale=None, nullable=True):
+        self.name = name
+        self.data_type = data_type
+        self.data_length = data_length
+        self.precision = precision
+        self.scale = scale
+        self.nullable = nullable
+
+    @property
+    def is_numeric(self):
+        return self.data_type in ("NUMBER", "FLOAT", "BINARY_FLOAT", "BINARY_DOUBLE", "INTEGER")
+
+    @property
+    def is_date(self):
+        return self.data_type == "DATE" or self.data_type.startswith("TIMESTAMP")
+
+    @property
+    def is_lob(self):
+        """LOB and LONG columns cannot be compared with =, so they never identify a row."""
+        return self.data_type in ("CLOB", "NCLOB", "BLOB", "BFILE", "LONG", "LONG RAW", "XMLTYPE")
+
+
+class IndexMetadata:
+    """Data dictionary description of an index."""
+    def __init__(self, name, index_type, unique, domain_type=None):
+        self.name = name
+        self.index_type = index_type
+        self.unique = unique
+        self.domain_type = domain_type  # e.g. CONTEXT for an Oracle Text index
+        self.columns = []
+
+
+class TableMetadata:
+    """Columns, primary key and indexes of a table."""
+    def __init__(self, name):
+        self.name = name
+        self.columns = []
+        self.primary_key = []
+        self.indexes = {}
+
+    @property
+    def column_names(self):
+        return [column.name for column in self.columns]
+
+    @property
+    def row_width(self):
+        """Maximum row width in bytes, from the declared column lengths."""
+        return sum(column.data_length or 0 for column in self.columns)
+
+    @property
+    def key_columns(self):
+        """Columns identifying a row: the primary key, or every comparable column when there is none."""
+        if self.primary_key:
+            return list(self.primary_key)
+        return [column.name for column in self.columns if not column.is_lob]
+
+    def row_key(self, columns, values):
+        """
+        Key of a row read from the table.
+        :param columns: Column names of the row.
+        :param values: Values of the row, in the order of columns.
+        :return: Dictionary of key column-value pairs.
+        """
+        positions = {column.upper(): position for position, column in enumerate(columns)}
+        return {column: values[positions[column]] for column in self.key_columns if column in positions}
+
+    def column(self, column_name):
+        """Return the metadata of a column, or None if the table has no such column."""
+        for column in self.columns:
+            if column.name == column_name.upper():
+                return column
+        return None
+
+    def indexes_leading_with(self, column_name):
+        """Return the indexes whose first column is the given column."""
+        return [index for index in self.indexes.values()
+                if index.columns and index.columns[0] == column_name.upper()]
+
+
+class MetadataCache:
+    """
+    Time-limited cache of TableMetadata for every table of the schema.
+    OracleDatabase fills it with bulk data dictionary queries; entries expire
+    after ttl seconds and can be invalidated explicitly after DDL.
+    """
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.tables = {}
+        self.table_names = None
+        self.loaded_at = None
+        self.lock = threading.RLock()
+
+    def is_fresh(self):
+        return self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl
+
+    def store(self, tables, table_names=None):
+        """
+        Store freshly loaded metadata.
+        :param tables: Dictionary of table name -> TableMetadata.
+        :param table_names: Full list of table names when the whole schema was loaded.
+        """
+        with self.lock:
+            self.tables.update(tables)
+            if table_names is not None:
+                self.table_names = table_names
+                self.loaded_at = time.monotonic()
+
+    def get(self, table_name):
+        """Return cached metadata for a table, or None if it is missing or expired."""
+        with self.lock:
+            if not self.is_fresh():
+                return None
+            return self.tables.get(table_name.upper())
+
+    def invalidate(self, table_name=None):
+        """
+        Drop cached metadata.
+        :param table_name: Table to forget; None forgets the whole schema.
+        """
+        with self.lock:
+            if table_name is None:
+                self.tables.clear()
+                self.table_names = None
+                self.loaded_at = None
+            else:
+                self.tables.pop(table_name.upper(), None)
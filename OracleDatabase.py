@@ -1,90 +1,1037 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+
 import oracledb
 
+from DataTransfer import convert_value
+from FilterPlanner import FilterPlanner
+from MetadataCache import ColumnMetadata, IndexMetadata, MetadataCache, TableMetadata
+from QueryProfiler import QueryProfiler
+from ResultCache import ResultCache
+
+
+class RowChangedError(ValueError):
+    """Raised when a row was changed or deleted by another session after it was read for editing."""
+
+
+class RowVersion:
+    """
+    A row as read for editing: its values plus the ROWID and ORA_ROWSCN it
+    had, so the update can check that nobody changed it in between.
+    """
+    def __init__(self, table_name, columns, values, row_id, scn):
+        self.table_name = table_name
+        self.columns = list(columns)
+        self.values = list(values)
+        self.row_id = row_id
+        self.scn = scn
+
+    def value(self, column_name):
+        return self.values[self.columns.index(column_name.upper())]
+
 
 class OracleDatabase:
-    def __init__(self, user, password, dsn):
+    AGGREGATES = ("SUM", "AVG", "COUNT", "MIN", "MAX")
+
+    def __init__(self, user, password, dsn, use_pool=True, pool_min=1, pool_max=4, pool_increment=1,
+                 stmtcachesize=20, ping_interval=60, adaptive_fetch=False, fetch_buffer_bytes=4_000_000,
+                 metadata_ttl=300, result_cache_bytes=0, result_ttl=None, revalidate_results=False,
+                 revalidate_interval=5, profile=False, profile_records=1000):
+        """
+        :param user: Database user.
+        :param password: Database password.
+        :param dsn: Connect string, e.g. "hostname:port/service_name".
+        :param use_pool: Check out a pooled session per operation instead of sharing one connection.
+                         Running statements can only be cancelled with a pool.
+        :param pool_min: Sessions the pool opens up front.
+        :param pool_max: Upper bound on concurrent sessions.
+        :param pool_increment: Sessions opened at a time when the pool grows.
+        :param stmtcachesize: Number of parsed statements cached per session.
+        :param ping_interval: Seconds a pooled session may sit idle before it is health-checked on checkout.
+        :param adaptive_fetch: Size fetch batches of unpaged reads from the table's row width.
+        :param fetch_buffer_bytes: Approximate bytes per round trip targeted by adaptive fetching.
+        :param metadata_ttl: Seconds before cached table metadata is loaded again.
+        :param result_cache_bytes: Memory budget of the client-side result cache; 0 disables it.
+        :param result_ttl: Seconds a cached result may be served; None keeps it until it is
+                           invalidated or evicted.
+        :param revalidate_results: Check MAX(ORA_ROWSCN) before serving a cached result, to catch
+                                   changes made by other sessions.
+        :param revalidate_interval: Seconds a table's MAX(ORA_ROWSCN) is reused before it is read again.
+        :param profile: Record timings, rows and bytes of every statement in the query profiler
+                        (also switched on from the profiler panel). Bind values are never recorded.
+        :param profile_records: Number of most recent statements the profiler keeps.
+        """
         self.user = user
         self.password = password
         self.dsn = dsn
+        self.use_pool = use_pool
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.pool_increment = pool_increment
+        self.stmtcachesize = stmtcachesize
+        self.ping_interval = ping_interval
+        self.adaptive_fetch = adaptive_fetch
+        self.fetch_buffer_bytes = fetch_buffer_bytes
+        self.fetch_sizes = {}  # Table name -> (arraysize, prefetchrows)
+        self.metadata_cache = MetadataCache(metadata_ttl)
+        self.result_cache = ResultCache(result_cache_bytes, result_ttl) if result_cache_bytes else None
+        self.revalidate_results = revalidate_results
+        self.revalidate_interval = revalidate_interval
+        self.table_scns = {}  # Table name -> (time read, MAX(ORA_ROWSCN)) for revalidation
+        self.profiler = QueryProfiler(profile_records, profile)
         self.connection = None
-        self.cursor = None
+        self.pool = None
+        self.transaction_connection = None  # Session pinned by begin() until commit() or rollback()
+        self.active_sessions = {}  # Thread id -> session currently used by that thread
+        self.sessions_lock = threading.Lock()
 
     def connect(self):
-        """Establish a connection to the Oracle database."""
+        """Establish a connection (or a session pool) to the Oracle database."""
         try:
-            self.connection = oracledb.connect(user=self.user, password=self.password, dsn=self.dsn)
-            self.cursor = self.connection.cursor()
-            print("Successfully connected to Oracle Database")
+            self.open_connection()
         except oracledb.DatabaseError as e:
             print(f"Database connection error: {e}")
 
+    def open_connection(self):
+        """
+        Establish the connection (or session pool) like connect, but raise
+        connection errors to the caller, e.g. to report them in the viewer
+        when connecting in the background.
+        """
+        if self.connection or self.pool:
+            return
+        if self.use_pool:
+            self.pool = oracledb.create_pool(
+                user=self.user, password=self.password, dsn=self.dsn,
+                min=self.pool_min, max=self.pool_max, increment=self.pool_increment,
+                stmtcachesize=self.stmtcachesize, ping_interval=self.ping_interval,
+                getmode=oracledb.POOL_GETMODE_WAIT
+            )
+        else:
+            self.connection = oracledb.connect(user=self.user, password=self.password, dsn=self.dsn,
+                                               stmtcachesize=self.stmtcachesize)
+        print("Successfully connected to Oracle Database")
+
     def close(self):
-        """Close the connection to the Oracle database."""
+        """Close the connection (or session pool) to the Oracle database."""
+        if self.pool:
+            self.pool.close(force=True)
+            self.pool = None
+            print("Connection pool closed.")
         if self.connection:
-            self.cursor.close()
             self.connection.close()
+            self.connection = None
             print("Connection closed.")
 
+    @contextmanager
+    def session(self):
+        """
+        Provide a connection for a single operation. With pooling, a session is
+        checked out for the duration of the block so concurrent operations do
+        not serialize on one connection; otherwise the shared connection is used.
+        During an explicit transaction every operation uses the transaction's session.
+        The connection is wrapped so the profiler records its statements.
+        """
+        connection = self.transaction_connection
+        pooled = connection is None and self.pool is not None
+        if pooled:
+            connection = self.pool.acquire()
+        elif connection is None:
+            connection = self.connection
+
+        thread_id = threading.get_ident()
+        with self.sessions_lock:
+            previous = self.active_sessions.get(thread_id)
+            self.active_sessions[thread_id] = connection
+        try:
+            yield self.profiler.connection(connection)
+        finally:
+            with self.sessions_lock:
+                if previous is None:
+                    self.active_sessions.pop(thread_id, None)
+                else:
+                    self.active_sessions[thread_id] = previous
+            if pooled:
+                self.pool.release(connection)
+
+    def begin(self):
+        """
+        Start an explicit transaction. Until commit() or rollback(), every
+        operation runs on one session and changes are not committed one by one.
+        """
+        if self.transaction_connection is not None:
+            return
+        self.transaction_connection = self.pool.acquire() if self.pool is not None else self.connection
+        print("Transaction started.")
+
+    def end_transaction(self):
+        """Leave transaction mode and return the pinned session to the pool."""
+        connection, self.transaction_connection = self.transaction_connection, None
+        if connection is not None and self.pool is not None:
+            self.pool.release(connection)
+
+    def commit(self):
+        """Commit the explicit transaction."""
+        if self.transaction_connection is None:
+            return
+        try:
+            self.transaction_connection.commit()
+            self.end_transaction()
+            print("Transaction committed.")
+        except oracledb.DatabaseError as e:
+            print(f"Error committing transaction: {e}")
+
+    def rollback(self):
+        """Roll back the explicit transaction and forget results that may contain its changes."""
+        if self.transaction_connection is None:
+            return
+        try:
+            self.transaction_connection.rollback()
+            print("Transaction rolled back.")
+        except oracledb.DatabaseError as e:
+            print(f"Error rolling back transaction: {e}")
+        finally:
+            self.end_transaction()
+            self.invalidate_results()
+
+    @contextmanager
+    def transaction(self):
+        """Run a block in an explicit transaction: commit on success, roll back on error."""
+        self.begin()
+        try:
+            yield self
+        except Exception:
+            self.rollback()
+            raise
+        self.commit()
+
+    def finish_write(self, connection):
+        """Commit a write unless it is part of an explicit transaction."""
+        if self.transaction_connection is None:
+            connection.commit()
+
+    def cancel(self, thread_id=None):
+        """
+        Cancel a running statement. Every method opens its own cursor, so queries
+        can run on worker threads and be interrupted from the GUI thread.
+        Cancelling interrupts whatever runs on the session, so it is refused while
+        threads share one: without a pool, or during an explicit transaction. The
+        caller then simply ignores the statement's result.
+        :param thread_id: Thread whose session should be interrupted; None cancels every running statement.
+        :return: True if a session was interrupted.
+        """
+        if self.pool is None or self.transaction_connection is not None:
+            return False
+        with self.sessions_lock:
+            if thread_id is None:
+                connections = set(self.active_sessions.values())
+            else:
+                connections = [self.active_sessions[thread_id]] if thread_id in self.active_sessions else []
+
+        for connection in connections:
+            try:
+                connection.cancel()
+            except oracledb.DatabaseError as e:
+                print(f"Error cancelling query: {e}")
+        return bool(connections)
+
+    def set_fetch_size(self, table_name, arraysize=None, prefetchrows=None):
+        """
+        Set the fetch sizes used for every query against a table.
+        :param table_name: Name of the table.
+        :param arraysize: Rows fetched per round trip (None removes the table's setting).
+        :param prefetchrows: Rows returned by the execute round trip itself.
+        """
+        if arraysize is None:
+            self.fetch_sizes.pop(table_name.upper(), None)
+        else:
+            self.fetch_sizes[table_name.upper()] = (arraysize, prefetchrows)
+
+    def adaptive_arraysize(self, table_name):
+        """
+        Compute an arraysize that keeps each round trip near fetch_buffer_bytes,
+        based on the declared column widths of the table.
+        :param table_name: Name of the table.
+        :return: Rows per round trip, between 100 and 10000.
+        """
+        metadata = self.get_table_metadata(table_name)
+        row_width = metadata.row_width if metadata else 0
+        return max(100, min(10000, self.fetch_buffer_bytes // max(row_width, 1)))
+
+    def fetch_settings(self, table_name, limit=None, arraysize=None, prefetchrows=None):
+        """
+        Choose a query's fetch batch sizes. Per-query values win over per-table
+        settings; otherwise a page is returned in a single round trip, and
+        adaptive mode sizes unpaged reads from the table's row width.
+        Called before a session is checked out, since adaptive sizing may query metadata.
+        :param table_name: Name of the queried table.
+        :param limit: Page size of the query, if it is paged.
+        :param arraysize: Rows fetched per round trip.
+        :param prefetchrows: Rows returned by the execute round trip itself.
+        :return: Tuple of arraysize and prefetchrows; None keeps the driver default.
+        """
+        if arraysize is None and table_name.upper() in self.fetch_sizes:
+            arraysize, table_prefetchrows = self.fetch_sizes[table_name.upper()]
+            if prefetchrows is None:
+                prefetchrows = table_prefetchrows
+        if arraysize is None:
+            if limit is not None:
+                # One extra row lets the driver see the end of the page without another round trip
+                arraysize = limit
+                if prefetchrows is None:
+                    prefetchrows = limit + 1
+            elif self.adaptive_fetch:
+                arraysize = self.adaptive_arraysize(table_name)
+                if prefetchrows is None:
+                    prefetchrows = arraysize
+        return arraysize, prefetchrows
+
+    @staticmethod
+    def configure_fetch(cursor, arraysize=None, prefetchrows=None):
+        """Apply fetch batch sizes to a cursor before it is executed."""
+        if arraysize is not None:
+            cursor.arraysize = arraysize
+        if prefetchrows is not None:
+            cursor.prefetchrows = prefetchrows
+
+    def load_metadata(self, table_name=None):
+        """
+        Load columns, primary keys and indexes with one query per data dictionary
+        view and store them in the metadata cache.
+        :param table_name: Load a single table; None loads every table of the schema.
+        :return: Dictionary of table name -> TableMetadata.
+        """
+        parameters = {} if table_name is None else {"table_name": table_name.upper()}
+        table_filter = "" if table_name is None else " AND table_name = :table_name"
+        tables = {}
+        table_names = None
+
+        with self.session() as connection, connection.cursor() as cursor:
+            cursor.arraysize = cursor.prefetchrows = 1000
+            if table_name is None:
+                cursor.execute("SELECT table_name FROM user_tables ORDER BY table_name")
+                table_names = [row[0] for row in cursor.fetchall()]
+                tables = {name: TableMetadata(name) for name in table_names}
+
+            cursor.execute(
+                "SELECT table_name, column_name, data_type, data_length, data_precision, data_scale, nullable "
+                "FROM user_tab_columns WHERE 1 = 1" + table_filter + " ORDER BY table_name, column_id",
+                parameters
+            )
+            for name, column_name, data_type, data_length, precision, scale, nullable in cursor.fetchall():
+                table = tables.setdefault(name, TableMetadata(name))
+                table.columns.append(
+                    ColumnMetadata(column_name, data_type, data_length, precision, scale, nullable == "Y")
+                )
+
+            cursor.execute(
+                "SELECT c.table_name, cc.column_name FROM user_constraints c "
+                "JOIN user_cons_columns cc ON cc.constraint_name = c.constraint_name "
+                "WHERE c.constraint_type = 'P'" + table_filter.replace("table_name", "c.table_name", 1) +
+                " ORDER BY c.table_name, cc.position",
+                parameters
+            )
+            for name, column_name in cursor.fetchall():
+                if name in tables:
+                    tables[name].primary_key.append(column_name)
+
+            cursor.execute(
+                "SELECT i.table_name, i.index_name, i.index_type, i.uniqueness, i.ityp_name, ic.column_name "
+                "FROM user_indexes i JOIN user_ind_columns ic ON ic.index_name = i.index_name "
+                "WHERE 1 = 1" + table_filter.replace("table_name", "i.table_name", 1) +
+                " ORDER BY i.table_name, i.index_name, ic.column_position",
+                parameters
+            )
+            for name, index_name, index_type, uniqueness, domain_type, column_name in cursor.fetchall():
+                if name in tables:
+                    index = tables[name].indexes.setdefault(
+                        index_name, IndexMetadata(index_name, index_type, uniqueness == "UNIQUE", domain_type)
+                    )
+                    index.columns.append(column_name)
+
+        self.metadata_cache.store(tables, table_names)
+        return tables
+
+    def get_table_metadata(self, table_name):
+        """
+        Retrieve cached columns, primary key and indexes of a table, loading the
+        whole schema in bulk when the cache is empty or expired.
+        :param table_name: Name of the table.
+        :return: TableMetadata or None if the table does not exist.
+        """
+        try:
+            # The cache lock is not held while loading: load_metadata checks out a session, and a
+            # worker holding the lock while it waits for one could block workers that hold the others
+            metadata = self.metadata_cache.get(table_name)
+            if metadata is None:
+                if self.metadata_cache.is_fresh():
+                    tables = self.load_metadata(table_name)
+                else:
+                    tables = self.load_metadata()
+                metadata = tables.get(table_name.upper())
+            return metadata
+        except oracledb.DatabaseError as e:
+            print(f"Error retrieving metadata for table {table_name}: {e}")
+            return None
+
+    def invalidate_metadata(self, table_name=None):
+        """
+        Forget cached metadata, e.g. after DDL run outside this class.
+        :param table_name: Table to forget; None forgets every table.
+        """
+        self.metadata_cache.invalidate(table_name)
+
+    def execute_ddl(self, statement):
+        """
+        Run a DDL statement and invalidate the cached metadata and results, since
+        tables, columns or indexes may have changed.
+        :param statement: DDL statement such as CREATE TABLE or CREATE INDEX.
+        :return: None
+        """
+        try:
+            with self.session() as connection, connection.cursor() as cursor:
+                cursor.execute(statement)
+            print("Successfully executed DDL statement.")
+        except oracledb.DatabaseError as e:
+            print(f"Error executing DDL statement: {e}")
+        finally:
+            self.invalidate_metadata()
+            self.invalidate_results()
+
+    def get_table_scn(self, table_name):
+        """
+        Retrieve the highest ORA_ROWSCN of a table, which grows whenever any
+        session commits a change to it. ORA_ROWSCN is not indexed, so this reads
+        the whole table; revalidation goes through current_scn, which reuses the
+        value for revalidate_interval seconds.
+        :param table_name: Name of the table.
+        :return: System change number.
+        """
+        with self.session() as connection, connection.cursor() as cursor:
+            cursor.execute(f"SELECT MAX(ORA_ROWSCN) FROM {table_name}")
+            scn = cursor.fetchone()[0]
+        self.table_scns[table_name.upper()] = (time.monotonic(), scn)
+        return scn
+
+    def current_scn(self, table_name):
+        """
+        Return a table's MAX(ORA_ROWSCN), read again only when the last reading is
+        older than revalidate_interval seconds, so cache hits on a large table do
+        not each scan it.
+        """
+        checked = self.table_scns.get(table_name.upper())
+        if checked is not None and time.monotonic() - checked[0] < self.revalidate_interval:
+            return checked[1]
+        return self.get_table_scn(table_name)
+
+    def get_cached_result(self, table_name, cache_key):
+        """
+        Return a cached (rows, columns) result, or None on a miss. With
+        revalidate_results, entries whose table changed since they were cached
+        are dropped; changes are noticed within revalidate_interval seconds.
+        """
+        if self.result_cache is None:
+            return None
+        entry = self.result_cache.get(cache_key)
+        if entry is None:
+            return None
+        if self.revalidate_results and self.current_scn(table_name) != entry.scn:
+            self.result_cache.discard(cache_key)
+            return None
+        return entry.rows, entry.columns
+
+    def invalidate_results(self, table_name=None):
+        """
+        Drop cached results after a change to a table.
+        :param table_name: Table that changed; None drops every cached result.
+        """
+        if self.result_cache is not None:
+            self.result_cache.invalidate(table_name)
+        if table_name is None:
+            self.table_scns.clear()
+        else:
+            self.table_scns.pop(table_name.upper(), None)
+
     def get_table_names(self):
         """Retrieve all table names available to the user."""
         try:
-            query = "SELECT table_name FROM user_tables"
-            self.cursor.execute(query)
-            return [row[0] for row in self.cursor.fetchall()]
+            # Loaded outside the cache lock, like in get_table_metadata
+            if not self.metadata_cache.is_fresh():
+                self.load_metadata()
+            with self.metadata_cache.lock:
+                return list(self.metadata_cache.table_names or [])
         except oracledb.DatabaseError as e:
             print(f"Error retrieving table names: {e}")
             return []
 
     def get_table_attributes(self, table_name):
         """
-        Retrieve the column names and data types of a given table.
+        Retrieve the column names of a given table from the metadata cache.
         :param table_name: Name of the table.
         :return: List of column names.
         """
-        try:
-            query = "SELECT column_name FROM user_tab_columns WHERE table_name = :table_name"
-            self.cursor.execute(query, [table_name.upper()])
-            return [row[0] for row in self.cursor.fetchall()]
-        except oracledb.DatabaseError as e:
-            print(f"Error retrieving attributes for table {table_name}: {e}")
-            return []
+        metadata = self.get_table_metadata(table_name)
+        return metadata.column_names if metadata else []
+
+    def filter_planner(self, table_name):
+        """Return a FilterPlanner using the cached column types and indexes of a table."""
+        return FilterPlanner(self.get_table_metadata(table_name))
+
+    def build_filter_clause(self, table_name, filters):
+        """
+        Build the WHERE clause for a dictionary of column-filter pairs, with a
+        predicate chosen per column by the FilterPlanner.
+        :return: Tuple of the clause (empty when there are no filters) and its bind parameters.
+        """
+        if not any(filters.values() if filters else ()):
+            return "", {}
+        return self.filter_planner(table_name).plan(filters)
+
+    def build_table_query(self, table_name, filters=None, sort_column=None, sort_order="ASC",
+                          offset=None, limit=None, sort_keys=None):
+        """
+        Build the SELECT statement for a table view with optional filtering, sorting and paging.
+        :return: Tuple of the query and its bind parameters.
+        """
+        where_clause, parameters = self.build_filter_clause(table_name, filters)
+        query = f"SELECT * FROM {table_name}{where_clause}"
+        return self.order_and_page(query, parameters, sort_column, sort_order, offset, limit,
+                                   sort_keys=sort_keys), parameters
 
-    def get_table_data(self, table_name, filters=None, sort_column=None, sort_order="ASC"):
+    @staticmethod
+    def order_and_page(query, parameters, sort_column=None, sort_order="ASC", offset=None, limit=None,
+                       row_order="ROWID", sort_keys=None):
         """
-        Retrieve table data with optional filtering and sorting.
+        Add sorting and paging to a query, adding the paging binds to parameters.
+        :param row_order: Expression ordering rows with equal sort keys, so pages fetched
+                          independently do not overlap; None when the rows have no such order.
+        :param sort_keys: List of (column, descending) pairs, most significant first, to sort by
+                          several columns instead of sort_column and sort_order.
+        :return: The query with its ORDER BY and OFFSET ... FETCH clauses.
+        """
+        if sort_keys is None and sort_column:
+            sort_keys = [(sort_column, str(sort_order).upper() == "DESC")]
+
+        # Add sorting
+        if sort_keys:
+            query += " ORDER BY " + ", ".join(f"{column} {'DESC' if descending else 'ASC'}"
+                                              for column, descending in sort_keys)
+            if limit is not None and row_order:
+                # Break ties so that rows with equal sort keys keep their page
+                query += f", {row_order}"
+        elif limit is not None and row_order:
+            # Pages are fetched independently, so they need a stable row order
+            query += f" ORDER BY {row_order}"
+
+        # Add paging
+        if limit is not None:
+            query += " OFFSET :row_offset ROWS FETCH NEXT :row_limit ROWS ONLY"
+            parameters["row_offset"] = offset or 0
+            parameters["row_limit"] = limit
+        return query
+
+    def build_aggregate_query(self, table_name, x_column, y_column, aggregate="SUM", filters=None,
+                              buckets=None, max_groups=None):
+        """
+        Build a query that aggregates a table in the database, so only the
+        plotted series is sent to the client.
+        Without buckets the rows are grouped by each distinct x value. With
+        buckets the rows are split into that many equal-sized ranges of x
+        (NTILE), each reported by its smallest x value, which keeps line charts
+        of very large tables to a fixed number of points.
+        :return: Tuple of the query and its bind parameters.
+        """
+        aggregate = aggregate.upper()
+        if aggregate not in self.AGGREGATES:
+            raise ValueError(f"Unsupported aggregate {aggregate}.")
+
+        where_clause, parameters = self.build_filter_clause(table_name, filters)
+        if buckets:
+            query = (f"SELECT MIN(x_value) AS {x_column}, {aggregate}(y_value) AS {aggregate}_{y_column} "
+                     f"FROM (SELECT {x_column} AS x_value, {y_column} AS y_value, "
+                     f"NTILE(:buckets) OVER (ORDER BY {x_column}) AS bucket "
+                     f"FROM {table_name}{where_clause}) "
+                     f"GROUP BY bucket ORDER BY bucket")
+            parameters["buckets"] = buckets
+        else:
+            query = (f"SELECT {x_column}, {aggregate}({y_column}) AS {aggregate}_{y_column} "
+                     f"FROM {table_name}{where_clause} GROUP BY {x_column} ORDER BY {x_column}")
+            if max_groups is not None:
+                query += " FETCH FIRST :max_groups ROWS ONLY"
+                parameters["max_groups"] = max_groups
+        return query, parameters
+
+    def fetch_cached(self, table_name, query, parameters, fetch_settings=(None, None), columnar=False):
+        """
+        Run a query through the result cache.
+        :param table_name: Table the query reads, used to invalidate the cached result.
+        :param fetch_settings: Tuple of arraysize and prefetchrows for the cursor.
+        :param columnar: Return a ColumnarResult instead of row tuples.
+        :return: Tuple of rows and column names, or a ColumnarResult.
+        """
+        cache_key = ResultCache.make_key(query, parameters) + (("columnar",) if columnar else ())
+        cached = self.get_cached_result(table_name, cache_key)
+        if cached is not None:
+            self.profiler.record_cache_hit(query, parameters, len(cached[0]))
+            return cached[0] if columnar else cached
+
+        # Read the SCN before the data so a concurrent change can only make the entry look stale
+        scn = self.get_table_scn(table_name) if self.result_cache is not None and self.revalidate_results else None
+        with self.session() as connection:
+            if columnar:
+                rows = self.fetch_columnar(connection, query, parameters, fetch_settings)
+                columns = rows.columns
+            else:
+                with connection.cursor() as cursor:
+                    self.configure_fetch(cursor, *fetch_settings)
+                    cursor.execute(query, parameters)
+                    rows = cursor.fetchall()
+                    columns = [col[0] for col in cursor.description]
+        if self.result_cache is not None:
+            self.result_cache.put(cache_key, table_name, rows, columns, scn)
+        return rows if columnar else (rows, columns)
+
+    def get_table_data(self, table_name, filters=None, sort_column=None, sort_order="ASC",
+                       offset=None, limit=None, arraysize=None, prefetchrows=None):
+        """
+        Retrieve table data with optional filtering, sorting and paging.
         :param table_name: Name of the table.
-        :param filters: Dictionary of column-value pairs for filtering.
+        :param filters: Dictionary of column-value pairs for filtering; values are strings or FilterPlanner.Filter.
         :param sort_column: Column to sort by.
         :param sort_order: Sort order ('ASC' or 'DESC').
+        :param offset: Number of rows to skip before the returned page.
+        :param limit: Maximum number of rows to return (None returns every row).
+        :param arraysize: Rows fetched per round trip for this query.
+        :param prefetchrows: Rows returned by the execute round trip for this query.
         :return: Tuple of rows and column names.
         """
         try:
-            query = f"SELECT * FROM {table_name}"
-            parameters = {}
-            filter_clauses = []
+            query, parameters = self.build_table_query(table_name, filters, sort_column, sort_order, offset, limit)
+            return self.fetch_cached(table_name, query, parameters,
+                                     self.fetch_settings(table_name, limit, arraysize, prefetchrows))
+        except oracledb.DatabaseError as e:
+            print(f"Error retrieving data from table {table_name}: {e}")
+            return [], []
 
-            # Add filtering conditions
-            if filters:
-                for column, value in filters.items():
-                    if value:  # Only add filters with non-empty values
-                        filter_clauses.append(f"UPPER({column}) LIKE UPPER(:{column})")
-                        parameters[column] = f"%{value}%"
+    def get_table_result(self, table_name, filters=None, sort_column=None, sort_order="ASC",
+                         offset=None, limit=None, arraysize=None, prefetchrows=None):
+        """
+        Retrieve table data like get_table_data, but as a ColumnarResult of typed
+        column arrays instead of a list of tuples.
+        :return: ColumnarResult (empty with no columns on error).
+        """
+        # Imported on first use, so NumPy is not loaded before the window is shown
+        from ColumnarResult import ColumnarResult
 
-            if filter_clauses:
-                query += " WHERE " + " AND ".join(filter_clauses)
+        try:
+            query, parameters = self.build_table_query(table_name, filters, sort_column, sort_order, offset, limit)
+            return self.fetch_cached(table_name, query, parameters,
+                                     self.fetch_settings(table_name, limit, arraysize, prefetchrows), columnar=True)
+        except oracledb.DatabaseError as e:
+            print(f"Error retrieving data from table {table_name}: {e}")
+            return ColumnarResult.from_rows([], [])
 
-            # Add sorting
-            if sort_column:
-                query += f" ORDER BY {sort_column} {sort_order}"
+    def get_query_result(self, query, filters=None, sort_column=None, sort_order="ASC", offset=None, limit=None):
+        """
+        Run a custom SELECT statement as a ColumnarResult, filtered, sorted and
+        paged like get_table_result by wrapping it in an outer query. Without a
+        sort column the pages follow the statement's own ORDER BY. The result is
+        not cached, since the tables the statement reads are not known.
+        Errors are raised to the caller.
+        :param query: SELECT statement, without a trailing semicolon.
+        :param filters: Dictionary of column-value pairs for filtering; the columns' types are
+                        not known, so every filter matches text.
+        :return: ColumnarResult.
+        """
+        where_clause, parameters = FilterPlanner().plan(filters)
+        statement = self.order_and_page(f"SELECT * FROM ({query}){where_clause}", parameters, sort_column,
+                                        sort_order, offset, limit, row_order=None)
+        with self.session() as connection:
+            return self.fetch_columnar(connection, statement, parameters,
+                                       (limit, limit + 1) if limit is not None else (None, None))
 
-            self.cursor.execute(query, parameters)
-            rows = self.cursor.fetchall()
-            columns = [col[0] for col in self.cursor.description]
-            return rows, columns
+    def get_aggregated_data(self, table_name, x_column, y_column, aggregate="SUM", filters=None,
+                            buckets=None, max_groups=None):
+        """
+        Retrieve a chart series aggregated in the database.
+        :param table_name: Name of the table.
+        :param x_column: Column to group (or bucket) by.
+        :param y_column: Column to aggregate.
+        :param aggregate: One of SUM, AVG, COUNT, MIN or MAX.
+        :param filters: Dictionary of column-value pairs for filtering.
+        :param buckets: Split the x range into this many buckets instead of grouping by each value.
+        :param max_groups: Maximum number of groups to return when grouping by value.
+        :return: Tuple of rows (x, aggregated y) and column names.
+        """
+        try:
+            query, parameters = self.build_aggregate_query(table_name, x_column, y_column, aggregate, filters,
+                                                           buckets, max_groups)
+            points = buckets or max_groups
+            return self.fetch_cached(table_name, query, parameters, (points, points))
         except oracledb.DatabaseError as e:
-            print(f"Error retrieving data from table {table_name}: {e}")
+            print(f"Error aggregating data from table {table_name}: {e}")
             return [], []
 
+    def get_column_arrays(self, table_name, columns, filters=None, sort_column=None):
+        """
+        Retrieve whole columns as NumPy arrays for plotting.
+        Numbers become int64/float64 (NaN for nulls), dates datetime64 (NaT for nulls)
+        and text an object array.
+        :param table_name: Name of the table.
+        :param columns: Column names to fetch.
+        :param filters: Dictionary of column-value pairs for filtering.
+        :param sort_column: Column to sort by.
+        :return: List of arrays in the order of columns.
+        """
+        from ColumnarResult import ColumnarResult
+
+        selected = list(dict.fromkeys(column.upper() for column in columns))
+        where_clause, parameters = self.build_filter_clause(table_name, filters)
+        query = f"SELECT {', '.join(selected)} FROM {table_name}{where_clause}"
+        if sort_column:
+            query += f" ORDER BY {sort_column}"
+
+        try:
+            arraysize = self.fetch_settings(table_name)[0] or 10000
+            with self.session() as connection:
+                result = self.fetch_columnar(connection, query, parameters, (arraysize, arraysize))
+        except oracledb.DatabaseError as e:
+            print(f"Error retrieving columns from table {table_name}: {e}")
+            result = ColumnarResult.from_rows([], selected)
+        return [result.column_array(selected.index(column.upper())) for column in columns]
+
+    def fetch_columnar(self, connection, query, parameters, fetch_settings=(None, None)):
+        """
+        Run a query into a ColumnarResult. When the driver and pyarrow support
+        it the rows go straight into Arrow buffers (fetch_df_all) and never
+        become Python tuples; otherwise each fetch batch is converted as it
+        arrives, so the tuples of a large result never exist all at once.
+        Numbers are fetched as Arrow decimals, so they keep their exact values.
+        """
+        from ColumnarResult import ColumnarResult
+
+        try:
+            import pyarrow
+        except ImportError:
+            pyarrow = None
+        if pyarrow is not None and hasattr(connection, "fetch_df_all"):
+            frame = connection.fetch_df_all(query, parameters, fetch_settings[0], fetch_decimals=True)
+            return ColumnarResult.from_arrow(pyarrow.table(frame))
+
+        with connection.cursor() as cursor:
+            self.configure_fetch(cursor, *fetch_settings)
+            cursor.execute(query, parameters)
+            columns = [col[0] for col in cursor.description]
+            batch_size = max(cursor.arraysize, 10000)
+            batches = [ColumnarResult.from_rows([], columns)]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                batches.append(ColumnarResult.from_rows(rows, columns))
+        return ColumnarResult.concatenate(batches)
+
+    def stream_table_data(self, table_name, filters=None, sort_column=None, sort_order="ASC", batch_size=10000,
+                          sort_keys=None):
+        """
+        Stream table data in batches from one server-side cursor, bypassing the
+        result cache, so arbitrarily large results use constant memory.
+        Database errors are raised to the consumer.
+        :param table_name: Name of the table.
+        :param filters: Dictionary of column-value pairs for filtering.
+        :param sort_column: Column to sort by.
+        :param sort_order: Sort order ('ASC' or 'DESC').
+        :param batch_size: Rows fetched per round trip and yielded per batch.
+        :param sort_keys: List of (column, descending) pairs, most significant first; replaces sort_column
+                          and sort_order when given.
+        :return: Generator of (rows, column names) tuples.
+        """
+        query, parameters = self.build_table_query(table_name, filters, sort_column, sort_order, sort_keys=sort_keys)
+        with self.session() as connection, connection.cursor() as cursor:
+            self.configure_fetch(cursor, batch_size, batch_size)
+            cursor.execute(query, parameters)
+            columns = [col[0] for col in cursor.description]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows, columns
+
+    def explain_plan(self, query, parameters=None):
+        """
+        Retrieve the execution plan Oracle chooses for a statement with EXPLAIN PLAN
+        and DBMS_XPLAN.DISPLAY. The statement itself is not run. A RETURNING ... INTO
+        clause is left out, since its output variables cannot be bound here.
+        :param query: Statement to explain.
+        :param parameters: Binds of the statement; EXPLAIN PLAN does not look at their values, so
+                           the None values kept by the profiler will do.
+        :return: List of plan lines (empty on error).
+        """
+        returning = re.search(r"\s+RETURNING\s+.+\s+INTO\s+(:\w+(?:\s*,\s*:\w+)*)\s*$", query, re.I | re.S)
+        if returning:
+            out_names = {name.upper() for name in re.findall(r":(\w+)", returning.group(1))}
+            query = query[:returning.start()]
+            if isinstance(parameters, dict):
+                parameters = {name: value for name, value in parameters.items() if name.upper() not in out_names}
+        statement_id = f"DBUI_{threading.get_ident()}_{id(query)}"
+        try:
+            with self.profiler.suspended(), self.session() as connection, connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {query}", parameters or {})
+                cursor.execute(
+                    "SELECT plan_table_output FROM TABLE(DBMS_XPLAN.DISPLAY('PLAN_TABLE', :statement_id, 'TYPICAL'))",
+                    {"statement_id": statement_id}
+                )
+                plan = [row[0] for row in cursor.fetchall()]
+                cursor.execute("DELETE FROM plan_table WHERE statement_id = :statement_id",
+                               {"statement_id": statement_id})
+                self.finish_write(connection)
+            return plan
+        except oracledb.DatabaseError as e:
+            print(f"Error explaining statement: {e}")
+            return []
+
+    def get_primary_key(self, table_name):
+        """
+        Retrieve the primary key columns of a table (from user_constraints, through the metadata cache).
+        :param table_name: Name of the table.
+        :return: List of column names, empty if the table has no primary key.
+        """
+        metadata = self.get_table_metadata(table_name)
+        return list(metadata.primary_key) if metadata else []
+
+    def entry_key(self, table_name, entry):
+        """
+        Turn a reference to an entry into a key dictionary. Dictionaries (e.g. from
+        TableMetadata.row_key) are used as they are; a single value is matched
+        against a one-column primary key, or the ID column of tables without one.
+        :param table_name: Name of the table.
+        :param entry: Dictionary of key column-value pairs or a single key value.
+        :return: Dictionary of key column-value pairs.
+        """
+        if isinstance(entry, dict):
+            return entry
+        primary_key = self.get_primary_key(table_name)
+        if len(primary_key) > 1:
+            raise ValueError(f"Table {table_name} has a composite primary key ({', '.join(primary_key)}); "
+                             f"identify its entries by all key columns.")
+        return {primary_key[0] if primary_key else "ID": entry}
+
+    @staticmethod
+    def build_key_clause(key, prefix="key"):
+        """
+        Build the condition matching a row key. Null values, which only occur when
+        a table without a primary key is matched on every column, use IS NULL.
+        :param key: Dictionary of column-value pairs.
+        :param prefix: Prefix of the bind variable names, to combine several conditions in one statement.
+        :return: Tuple of the condition and its bind parameters.
+        """
+        predicates = []
+        parameters = {}
+        for position, (column, value) in enumerate(key.items()):
+            if value is None:
+                predicates.append(f"{column} IS NULL")
+            else:
+                predicates.append(f"{column} = :{prefix}{position}")
+                parameters[f"{prefix}{position}"] = value
+        return " AND ".join(predicates), parameters
+
+    def convert_updates(self, table_name, updates):
+        """
+        Convert the values of a change entered as text to the types of their columns,
+        so numbers and dates are bound as such instead of relying on implicit conversion.
+        """
+        metadata = self.get_table_metadata(table_name)
+        converted = {}
+        for column, value in updates.items():
+            column_metadata = metadata.column(column) if metadata else None
+            converted[column] = convert_value(value, column_metadata) if column_metadata else value
+        return converted
+
+    def get_row_version(self, table_name, key):
+        """
+        Read a row for editing together with its ROWID and ORA_ROWSCN.
+        Errors are raised to the caller.
+        :param table_name: Name of the table.
+        :param key: Dictionary of column-value pairs identifying the row (see entry_key).
+        :return: RowVersion.
+        :raises RowChangedError: If no row matches the key any more.
+        :raises ValueError: If several rows match, which can happen in tables without a primary key.
+        """
+        where_clause, parameters = self.build_key_clause(self.entry_key(table_name, key))
+        query = (f"SELECT t.*, ROWIDTOCHAR(ROWID) AS ROW_ID, ORA_ROWSCN AS ROW_SCN FROM {table_name} t "
+                 f"WHERE {where_clause} FETCH FIRST :row_limit ROWS ONLY")
+        parameters["row_limit"] = 2
+        with self.session() as connection, connection.cursor() as cursor:
+            cursor.execute(query, parameters)
+            rows = cursor.fetchall()
+            columns = [col[0] for col in cursor.description]
+        if not rows:
+            raise RowChangedError("The entry no longer exists; it may have been deleted by another user.")
+        if len(rows) > 1:
+            raise ValueError(f"Several rows of table {table_name} match the selected entry; "
+                             f"a table without a primary key cannot tell identical rows apart.")
+        *values, row_id, scn = rows[0]
+        return RowVersion(table_name, columns[:-2], values, row_id, scn)
+
+    def get_rows(self, table_name, keys, batch_size=500):
+        """
+        Read rows by their keys, e.g. to refresh the rows changed by edit_entries,
+        with one query per batch_size keys. Errors are raised to the caller.
+        :param table_name: Name of the table.
+        :param keys: List of row keys (see entry_key).
+        :param batch_size: Keys looked up per query.
+        :return: ColumnarResult of the rows found, in no particular order.
+        """
+        from ColumnarResult import ColumnarResult
+
+        keys = [self.entry_key(table_name, key) for key in keys]
+        batches = [ColumnarResult.from_rows([], self.get_table_attributes(table_name))]
+        with self.session() as connection:
+            for start in range(0, len(keys), batch_size):
+                conditions = []
+                parameters = {}
+                for position, key in enumerate(keys[start:start + batch_size]):
+                    condition, key_parameters = self.build_key_clause(key, f"key{position}_")
+                    conditions.append(f"({condition})")
+                    parameters.update(key_parameters)
+                query = f"SELECT * FROM {table_name} WHERE {' OR '.join(conditions)}"
+                batches.append(self.fetch_columnar(connection, query, parameters))
+        return ColumnarResult.concatenate(batches)
+
+    @staticmethod
+    def returning_type(column):
+        """Type of the output variable receiving a column in RETURNING ... INTO, or None if it cannot be returned."""
+        if column.is_numeric:
+            return oracledb.DB_TYPE_NUMBER
+        if column.data_type == "DATE":
+            return oracledb.DB_TYPE_DATE
+        if column.data_type.startswith("TIMESTAMP") and "ZONE" not in column.data_type:
+            return oracledb.DB_TYPE_TIMESTAMP
+        if column.data_type in ("VARCHAR2", "NVARCHAR2", "CHAR", "NCHAR"):
+            return str
+        return None
+
+    def execute_returning(self, connection, cursor, metadata, statement, parameters):
+        """
+        Run an INSERT or UPDATE of a single row with RETURNING ... INTO, so the
+        row as stored (with defaults, trigger changes and rounding) comes back in
+        the same round trip. Tables with columns that cannot be returned (e.g.
+        LOBs) return the ROWID instead and the row is selected again.
+        :param metadata: TableMetadata of the table, resolved before the session was acquired, since
+                         loading it needs a session of its own.
+        :return: ColumnarResult holding the changed row; empty if no row changed.
+        """
+        from ColumnarResult import ColumnarResult
+
+        table_name = metadata.name
+        types = [self.returning_type(column) for column in metadata.columns]
+        if None in types:
+            returned = "ROWIDTOCHAR(ROWID)"
+            variables = {"returned_row_id": cursor.var(str)}
+        else:
+            returned = ", ".join(metadata.column_names)
+            variables = {f"returned{position}": cursor.var(column_type) for position, column_type in enumerate(types)}
+        cursor.execute(f"{statement} RETURNING {returned} INTO {', '.join(':' + name for name in variables)}",
+                       dict(parameters, **variables))
+        values = [variable.getvalue() for variable in variables.values()]
+        if not values[0]:
+            return ColumnarResult.from_rows([], metadata.column_names)
+        if None in types:
+            return self.fetch_columnar(connection, f"SELECT * FROM {table_name} WHERE ROWID = CHARTOROWID(:row_id)",
+                                       {"row_id": values[0][0]})
+        return ColumnarResult.from_rows([tuple(value[0] for value in values)], metadata.column_names)
+
+    def insert_row(self, table_name, data):
+        """
+        Insert a row and return it as stored, using RETURNING ... INTO so showing
+        it needs no further query. Text values are converted to the column
+        types, and empty ones are left out so column defaults apply.
+        Errors are raised to the caller.
+        :param table_name: Name of the table.
+        :param data: Dictionary of column-value pairs to insert.
+        :return: ColumnarResult holding the new row.
+        """
+        data = {column: value for column, value in self.convert_updates(table_name, data).items() if value is not None}
+        if not data:
+            raise ValueError("No values entered.")
+        columns = ", ".join(data.keys())
+        placeholders = ", ".join([f":{key}" for key in data.keys()])
+        # Resolved before the session is acquired: loading metadata checks out a session of its own
+        metadata = self.get_table_metadata(table_name)
+        if metadata is None:
+            raise ValueError(f"Table {table_name} does not exist.")
+        with self.session() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    row = self.execute_returning(connection, cursor, metadata,
+                                                 f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})", data)
+                self.finish_write(connection)
+            except oracledb.DatabaseError:
+                if self.transaction_connection is None:
+                    connection.rollback()
+                raise
+        self.invalidate_results(table_name)
+        return row
+
+    def update_row(self, table_name, version, changes):
+        """
+        Update the changed columns of a row read with get_row_version, provided
+        no other session changed it since: the row is addressed by its ROWID and
+        must still have the ORA_ROWSCN it was read with. Unchanged columns are
+        not sent, which keeps the statement and its redo small on wide tables.
+        Errors are raised to the caller.
+        ORA_ROWSCN is tracked per block unless the table was created with
+        ROWDEPENDENCIES, so a change to a neighbouring row also counts as a conflict.
+        :param table_name: Name of the table.
+        :param version: RowVersion returned by get_row_version.
+        :param changes: Dictionary of column-value pairs; text values are converted to the column types.
+        :return: ColumnarResult holding the row as stored after the update.
+        :raises RowChangedError: If the row was changed or deleted since it was read.
+        """
+        from ColumnarResult import ColumnarResult
+
+        updates = self.convert_updates(table_name, changes)
+        if not updates:
+            return ColumnarResult.from_rows([tuple(version.values)], version.columns)
+
+        metadata = self.get_table_metadata(table_name)
+        if metadata is None:
+            raise ValueError(f"Table {table_name} does not exist.")
+
+        parameters = {f"value{position}": value for position, value in enumerate(updates.values())}
+        set_clause = ", ".join(f"{column} = :value{position}" for position, column in enumerate(updates))
+        condition = "ROWID = CHARTOROWID(:row_id)"
+        parameters["row_id"] = version.row_id
+        if version.scn is not None:
+            condition += " AND ORA_ROWSCN = :row_scn"
+            parameters["row_scn"] = version.scn
+        else:
+            # No SCN for the row (e.g. changed earlier in this transaction): compare the edited columns instead
+            compared = {column: version.value(column) for column in updates
+                        if not (metadata.column(column) and metadata.column(column).is_lob)}
+            clause, key_parameters = self.build_key_clause(compared)
+            if clause:
+                condition += f" AND {clause}"
+                parameters.update(key_parameters)
+
+        with self.session() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    row = self.execute_returning(connection, cursor, metadata,
+                                                 f"UPDATE {table_name} SET {set_clause} WHERE {condition}", parameters)
+                if not len(row):
+                    raise RowChangedError("The entry was changed or deleted by another user after it was "
+                                          "opened; reload the table and try again.")
+                self.finish_write(connection)
+            except oracledb.DatabaseError:
+                if self.transaction_connection is None:
+                    connection.rollback()
+                raise
+        self.invalidate_results(table_name)
+        return row
+
     def add_entry(self, table_name, data):
         """
         Add a new entry to a table.
@@ -96,8 +1043,10 @@ class OracleDatabase:
             columns = ", ".join(data.keys())
             placeholders = ", ".join([f":{key}" for key in data.keys()])
             query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
-            self.cursor.execute(query, data)
-            self.connection.commit()
+            with self.session() as connection, connection.cursor() as cursor:
+                cursor.execute(query, data)
+                self.finish_write(connection)
+            self.invalidate_results(table_name)
             print(f"Successfully added entry to table {table_name}.")
         except oracledb.DatabaseError as e:
             print(f"Error adding entry to table {table_name}: {e}")
@@ -106,16 +1055,20 @@ class OracleDatabase:
         """
         Edit an existing entry in a table.
         :param table_name: Name of the table.
-        :param entry_id: ID of the entry to update.
+        :param entry_id: Key of the entry to update: a primary key value or a dictionary (see entry_key).
         :param updates: Dictionary of column-value pairs to update.
         :return: None
         """
         try:
+            where_clause, parameters = self.build_key_clause(self.entry_key(table_name, entry_id))
+            updates = self.convert_updates(table_name, updates)
             set_clause = ", ".join([f"{column} = :{column}" for column in updates.keys()])
-            query = f"UPDATE {table_name} SET {set_clause} WHERE ID = :entry_id"
-            updates["entry_id"] = entry_id
-            self.cursor.execute(query, updates)
-            self.connection.commit()
+            query = f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}"
+            parameters.update(updates)
+            with self.session() as connection, connection.cursor() as cursor:
+                cursor.execute(query, parameters)
+                self.finish_write(connection)
+            self.invalidate_results(table_name)
             print(f"Successfully updated entry in table {table_name}.")
         except oracledb.DatabaseError as e:
             print(f"Error editing entry in table {table_name}: {e}")
@@ -124,13 +1077,120 @@ class OracleDatabase:
         """
         Remove an entry from a table.
         :param table_name: Name of the table.
-        :param entry_id: ID of the entry to remove.
+        :param entry_id: Key of the entry to remove: a primary key value or a dictionary (see entry_key).
         :return: None
         """
         try:
-            query = f"DELETE FROM {table_name} WHERE ID = :entry_id"
-            self.cursor.execute(query, {"entry_id": entry_id})
-            self.connection.commit()
+            where_clause, parameters = self.build_key_clause(self.entry_key(table_name, entry_id))
+            query = f"DELETE FROM {table_name} WHERE {where_clause}"
+            with self.session() as connection, connection.cursor() as cursor:
+                cursor.execute(query, parameters)
+                self.finish_write(connection)
+            # ON DELETE CASCADE foreign keys may remove rows from other tables too
+            self.invalidate_results()
             print(f"Successfully removed entry from table {table_name}.")
         except oracledb.DatabaseError as e:
             print(f"Error removing entry from table {table_name}: {e}")
+
+    def run_batch(self, cursor, query, rows):
+        """
+        Execute a statement once per row in a single round trip, collecting
+        per-row errors instead of stopping at the first one.
+        :return: List of (row index, error message) tuples.
+        """
+        cursor.executemany(query, rows, batcherrors=True)
+        return [(error.offset, error.message) for error in cursor.getbatcherrors()]
+
+    def add_entries(self, table_name, rows, batch_size=5000):
+        """
+        Add many entries to a table with executemany and a single commit.
+        :param table_name: Name of the table.
+        :param rows: List of dictionaries of column-value pairs; all must have the same columns.
+        :param batch_size: Rows sent per round trip.
+        :return: List of (row index, error message) tuples for the rows that failed.
+        """
+        if not rows:
+            return []
+        errors = []
+        try:
+            columns = ", ".join(rows[0].keys())
+            placeholders = ", ".join([f":{key}" for key in rows[0].keys()])
+            query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+            with self.session() as connection, connection.cursor() as cursor:
+                for start in range(0, len(rows), batch_size):
+                    batch_errors = self.run_batch(cursor, query, rows[start:start + batch_size])
+                    errors.extend((start + offset, message) for offset, message in batch_errors)
+                self.finish_write(connection)
+            self.invalidate_results(table_name)
+            print(f"Added {len(rows) - len(errors)} of {len(rows)} entries to table {table_name}.")
+        except oracledb.DatabaseError as e:
+            print(f"Error adding entries to table {table_name}: {e}")
+            errors = [(None, str(e))]
+        return errors
+
+    def edit_entries(self, table_name, changes, batch_size=5000):
+        """
+        Edit many entries with executemany and a single commit. Entries that
+        change the same columns share one statement.
+        :param table_name: Name of the table.
+        :param changes: List of (entry key, dictionary of column-value pairs) tuples; keys as for edit_entry.
+        :param batch_size: Rows sent per round trip.
+        :return: List of (change index, error message) tuples for the changes that failed.
+        """
+        errors = []
+        try:
+            # Group the changes by the columns they update and the shape of their key condition
+            groups = {}
+            for index, (entry_id, updates) in enumerate(changes):
+                where_clause, parameters = self.build_key_clause(self.entry_key(table_name, entry_id))
+                updates = self.convert_updates(table_name, updates)
+                parameters.update(updates)
+                groups.setdefault((tuple(updates.keys()), where_clause), []).append((index, parameters))
+
+            with self.session() as connection, connection.cursor() as cursor:
+                for (columns, where_clause), group in groups.items():
+                    set_clause = ", ".join([f"{column} = :{column}" for column in columns])
+                    query = f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}"
+                    for start in range(0, len(group), batch_size):
+                        batch = group[start:start + batch_size]
+                        batch_errors = self.run_batch(cursor, query, [parameters for _, parameters in batch])
+                        errors.extend((batch[offset][0], message) for offset, message in batch_errors)
+                self.finish_write(connection)
+            self.invalidate_results(table_name)
+            print(f"Updated {len(changes) - len(errors)} of {len(changes)} entries in table {table_name}.")
+        except oracledb.DatabaseError as e:
+            print(f"Error editing entries in table {table_name}: {e}")
+            errors = [(None, str(e))]
+        return errors
+
+    def remove_entries(self, table_name, entry_ids, batch_size=5000):
+        """
+        Remove many entries with executemany and a single commit.
+        :param table_name: Name of the table.
+        :param entry_ids: List of keys of the entries to remove; keys as for remove_entry.
+        :param batch_size: Rows sent per round trip.
+        :return: List of (entry index, error message) tuples for the entries that failed.
+        """
+        errors = []
+        try:
+            # Entries whose keys have nulls in different columns need different conditions
+            groups = {}
+            for index, entry_id in enumerate(entry_ids):
+                where_clause, parameters = self.build_key_clause(self.entry_key(table_name, entry_id))
+                groups.setdefault(where_clause, []).append((index, parameters))
+
+            with self.session() as connection, connection.cursor() as cursor:
+                for where_clause, group in groups.items():
+                    query = f"DELETE FROM {table_name} WHERE {where_clause}"
+                    for start in range(0, len(group), batch_size):
+                        batch = group[start:start + batch_size]
+                        batch_errors = self.run_batch(cursor, query, [parameters for _, parameters in batch])
+                        errors.extend((batch[offset][0], message) for offset, message in batch_errors)
+                self.finish_write(connection)
+            # ON DELETE CASCADE foreign keys may remove rows from other tables too
+            self.invalidate_results()
+            print(f"Removed {len(entry_ids) - len(errors)} of {len(entry_ids)} entries from table {table_name}.")
+        except oracledb.DatabaseError as e:
+            print(f"Error removing entries from table {table_name}: {e}")
+            errors = [(None, str(e))]
+        return errors
@@ -0,0 +1,180 @@
+import numpy as np
+from matplotlib import dates
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+from PyQt5.QtWidgets import QVBoxLayout, QWidget
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling: keeps the points that best
+    preserve the visual shape of a line.
+    :param x: Sorted float array of X values.
+    :param y: Float array of Y values.
+    :param threshold: Number of points to keep.
+    :return: Indices of the kept points.
+    """
+    length = len(x)
+    if threshold >= length or threshold < 3:
+        return np.arange(length)
+
+    # The first and last points are always kept; the rest are split into equal buckets
+    edges = np.linspace(1, length - 1, threshold - 1).astype(np.int64)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = length - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The point in this bucket forming the largest triangle with the previous
+        # kept point and the average of the next bucket
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else length
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(areas.argmax())
+        indices[bucket + 1] = previous
+    return indices
+
+
+def minmax_decimate(y, bins):
+    """
+    Min/max decimation: keeps the smallest and largest point of each bin, so
+    spikes survive at any zoom level.
+    :param y: Float array of Y values.
+    :param bins: Number of bins (up to two points are kept per bin).
+    :return: Sorted indices of the kept points.
+    """
+    length = len(y)
+    if length <= 2 * bins:
+        return np.arange(length)
+
+    bin_size = -(-length // bins)
+    padded = np.full(bins * bin_size, np.nan)
+    padded[:length] = y
+    padded = padded.reshape(bins, bin_size)
+    offsets = np.arange(bins) * bin_size
+    minimum = np.where(np.isnan(padded), np.inf, padded).argmin(axis=1) + offsets
+    maximum = np.where(np.isnan(padded), -np.inf, padded).argmax(axis=1) + offsets
+    indices = np.unique(np.concatenate((minimum, maximum)))
+    return indices[indices < length]
+
+
+def coerce_array(values):
+    """Turn an object array of numbers or dates (e.g. Decimal, datetime) into a typed array."""
+    for dtype in (np.float64, "datetime64[us]"):
+        try:
+            return values.astype(dtype)
+        except (TypeError, ValueError):
+            continue
+    return values
+
+
+class PlotCanvas(QWidget):
+    """
+    Matplotlib figure embedded in a Qt widget, with the zoom/pan toolbar.
+    New charts are drawn immediately, so the time to render them is part of
+    the caller's (and the query profiler's) measurement.
+    Line charts keep the full series as NumPy arrays and only draw a
+    decimated copy sized to the canvas width, redone for the visible range
+    whenever the view is zoomed, panned or resized.
+    """
+    DECIMATION_METHODS = ("LTTB", "Min/Max")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.figure = Figure(figsize=(8, 5), tight_layout=True)
+        self.canvas = FigureCanvasQTAgg(self.figure)
+        self.toolbar = NavigationToolbar2QT(self.canvas, self)
+        self.axes = None
+        self.line = None
+        self.x = None
+        self.y = None
+        self.method = "LTTB"
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.toolbar)
+        layout.addWidget(self.canvas)
+        self.setLayout(layout)
+
+    def reset(self, title):
+        """Clear the figure for a new chart."""
+        self.figure.clear()
+        self.axes = self.figure.add_subplot()
+        self.axes.set_title(title)
+        self.line = None
+        self.x = self.y = None
+
+    def plot_bar(self, x, y, x_label, y_label, title):
+        self.reset(title)
+        self.axes.bar([str(value) for value in x], y)
+        self.axes.set_xlabel(x_label)
+        self.axes.set_ylabel(y_label)
+        self.canvas.draw()
+
+    def plot_pie(self, x, y, title):
+        self.reset(title)
+        self.axes.pie(y, labels=[str(value) for value in x], autopct='%1.1f%%')
+        self.canvas.draw()
+
+    def plot_line(self, x, y, x_label, y_label, title, method="LTTB"):
+        """
+        Plot a line from X values sorted ascending. Date X values are shown as
+        dates; other non-numeric X values are plotted by position and labelled.
+        """
+        self.reset(title)
+        self.method = method
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=np.float64)
+        if x.dtype == object:
+            x = coerce_array(x)
+
+        if x.dtype.kind == "M":
+            x = dates.date2num(x)
+            self.axes.xaxis_date()
+        elif x.dtype.kind not in "iuf":
+            labels = [str(value) for value in x]
+            x = np.arange(len(x), dtype=np.float64)
+            self.axes.xaxis.set_major_formatter(FuncFormatter(
+                lambda value, _: labels[int(value)] if 0 <= int(value) < len(labels) else ""
+            ))
+        x = x.astype(np.float64)
+
+        # Rows with a missing X or Y value cannot be drawn
+        finite = np.isfinite(x) & np.isfinite(y)
+        self.x, self.y = x[finite], y[finite]
+
+        indices = self.decimate(0, len(self.x))
+        self.line, = self.axes.plot(self.x[indices], self.y[indices], marker='.' if len(indices) < 200 else None)
+        self.axes.set_xlabel(x_label)
+        self.axes.set_ylabel(y_label)
+        self.axes.callbacks.connect("xlim_changed", self.redecimate)
+        self.canvas.draw()
+
+    def decimate(self, start, end):
+        """Indices of the points to draw for the slice [start, end) of the series."""
+        width = max(self.canvas.width(), 100)
+        if self.method == "Min/Max":
+            indices = minmax_decimate(self.y[start:end], width // 2)
+        else:
+            indices = lttb(self.x[start:end], self.y[start:end], width)
+        return indices + start
+
+    def redecimate(self, axes=None):
+        """Redraw the line from the points inside the visible X range."""
+        if self.line is None or not len(self.x):
+            return
+        low, high = self.axes.get_xlim()
+        # Keep one point beyond each edge so the line runs off the view
+        start = max(int(np.searchsorted(self.x, low, side="left")) - 1, 0)
+        end = min(int(np.searchsorted(self.x, high, side="right")) + 1, len(self.x))
+        indices = self.decimate(start, end)
+        self.line.set_data(self.x[indices], self.y[indices])
+        self.canvas.draw_idle()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.redecimate()
@@ -0,0 +1,228 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import (
+    QAbstractItemView, QCheckBox, QDockWidget, QFileDialog, QHBoxLayout, QLabel, QMessageBox, QPlainTextEdit,
+    QPushButton, QSplitter, QTableView, QVBoxLayout, QWidget
+)
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:,.0f} {unit}"
+        size /= 1024
+    return f"{size:,.1f} GB"
+
+
+class ProfilerModel(QAbstractTableModel):
+    """Table model over a snapshot of the QueryProfiler records, newest first."""
+    COLUMNS = ("Time", "Operation", "SQL", "Binds", "Execute ms", "Fetch ms", "Render ms", "Rows", "Bytes",
+               "Round Trips", "Status")
+
+    def __init__(self, profiler, parent=None):
+        super().__init__(parent)
+        self.profiler = profiler
+        self.records = []
+        self.version = None
+
+    def refresh(self):
+        """Take a new snapshot if the profiler recorded anything since the last one."""
+        if self.version == self.profiler.version:
+            return
+        self.beginResetModel()
+        self.version = self.profiler.version
+        self.records = self.profiler.snapshot()[::-1]
+        self.endResetModel()
+
+    def record(self, row):
+        return self.records[row] if 0 <= row < len(self.records) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[index.row()]
+        column = index.column()
+        if role == Qt.ToolTipRole and column == 2:
+            return record.sql
+        if role == Qt.TextAlignmentRole and 3 <= column <= 9:
+            return Qt.AlignRight | Qt.AlignVCenter
+        if role == Qt.UserRole:
+            # Raw values so the proxy sorts numbers numerically
+            return (record.started.timestamp(), record.operation or "", record.sql, record.bind_count,
+                    record.execute_seconds, record.fetch_seconds, record.render_seconds or 0.0, record.rows,
+                    record.bytes, record.round_trips, self.status(record))[column]
+        if role != Qt.DisplayRole:
+            return None
+        if column == 0:
+            return record.started.strftime("%H:%M:%S.%f")[:-3]
+        if column == 1:
+            return record.operation or ""
+        if column == 2:
+            return record.sql
+        if column == 3:
+            return record.bind_count
+        if column == 4:
+            return f"{record.execute_seconds * 1000:,.2f}"
+        if column == 5:
+            return f"{record.fetch_seconds * 1000:,.2f}"
+        if column == 6:
+            return f"{record.render_seconds * 1000:,.2f}" if record.render_seconds is not None else ""
+        if column == 7:
+            return f"{record.rows:,}"
+        if column == 8:
+            return format_bytes(record.bytes)
+        if column == 9:
+            return record.round_trips
+        return self.status(record)
+
+    @staticmethod
+    def status(record):
+        if record.error is not None:
+            return f"Error: {record.error}"
+        return "Cached" if record.cached else "OK"
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return section + 1
+
+
+class ProfilerPanel(QDockWidget):
+    """
+    Dockable view of the query profiler: one row per statement with its
+    timings and volumes, the execution plan of the selected statement on
+    demand, and export of everything recorded to JSON.
+    """
+    def __init__(self, db, executor, parent=None):
+        super().__init__("Query Profiler", parent)
+        self.db = db
+        self.executor = executor
+        self.setObjectName("QueryProfiler")
+
+        self.model = ProfilerModel(db.profiler, self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setSortRole(Qt.UserRole)
+
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        self.table_view.setWordWrap(False)
+        self.table_view.doubleClicked.connect(self.explain_selected)
+
+        self.plan_view = QPlainTextEdit()
+        self.plan_view.setReadOnly(True)
+        self.plan_view.setFont(QFont("Courier New", 10))
+        self.plan_view.setPlaceholderText("Select a statement and press Explain Plan.")
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self.table_view)
+        splitter.addWidget(self.plan_view)
+
+        self.summary_label = QLabel()
+        # Recording is off unless OracleDatabase was created with profile=True
+        self.record_box = QCheckBox("Record")
+        self.record_box.setChecked(db.profiler.enabled)
+        self.record_box.toggled.connect(self.set_recording)
+        self.explain_button = QPushButton("Explain Plan")
+        self.explain_button.clicked.connect(self.explain_selected)
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.clicked.connect(self.clear)
+        self.export_button = QPushButton("Export JSON")
+        self.export_button.clicked.connect(self.export_json)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.summary_label, 1)
+        buttons.addWidget(self.record_box)
+        buttons.addWidget(self.explain_button)
+        buttons.addWidget(self.clear_button)
+        buttons.addWidget(self.export_button)
+
+        layout = QVBoxLayout()
+        layout.addLayout(buttons)
+        layout.addWidget(splitter)
+        container = QWidget()
+        container.setLayout(layout)
+        self.setWidget(container)
+
+        # Statements are recorded on worker threads; the view polls while it is shown
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self.update_refresh)
+
+    def set_recording(self, enabled):
+        """Start or stop recording statements; sessions checked out afterwards follow the new setting."""
+        self.db.profiler.enabled = enabled
+
+    def update_refresh(self, visible):
+        if visible:
+            self.refresh()
+            self.refresh_timer.start()
+        else:
+            self.refresh_timer.stop()
+
+    def refresh(self):
+        """Show records added since the last refresh and update the totals."""
+        self.model.refresh()
+        summary = self.db.profiler.summary()
+        self.summary_label.setText(
+            f"{summary['statements']:,} statements ({summary['cached']:,} cached, {summary['errors']:,} failed), "
+            f"{summary['database_ms']:,.0f} ms in the database, {summary['render_ms']:,.0f} ms rendering, "
+            f"{summary['rows']:,} rows, {format_bytes(summary['bytes'])}, ~{summary['round_trips']:,} round trips"
+        )
+
+    def selected_record(self):
+        indexes = self.table_view.selectionModel().selectedRows()
+        if not indexes:
+            return None
+        return self.model.record(self.proxy.mapToSource(indexes[0]).row())
+
+    def explain_selected(self):
+        """Fetch the execution plan of the selected statement in the background."""
+        record = self.selected_record()
+        if record is None:
+            QMessageBox.warning(self, "Warning", "No statement selected.")
+            return
+        if record.plan is not None:
+            self.show_plan(record, record.plan)
+            return
+        self.plan_view.setPlainText("Explaining...")
+        self.executor.submit(
+            self.db.explain_plan, record.sql, record.parameters,
+            on_result=lambda plan: self.show_plan(record, plan),
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not explain statement: {message}")
+        )
+
+    def show_plan(self, record, plan):
+        if not plan:
+            self.plan_view.setPlainText("The plan could not be retrieved.")
+            return
+        self.db.profiler.set_plan(record, plan)
+        self.plan_view.setPlainText("\n".join(plan))
+
+    def clear(self):
+        self.db.profiler.clear()
+        self.plan_view.clear()
+        self.refresh()
+
+    def export_json(self):
+        """Export the recorded statements, with any plans already retrieved, to a JSON file."""
+        path, _ = QFileDialog.getSaveFileName(self, "Export Profile", "query_profile.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.db.profiler.export_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Could not export profile: {e}")
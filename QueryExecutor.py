@@ -0,0 +1,126 @@
+import threading
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class QueryTask(QRunnable):
+    """A database call scheduled on the QueryExecutor thread pool."""
+    def __init__(self, executor, function, args, kwargs, on_result=None, on_error=None, on_progress=None,
+                 measure_render=False):
+        super().__init__()
+        self.setAutoDelete(False)  # The executor keeps the task until its result is delivered
+        self.executor = executor
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.measure_render = measure_render
+        self.records = []  # QueryProfiler records of the statements the task ran
+        self.started = False
+        self.thread_id = None
+        self.done = False
+        self.cancelled = False
+        self.result = None
+        self.error = None
+
+    def run(self):
+        self.thread_id = threading.get_ident()
+        self.started = True
+        if self.cancelled:
+            self.done = True
+            self.executor.task_finished.emit(self)
+            return
+
+        if self.on_progress is not None:
+            self.kwargs["progress_callback"] = lambda value: self.executor.task_progress.emit(self, value)
+        operation = getattr(self.function, "__name__", None)
+        try:
+            with self.executor.db.profiler.capture(operation) as self.records:
+                self.result = self.function(*self.args, **self.kwargs)
+        except Exception as e:
+            self.error = str(e)
+        self.done = True
+        self.executor.task_finished.emit(self)
+
+    def cancel(self):
+        """
+        Cancel the task. Its callbacks will not be called, and if its query is
+        already running on the database it is interrupted.
+        """
+        if self.done or self.cancelled:
+            return
+        self.cancelled = True
+        if self.started:
+            self.executor.cancel_running_query(self)
+
+
+class QueryExecutor(QObject):
+    """
+    Runs OracleDatabase calls on a pool of worker threads so the Qt event loop
+    never blocks on the database. Results, errors and progress are delivered
+    on the GUI thread through the callbacks passed to submit().
+    """
+    task_finished = pyqtSignal(object)
+    task_progress = pyqtSignal(object, object)
+    running_changed = pyqtSignal(int)
+
+    def __init__(self, db, max_threads=4, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.tasks = set()
+        self.task_finished.connect(self.deliver_result)
+        self.task_progress.connect(self.deliver_progress)
+
+    def submit(self, function, *args, on_result=None, on_error=None, on_progress=None, measure_render=False,
+               **kwargs):
+        """
+        Run a function on a worker thread.
+        :param function: Callable to run, usually an OracleDatabase method.
+        :param on_result: Called on the GUI thread with the return value.
+        :param on_error: Called on the GUI thread with the error message.
+        :param on_progress: Called on the GUI thread with progress values; when set,
+                            the function receives a progress_callback keyword argument.
+        :param measure_render: Record the time on_result takes as the render time of the
+                               task's statements in the query profiler.
+        :return: QueryTask handle that can be cancelled.
+        """
+        task = QueryTask(self, function, args, kwargs, on_result, on_error, on_progress, measure_render)
+        self.tasks.add(task)
+        self.pool.start(task)
+        self.running_changed.emit(len(self.tasks))
+        return task
+
+    def cancel_running_query(self, task):
+        """Interrupt the database call of a running task on the session it checked out."""
+        self.db.cancel(task.thread_id)
+
+    def deliver_result(self, task):
+        """Hand a finished task's result or error to its callbacks."""
+        self.tasks.discard(task)
+        self.running_changed.emit(len(self.tasks))
+        if task.cancelled:
+            return
+        if task.error is not None:
+            if task.on_error is not None:
+                task.on_error(task.error)
+            else:
+                print(f"Background query failed: {task.error}")
+        elif task.on_result is not None:
+            start = time.perf_counter()
+            task.on_result(task.result)
+            if task.measure_render:
+                self.db.profiler.add_render_time(task.records, time.perf_counter() - start)
+
+    def deliver_progress(self, task, value):
+        """Hand a progress update to the task's callback."""
+        if not task.cancelled and task.on_progress is not None:
+            task.on_progress(value)
+
+    def wait_for_done(self, timeout=-1):
+        """Block until every submitted task has finished (used on shutdown)."""
+        return self.pool.waitForDone(timeout)
@@ -0,0 +1,339 @@
+import datetime
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def estimate_bytes(rows, sample_size=100):
+    """
+    Approximate the bytes a batch of fetched rows took on the wire, extrapolated
+    from a sample: text and raw values count their length, numbers 8 bytes,
+    dates 7 bytes and nulls 1 byte.
+    """
+    if not rows:
+        return 0
+    sample = rows[:sample_size]
+    size = 0
+    for row in sample:
+        for value in row:
+            if value is None:
+                size += 1
+            elif isinstance(value, (str, bytes)):
+                size += len(value)
+            elif isinstance(value, (datetime.date, datetime.datetime)):
+                size += 7
+            else:
+                size += 8
+    return size * len(rows) // len(sample)
+
+
+class StatementRecord:
+    """Timings and volumes of one statement (or of one result served from the cache)."""
+    __slots__ = ("sql", "parameters", "bind_count", "operation", "started", "execute_seconds", "fetch_seconds",
+                 "render_seconds", "rows", "bytes", "round_trips", "cached", "error", "plan")
+
+    def __init__(self, sql, parameters, bind_count, operation=None, cached=False):
+        self.sql = " ".join(sql.split())
+        # Only the bind names are kept, for EXPLAIN PLAN: values may hold passwords, personal data or out variables
+        self.parameters = blank_binds(parameters)
+        self.bind_count = bind_count
+        self.operation = operation
+        self.started = datetime.datetime.now()
+        self.execute_seconds = 0.0
+        self.fetch_seconds = 0.0
+        self.render_seconds = None
+        self.rows = 0
+        self.bytes = 0
+        self.round_trips = 0
+        self.cached = cached
+        self.error = None
+        self.plan = None
+
+    @property
+    def database_seconds(self):
+        return self.execute_seconds + self.fetch_seconds
+
+    def to_dict(self):
+        """Exportable form of the record; bind values are left out."""
+        return {
+            "started": self.started.isoformat(timespec="milliseconds"),
+            "operation": self.operation,
+            "sql": self.sql,
+            "bind_count": self.bind_count,
+            "execute_ms": round(self.execute_seconds * 1000, 3),
+            "fetch_ms": round(self.fetch_seconds * 1000, 3),
+            "render_ms": round(self.render_seconds * 1000, 3) if self.render_seconds is not None else None,
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "round_trips": self.round_trips,
+            "cached": self.cached,
+            "error": self.error,
+            "plan": self.plan,
+        }
+
+
+def bind_count(parameters):
+    return len(parameters) if isinstance(parameters, (dict, list, tuple)) else 0
+
+
+def blank_binds(parameters):
+    """The binds of a statement with every value replaced by None."""
+    if isinstance(parameters, dict):
+        return dict.fromkeys(parameters)
+    if isinstance(parameters, (list, tuple)):
+        return [None] * len(parameters)
+    return None
+
+
+class ProfiledCursor:
+    """
+    Wraps a driver cursor and records each statement it runs. Round trips are
+    estimated from the cursor's prefetchrows and arraysize: the execute returns
+    prefetchrows rows, and every time the client buffer runs dry another
+    arraysize rows are fetched.
+    """
+    __slots__ = ("cursor", "profiler", "record", "buffered")
+
+    def __init__(self, cursor, profiler):
+        object.__setattr__(self, "cursor", cursor)
+        object.__setattr__(self, "profiler", profiler)
+        object.__setattr__(self, "record", None)
+        object.__setattr__(self, "buffered", 0)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+    def __setattr__(self, name, value):
+        if name in ProfiledCursor.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.cursor, name, value)  # e.g. arraysize and prefetchrows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cursor.close()
+
+    def __iter__(self):
+        while True:
+            rows = self.fetchmany()
+            if not rows:
+                return
+            yield from rows
+
+    def execute(self, statement, parameters=None, **keyword_parameters):
+        self.record = self.profiler.start(statement, parameters or keyword_parameters)
+        start = time.perf_counter()
+        try:
+            result = self.cursor.execute(statement, parameters, **keyword_parameters)
+        except Exception as e:
+            self.record.error = str(e)
+            raise
+        finally:
+            self.record.execute_seconds = time.perf_counter() - start
+            self.record.round_trips = 1
+        if self.cursor.description is None:
+            self.record.rows = max(self.cursor.rowcount or 0, 0)
+        self.buffered = self.cursor.prefetchrows or 0
+        return self if result is not None else None
+
+    def executemany(self, statement, parameters, **options):
+        first = parameters[0] if len(parameters) else None
+        self.record = self.profiler.start(statement, first)
+        start = time.perf_counter()
+        try:
+            return self.cursor.executemany(statement, parameters, **options)
+        except Exception as e:
+            self.record.error = str(e)
+            raise
+        finally:
+            self.record.execute_seconds = time.perf_counter() - start
+            self.record.round_trips = 1
+            self.record.rows = len(parameters)
+
+    def fetched(self, rows, start, exhausted):
+        """Account for rows taken from the cursor by one fetch call."""
+        record = self.record
+        if record is None:
+            return
+        record.fetch_seconds += time.perf_counter() - start
+        record.rows += len(rows)
+        record.bytes += estimate_bytes(rows)
+        # Seeing the end of the result takes one row more than was returned
+        needed = len(rows) + (1 if exhausted else 0)
+        while needed > self.buffered:
+            record.round_trips += 1
+            self.buffered += max(self.cursor.arraysize, 1)
+        self.buffered -= len(rows)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self.cursor.fetchone()
+        self.fetched([row] if row is not None else [], start, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = size or self.cursor.arraysize
+        start = time.perf_counter()
+        rows = self.cursor.fetchmany(size)
+        self.fetched(rows, start, len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self.cursor.fetchall()
+        self.fetched(rows, start, True)
+        return rows
+
+
+class ProfiledConnection:
+    """Wraps a driver connection so its cursors and data frame fetches are recorded."""
+    def __init__(self, connection, profiler):
+        self.connection = connection
+        self.profiler = profiler
+
+    def __getattr__(self, name):
+        attribute = getattr(self.connection, name)
+        if name == "fetch_df_all":
+            return self.profiled_fetch_df_all(attribute)
+        return attribute
+
+    def cursor(self):
+        return ProfiledCursor(self.connection.cursor(), self.profiler)
+
+    def profiled_fetch_df_all(self, fetch_df_all):
+        def fetch(statement, parameters=None, arraysize=None, **options):
+            record = self.profiler.start(statement, parameters)
+            start = time.perf_counter()
+            try:
+                frame = fetch_df_all(statement, parameters, arraysize, **options)
+                try:
+                    import pyarrow
+                    frame = pyarrow.table(frame)
+                    record.rows = frame.num_rows
+                    record.bytes = frame.nbytes
+                except ImportError:
+                    pass
+            except Exception as e:
+                record.error = str(e)
+                raise
+            finally:
+                record.execute_seconds = time.perf_counter() - start
+            batch = arraysize or 100
+            record.round_trips = 1 + record.rows // batch
+            return frame
+        return fetch
+
+
+class QueryProfiler:
+    """
+    Records every statement run through OracleDatabase sessions: SQL, bind
+    count, execute and fetch time, rows, approximate bytes and estimated round
+    trips, plus the time the UI spent rendering the result. The most recent
+    max_records statements are kept and can be exported as JSON.
+    """
+    def __init__(self, max_records=1000, enabled=True):
+        self.enabled = enabled
+        self.records = deque(maxlen=max_records)
+        self.version = 0  # Bumped whenever records are added or changed, so views know when to refresh
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def connection(self, connection):
+        """Wrap a connection so its statements are recorded, unless profiling is off."""
+        if not self.enabled or getattr(self.local, "suspended", False):
+            return connection
+        return ProfiledConnection(connection, self)
+
+    def start(self, sql, parameters, cached=False):
+        """Create and keep the record of a statement that is about to run."""
+        record = StatementRecord(sql, parameters, bind_count(parameters), getattr(self.local, "operation", None),
+                                 cached)
+        with self.lock:
+            self.records.append(record)
+            self.version += 1
+        captured = getattr(self.local, "captured", None)
+        if captured is not None:
+            captured.append(record)
+        return record
+
+    def record_cache_hit(self, sql, parameters, rows):
+        """Record a result served from the result cache without a round trip."""
+        if self.enabled:
+            self.start(sql, parameters, cached=True).rows = rows
+
+    @contextmanager
+    def capture(self, operation=None):
+        """
+        Collect the records of the statements run by this thread inside the
+        block, labelled with an operation name.
+        :return: List that receives the records.
+        """
+        records = []
+        previous = getattr(self.local, "captured", None), getattr(self.local, "operation", None)
+        self.local.captured, self.local.operation = records, operation
+        try:
+            yield records
+        finally:
+            self.local.captured, self.local.operation = previous
+
+    @contextmanager
+    def suspended(self):
+        """Leave the statements run by this thread inside the block unrecorded (e.g. EXPLAIN PLAN)."""
+        previous = getattr(self.local, "suspended", False)
+        self.local.suspended = True
+        try:
+            yield
+        finally:
+            self.local.suspended = previous
+
+    def add_render_time(self, records, seconds):
+        """Attribute the time spent showing a result to the statement that produced it."""
+        if not records:
+            return
+        record = records[-1]
+        record.render_seconds = (record.render_seconds or 0.0) + seconds
+        with self.lock:
+            self.version += 1
+
+    def set_plan(self, record, plan):
+        record.plan = plan
+        with self.lock:
+            self.version += 1
+
+    def snapshot(self):
+        """Return the kept records, oldest first."""
+        with self.lock:
+            return list(self.records)
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.version += 1
+
+    def summary(self):
+        """Totals over the kept records."""
+        records = self.snapshot()
+        return {
+            "statements": len(records),
+            "cached": sum(record.cached for record in records),
+            "errors": sum(record.error is not None for record in records),
+            "database_ms": round(sum(record.database_seconds for record in records) * 1000, 3),
+            "render_ms": round(sum(record.render_seconds or 0.0 for record in records) * 1000, 3),
+            "rows": sum(record.rows for record in records),
+            "bytes": sum(record.bytes for record in records),
+            "round_trips": sum(record.round_trips for record in records),
+        }
+
+    def export_json(self, path):
+        """Write the summary and every kept record to a JSON file."""
+        report = {
+            "exported": datetime.datetime.now().isoformat(timespec="seconds"),
+            "summary": self.summary(),
+            "statements": [record.to_dict() for record in self.snapshot()],
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, default=str)
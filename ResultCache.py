@@ -0,0 +1,105 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedResult:
+    """Rows and column names of one cached query, plus what is needed to revalidate it."""
+    def __init__(self, table_name, rows, columns, size, scn=None):
+        self.table_name = table_name
+        self.rows = rows
+        self.columns = columns
+        self.size = size
+        self.scn = scn
+        self.cached_at = time.monotonic()
+
+
+class ResultCache:
+    """
+    Client-side LRU cache of query results, bounded by their approximate size in
+    memory. Entries are keyed on the whitespace-normalized SQL and its binds and
+    are invalidated per table when the application changes that table. With a
+    ttl, entries older than ttl seconds are dropped on lookup, which bounds how
+    long changes committed by other sessions can stay hidden.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query, parameters):
+        """Build a cache key from a statement and its bind values."""
+        return " ".join(query.split()), tuple(sorted((parameters or {}).items()))
+
+    @staticmethod
+    def estimate_size(rows, columns):
+        """Approximate memory used by a result, extrapolated from a sample of its rows."""
+        size = sum(sys.getsizeof(column) for column in columns)
+        if hasattr(rows, "nbytes"):
+            # Columnar results know the size of their buffers
+            return size + rows.nbytes
+        size += sys.getsizeof(rows)
+        if not rows:
+            return size
+        sample = rows[:100]
+        sample_size = sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row) for row in sample)
+        return size + sample_size * len(rows) // len(sample)
+
+    def get(self, key):
+        """Return the CachedResult for a key, marking it most recently used, or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry.cached_at > self.ttl:
+                self.size -= self.entries.pop(key).size
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, table_name, rows, columns, scn=None):
+        """
+        Cache a result, evicting least recently used entries to stay within max_bytes.
+        Results larger than the whole cache are not stored.
+        """
+        size = self.estimate_size(rows, columns)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            self.entries[key] = CachedResult(table_name.upper(), rows, columns, size, scn)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def discard(self, key):
+        """Remove a single entry, e.g. one that failed revalidation."""
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry.size
+
+    def invalidate(self, table_name=None):
+        """
+        Drop cached results.
+        :param table_name: Drop only results read from this table; None drops everything.
+        """
+        with self.lock:
+            if table_name is None:
+                self.entries.clear()
+                self.size = 0
+                return
+            table_name = table_name.upper()
+            for key in [key for key, entry in self.entries.items() if entry.table_name == table_name]:
+                self.size -= self.entries.pop(key).size
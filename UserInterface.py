@@ -1,24 +1,633 @@
 import sys
+import threading
+from collections import OrderedDict
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QVBoxLayout, QComboBox, QTableWidget,
-    QTableWidgetItem, QWidget, QMessageBox, QScrollArea, QPushButton, QDialog, QFormLayout, QLineEdit, QLabel
+    QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QComboBox, QTableView, QAbstractItemView,
+    QWidget, QMessageBox, QScrollArea, QPushButton, QDialog, QFormLayout, QLineEdit, QLabel,
+    QFileDialog, QProgressDialog, QSpinBox, QTabWidget, QInputDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont
 from OracleDatabase import OracleDatabase  # Import the backend class
+from QueryExecutor import QueryExecutor
+from FilterPlanner import FILTER_MODES, Filter, FilterPlanner
+import DataTransfer
+from ProfilerPanel import ProfilerPanel
+
+
+def batch_error_text(errors, limit=10):
+    """Describe the per-row errors returned by the OracleDatabase batch methods."""
+    lines = [f"Row {index + 1}: {message}" if index is not None else message for index, message in errors[:limit]]
+    if len(errors) > limit:
+        lines.append(f"... and {len(errors) - limit} more")
+    return "\n".join(lines)
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Table model that fetches rows from the database in pages as the view scrolls.
+    Only the most recently used pages are kept in memory; evicted pages are
+    fetched again when the view needs them. All fetches run on the QueryExecutor.
+    Once every row of a result has been loaded, further filtering and sorting
+    run locally on the loaded rows (see apply_filters and sort).
+    With a query the model pages through the result of a custom SELECT
+    statement instead of a table, and its table_name stays None.
+    """
+    load_failed = pyqtSignal(str)
+    memory_changed = pyqtSignal()  # Emitted when rows were loaded (see memory_bytes)
+
+    def __init__(self, db, executor, page_size=500, max_cached_pages=20, query=None, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.executor = executor
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self.query = query
+        self.table_name = None
+        self.filters = None
+        self.sort_column = None
+        self.sort_order = "ASC"
+        self.columns = []
+        self.pages = OrderedDict()
+        self.pending_pages = set()
+        self.loaded_rows = 0
+        self.exhausted = True
+        self.fetching_more = False
+        self.load_task = None
+        self.generation = 0  # Bumped on every reset so late page results are dropped
+        self.planner = None  # FilterPlanner of the table
+        self.local_engine = None  # LocalQueryEngine over the complete result, when it is loaded
+        self.base_filters = None  # Server-side filters of the complete result
+        self.visible_rows = None  # Rows of the complete result shown, in display order
+        self.sort_keys = []  # Local sort columns, most significant first
+
+    def load_table(self, table_name, filters=None, sort_column=None, sort_order="ASC"):
+        """
+        Load the first page of a table on a worker thread. A newer load cancels
+        one that is still in flight, and only the latest result is shown.
+        :param table_name: Name of the table.
+        :param filters: Dictionary of column-value pairs for filtering.
+        :param sort_column: Column to sort by.
+        :param sort_order: Sort order ('ASC' or 'DESC').
+        """
+        if self.load_task is not None:
+            self.load_task.cancel()
+        self.generation += 1
+        generation = self.generation
+        self.load_task = self.executor.submit(
+            self.fetch_first_page, table_name, filters, sort_column, sort_order,
+            on_result=lambda loaded: self.finish_load(generation, table_name, filters, sort_column, sort_order,
+                                                      *loaded),
+            on_error=self.load_failed.emit,
+            measure_render=True
+        )
+
+    def fetch_first_page(self, table_name, filters, sort_column, sort_order):
+        """Fetch the first page and the table's filter planner (runs on a worker thread)."""
+        page = self.fetch_result(table_name, filters, sort_column, sort_order, 0)
+        return page, self.db.filter_planner(table_name) if self.query is None else FilterPlanner()
+
+    def fetch_result(self, table_name, filters, sort_column, sort_order, offset):
+        """Fetch the page of the table (or the query) starting at a row offset."""
+        if self.query is not None:
+            return self.db.get_query_result(self.query, filters, sort_column, sort_order,
+                                            offset=offset, limit=self.page_size)
+        return self.db.get_table_result(table_name, filters, sort_column, sort_order,
+                                        offset=offset, limit=self.page_size)
+
+    def finish_load(self, generation, table_name, filters, sort_column, sort_order, page, planner):
+        """Show the first page of a background load unless a newer load superseded it."""
+        if generation != self.generation:
+            return
+        self.load_task = None
+        self.set_table(table_name, filters, sort_column, sort_order, first_page=page, planner=planner)
+        self.memory_changed.emit()
+
+    def set_table(self, table_name, filters=None, sort_column=None, sort_order="ASC", first_page=None,
+                  planner=None):
+        """
+        Point the model at a table and load its first page.
+        :param table_name: Name of the table.
+        :param filters: Dictionary of column-value pairs for filtering.
+        :param sort_column: Column to sort by.
+        :param sort_order: Sort order ('ASC' or 'DESC').
+        :param first_page: ColumnarResult already fetched in the background.
+        :param planner: FilterPlanner of the table, used to filter the rows locally.
+        """
+        self.beginResetModel()
+        self.generation += 1
+        self.table_name = table_name
+        self.filters = filters
+        self.sort_column = sort_column
+        self.sort_order = sort_order
+        self.pages.clear()
+        self.pending_pages.clear()
+        self.fetching_more = False
+        self.local_engine = None
+        self.visible_rows = None
+        self.sort_keys = []
+        if planner is None:
+            planner = self.db.filter_planner(table_name) if self.query is None else FilterPlanner()
+        self.planner = planner
+
+        page = first_page if first_page is not None else self.fetch_page(0)
+        self.columns = page.columns
+        self.store_page(0, page)
+        self.loaded_rows = len(page)
+        self.exhausted = len(page) < self.page_size
+        self.check_complete()
+        self.endResetModel()
+
+    def check_complete(self):
+        """
+        Switch to local filtering and sorting once the whole result is loaded
+        and still cached, merging its pages into one ColumnarResult. Results
+        whose filters only the database can evaluate stay paged.
+        """
+        # NumPy and the local engine are imported when first needed, not at startup
+        import numpy as np
+        from ColumnarResult import ColumnarResult
+        from LocalQueryEngine import LocalQueryEngine
+
+        page_count = -(-self.loaded_rows // self.page_size)
+        if not self.exhausted or self.local_engine is not None or \
+                not all(page_index in self.pages for page_index in range(page_count)):
+            return
+        pages = [self.pages[page_index] for page_index in range(page_count)] or [self.pages[0]]
+        engine = LocalQueryEngine(ColumnarResult.concatenate(pages), self.planner)
+        if not engine.can_filter(self.filters):
+            return
+        self.local_engine = engine
+        self.base_filters = dict(self.filters or {})
+        # Header clicks sort the rows stably, so the server's order keeps breaking ties
+        self.sort_keys = [(self.sort_column, self.sort_order == "DESC")] if self.sort_column else []
+        self.visible_rows = np.arange(self.loaded_rows, dtype=np.int64)
+        self.pages.clear()
+
+    def can_filter_locally(self, table_name, filters):
+        """
+        Whether new filters can be applied to the loaded rows: the complete
+        result must be loaded and every server-side filter must still hold for
+        the new filters (e.g. a contains value that was only extended), so the
+        new matches are a subset of the loaded rows, and the engine must evaluate
+        the new filters the way Oracle does.
+        """
+        if self.local_engine is None or table_name != self.table_name:
+            return False
+        filters = filters or {}
+        return all(filters.get(column) and self.planner.implies(column, filters[column], value)
+                   for column, value in self.base_filters.items() if value) and self.local_engine.can_filter(filters)
+
+    def apply_filters(self, table_name, filters):
+        """
+        Filter the table, in memory when the loaded rows are complete and
+        otherwise by reloading it from the database.
+        :return: True if the filters were applied locally.
+        """
+        if not self.can_filter_locally(table_name, filters):
+            self.load_table(table_name, filters, self.sort_column, self.sort_order)
+            return False
+
+        self.beginResetModel()
+        self.filters = filters
+        self.visible_rows = self.local_engine.sort(self.local_engine.filter(filters), self.sort_keys)
+        self.endResetModel()
+        return True
+
+    def local_row(self, row):
+        """Row of the complete result shown at a view row, or None."""
+        return self.visible_rows[row] if row < len(self.visible_rows) else None
+
+    def fetch_page(self, page_index):
+        """Fetch a single page of rows from the database as a ColumnarResult."""
+        return self.fetch_result(self.table_name, self.filters, self.sort_column, self.sort_order,
+                                 page_index * self.page_size)
+
+    def store_page(self, page_index, page):
+        """Cache a page, evicting the least recently used pages beyond the limit."""
+        self.pages[page_index] = page
+        self.pages.move_to_end(page_index)
+        while len(self.pages) > self.max_cached_pages:
+            self.pages.popitem(last=False)
+
+    def request_page(self, page_index):
+        """Fetch an evicted page in the background and repaint its rows when it arrives."""
+        if page_index in self.pending_pages:
+            return
+        self.pending_pages.add(page_index)
+        generation = self.generation
+        self.executor.submit(
+            self.fetch_page, page_index,
+            on_result=lambda page: self.finish_page(generation, page_index, page),
+            on_error=self.load_failed.emit,
+            measure_render=True
+        )
+
+    def finish_page(self, generation, page_index, page):
+        """Store a page fetched by request_page and refresh the rows it covers."""
+        if generation != self.generation:
+            return
+        self.pending_pages.discard(page_index)
+        self.store_page(page_index, page)
+        if page:
+            first_row = page_index * self.page_size
+            self.dataChanged.emit(self.index(first_row, 0),
+                                  self.index(first_row + len(page) - 1, len(self.columns) - 1))
+        self.memory_changed.emit()
+
+    def row_values(self, row):
+        """
+        Return the values of a loaded row. An evicted page is requested in the
+        background instead of being fetched on the GUI thread; use read_rows to wait for it.
+        :param row: Row number in the model.
+        :return: Row of cell values or None if the row does not exist or is not loaded.
+        """
+        if self.local_engine is not None:
+            local_row = self.local_row(row)
+            return self.local_engine.result.row(local_row) if local_row is not None else None
+
+        page_index, page_offset = divmod(row, self.page_size)
+        page = self.pages.get(page_index)
+        if page is None:
+            self.request_page(page_index)
+            return None
+        self.pages.move_to_end(page_index)
+        return page.row(page_offset) if page_offset < len(page) else None
+
+    def read_rows(self, rows, on_result, on_error):
+        """
+        Read the values of view rows, e.g. the selected ones, fetching evicted
+        pages on the executor so a selection spanning many pages never blocks the GUI thread.
+        :param rows: Row numbers in the model.
+        :param on_result: Called with the list of row tuples, in the order of rows.
+        :param on_error: Called with a message if a page cannot be fetched or the table was reloaded meanwhile.
+        """
+        if self.local_engine is not None:
+            on_result([tuple(self.row_values(row)) for row in rows])
+            return
+        # Hold on to the cached pages now, since storing the fetched ones may evict them
+        needed = {row // self.page_size for row in rows}
+        held = {page_index: self.pages[page_index] for page_index in needed if page_index in self.pages}
+        missing = sorted(needed - set(held))
+        if not missing:
+            self.finish_read(self.generation, rows, held, {}, on_result, on_error)
+            return
+        generation = self.generation
+        self.executor.submit(
+            self.fetch_pages, missing,
+            on_result=lambda fetched: self.finish_read(generation, rows, held, fetched, on_result, on_error),
+            on_error=on_error
+        )
+
+    def fetch_pages(self, page_indices):
+        """Fetch several pages (runs on a worker thread). :return: Dictionary of page index -> page."""
+        return {page_index: self.fetch_page(page_index) for page_index in page_indices}
+
+    def finish_read(self, generation, rows, held, fetched, on_result, on_error):
+        """Hand the rows read by read_rows to its callback, unless the table was reloaded meanwhile."""
+        if generation != self.generation:
+            on_error("The table was reloaded while the entries were read; select them again.")
+            return
+        for page_index, page in fetched.items():
+            self.store_page(page_index, page)
+        pages = {**held, **fetched}
+        values = []
+        for row in rows:
+            page_index, page_offset = divmod(row, self.page_size)
+            if page_offset >= len(pages[page_index]):
+                on_error("The table changed while the entries were read; select them again.")
+                return
+            values.append(tuple(pages[page_index].row(page_offset)))
+        on_result(values)
+
+    def row_locator(self, row):
+        """
+        Remember where the values of a view row are held, so the row can be
+        patched after it is edited or deleted even if the view is filtered or
+        sorted meanwhile. Locators go stale when rows are removed or the table is reloaded.
+        """
+        if self.local_engine is not None:
+            return self.local_engine, self.generation, self.local_row(row)
+        return None, self.generation, row
+
+    def locate(self, locator):
+        """Row of the complete result (local mode) or view row (paged mode) of a locator, or None if stale."""
+        engine, generation, index = locator
+        if engine is not self.local_engine or generation != self.generation:
+            return None
+        return index
+
+    def row_matches(self, row, filters=None):
+        """
+        Whether a one-row ColumnarResult passes the given filters (by default the current ones).
+        :return: True or False, or None when only the database can evaluate the filters.
+        """
+        from LocalQueryEngine import LocalQueryEngine
+
+        engine = LocalQueryEngine(row, self.planner)
+        filters = self.filters if filters is None else filters
+        if not engine.can_filter(filters):
+            return None
+        return len(engine.filter(filters)) > 0
+
+    def placement_keys(self):
+        """Sort keys of the rows shown, most significant first, including a sort the server applied before."""
+        if self.sort_keys:
+            return self.sort_keys
+        return [(self.sort_column, self.sort_order == "DESC")] if self.sort_column else []
+
+    def place_local_row(self, index):
+        """
+        Insert, move or hide one row of the complete result in the view,
+        according to the current filters and sort, without touching the other rows.
+        """
+        import numpy as np
+
+        current = np.flatnonzero(self.visible_rows == index)
+        current = int(current[0]) if len(current) else None
+        remaining = self.visible_rows if current is None else np.delete(self.visible_rows, current)
+        if not self.local_engine.matches_row(index, self.filters):
+            if current is not None:
+                self.beginRemoveRows(QModelIndex(), current, current)
+                self.visible_rows = remaining
+                self.endRemoveRows()
+            return None
+
+        position = self.local_engine.insert_position(remaining, index, self.placement_keys())
+        if current is None:
+            self.beginInsertRows(QModelIndex(), position, position)
+            self.visible_rows = np.insert(remaining, position, index)
+            self.endInsertRows()
+            return position
+        if position != current:
+            # Qt counts the destination in rows before the move
+            self.beginMoveRows(QModelIndex(), current, current, QModelIndex(),
+                               position + 1 if position > current else position)
+            self.visible_rows = np.insert(remaining, position, index)
+            self.endMoveRows()
+        self.dataChanged.emit(self.index(position, 0), self.index(position, len(self.columns) - 1))
+        return position
+
+    def discard_pages(self, first_page=0):
+        """
+        Forget cached pages from first_page on after rows shifted on the server;
+        they are fetched again when the view shows them. Fetches in flight are dropped.
+        """
+        self.generation += 1
+        self.pending_pages.clear()
+        self.fetching_more = False
+        for page_index in [page_index for page_index in self.pages if page_index >= first_page]:
+            del self.pages[page_index]
+
+    def insert_row(self, row):
+        """
+        Show a newly inserted row without reloading the table. With the complete
+        result loaded it is placed by the current filters and sort; otherwise its
+        position is only known to the server, so the cached pages are fetched again as they are shown.
+        :param row: ColumnarResult holding the row as stored in the database.
+        :return: View row of the new row, or None if it is not shown (filtered out or not yet paged in).
+        """
+        if self.local_engine is not None:
+            # Rows outside the server-side filters do not belong in the loaded result at all
+            if not self.row_matches(row, self.base_filters):
+                return None
+            index = int(self.local_engine.append_rows(row)[0])
+            return self.place_local_row(index)
+
+        matches = self.row_matches(row)
+        if matches is None:
+            # Whether and where the row shows is only known to the server
+            self.load_table(self.table_name, self.filters, self.sort_column, self.sort_order)
+            return None
+        if not matches:
+            return None
+        self.discard_pages()
+        if self.exhausted:
+            self.beginInsertRows(QModelIndex(), self.loaded_rows, self.loaded_rows)
+            self.loaded_rows += 1
+            self.endInsertRows()
+        self.rows_changed(0)
+        return None
+
+    def replace_rows(self, locators, rows):
+        """
+        Show the new values of edited rows without reloading the table. Rows that
+        no longer pass the filters are removed and, with the complete result
+        loaded, rows move to their new place in the sort order.
+        :param locators: Values returned by row_locator when the rows were read.
+        :param rows: ColumnarResult holding the rows as stored in the database, in the order of locators.
+        :return: False if a row is no longer loaded (e.g. the table was reloaded) or only the database
+                 can tell whether it passes the filters, so a reload is needed.
+        """
+        indices = [self.locate(locator) for locator in locators]
+        if any(index is None for index in indices):
+            return False
+        if self.local_engine is not None:
+            self.local_engine.replace_rows(indices, rows)
+            for index in indices:
+                self.place_local_row(index)
+            return True
+
+        filtered_out = []
+        for position, index in enumerate(indices):
+            row = rows.take([position])
+            matches = self.row_matches(row)
+            if matches is None:
+                return False
+            if not matches:
+                filtered_out.append(locators[position])
+                continue
+            page_index, page_offset = divmod(index, self.page_size)
+            page = self.pages.get(page_index)
+            if page is not None:
+                if page_offset >= len(page):
+                    return False
+                self.pages[page_index] = page.replace_rows([page_offset], row)
+            # An evicted page is fetched again with the new values
+            self.dataChanged.emit(self.index(index, 0), self.index(index, len(self.columns) - 1))
+        return self.remove_rows(filtered_out) if filtered_out else True
+
+    def remove_rows(self, locators):
+        """
+        Remove deleted rows from the view without reloading the table.
+        :param locators: Values returned by row_locator when the rows were read.
+        :return: False if a row is no longer loaded (e.g. the table was reloaded), so a reload is needed.
+        """
+        indices = [self.locate(locator) for locator in locators]
+        if any(index is None for index in indices):
+            return False
+        if not indices:
+            return True
+        if self.local_engine is not None:
+            import numpy as np
+
+            indices = np.unique(np.asarray(indices, dtype=np.int64))
+            view_rows = np.flatnonzero(np.isin(self.visible_rows, indices))
+            for view_row in view_rows[::-1].tolist():
+                self.beginRemoveRows(QModelIndex(), view_row, view_row)
+                self.visible_rows = np.delete(self.visible_rows, view_row)
+                self.endRemoveRows()
+            self.local_engine.remove_rows(indices)
+            # Rows after the removed ones move up in the result
+            self.visible_rows = self.visible_rows - np.searchsorted(indices, self.visible_rows)
+            self.generation += 1
+            return True
+
+        view_rows = sorted(set(indices), reverse=True)
+        for view_row in view_rows:
+            self.beginRemoveRows(QModelIndex(), view_row, view_row)
+            self.loaded_rows -= 1
+            self.endRemoveRows()
+        # Rows that moved up on the server are appended by fetchMore, which also finds out if there are none
+        self.discard_pages(view_rows[-1] // self.page_size)
+        self.rows_changed(view_rows[-1])
+        return True
+
+    def rows_changed(self, first_row):
+        """Repaint the rows from first_row to the end, e.g. after their pages were discarded."""
+        if first_row < self.rowCount():
+            self.dataChanged.emit(self.index(first_row, 0), self.index(self.rowCount() - 1, len(self.columns) - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.visible_rows) if self.local_engine is not None else self.loaded_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        if self.local_engine is not None:
+            local_row = self.local_row(index.row())
+            return self.local_engine.result.display(local_row, index.column()) if local_row is not None else None
+        page_index, page_offset = divmod(index.row(), self.page_size)
+        page = self.pages.get(page_index)
+        if page is None:
+            # Painting must not block: show the cell empty until the page arrives
+            self.request_page(page_index)
+            return None
+        self.pages.move_to_end(page_index)
+        if page_offset >= len(page):
+            return None
+        return page.display(page_offset, index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section] if section < len(self.columns) else None
+        return section + 1
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Sort by the clicked column: in memory when the loaded rows are complete,
+        where earlier sort columns break ties, and otherwise on the server by
+        reloading the table with an ORDER BY.
+        """
+        if not self.table_name and self.query is None:
+            return
+        sort_column = self.columns[column] if 0 <= column < len(self.columns) else None
+        sort_order = "DESC" if order == Qt.DescendingOrder else "ASC"
+        if self.local_engine is None or sort_column is None:
+            self.load_table(self.table_name, self.filters, sort_column, sort_order)
+            return
 
+        self.beginResetModel()
+        self.sort_column = sort_column
+        self.sort_order = sort_order
+        self.sort_keys = [(sort_column, sort_order == "DESC")] + \
+                         [key for key in self.sort_keys if key[0] != sort_column]
+        self.visible_rows = self.local_engine.sort(self.visible_rows, self.sort_keys[:1])
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted and not self.fetching_more and self.local_engine is None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted or self.fetching_more:
+            return
+        self.fetching_more = True
+        page_index = self.loaded_rows // self.page_size
+        generation = self.generation
+        self.executor.submit(
+            self.fetch_page, page_index,
+            on_result=lambda page: self.append_page(generation, page_index, page),
+            on_error=self.fetch_more_failed,
+            measure_render=True
+        )
+
+    def append_page(self, generation, page_index, page):
+        """
+        Append the rows of the page fetched by fetchMore that are not loaded yet.
+        After rows were removed the last loaded page is partly loaded, so only its tail is new.
+        """
+        if generation != self.generation:
+            return
+        self.fetching_more = False
+        if len(page) < self.page_size:
+            self.exhausted = True
+        end = page_index * self.page_size + len(page)
+        if end <= self.loaded_rows:
+            # The loaded rows turned out to be all there are
+            self.check_complete()
+            return
+
+        self.beginInsertRows(QModelIndex(), self.loaded_rows, end - 1)
+        self.store_page(page_index, page)
+        self.loaded_rows = end
+        self.endInsertRows()
+        self.check_complete()
+        self.memory_changed.emit()
+
+    def memory_bytes(self):
+        """Approximate memory held by the loaded rows: the cached pages, or the complete result."""
+        if self.local_engine is not None:
+            return self.local_engine.result.nbytes
+        return sum(page.nbytes for page in self.pages.values())
+
+    def release(self):
+        """
+        Drop every loaded row to free memory, e.g. when the tab showing the model
+        is evicted. The table, filters and sort are kept so the same view can be
+        loaded again with load_table.
+        """
+        if self.load_task is not None:
+            self.load_task.cancel()
+            self.load_task = None
+        self.beginResetModel()
+        self.generation += 1
+        self.pages.clear()
+        self.pending_pages.clear()
+        self.fetching_more = False
+        self.local_engine = None
+        self.visible_rows = None
+        self.sort_keys = []
+        self.loaded_rows = 0
+        self.exhausted = True
+        self.endResetModel()
+
+    def fetch_more_failed(self, message):
+        """Allow fetchMore to retry after a failed page fetch."""
+        self.fetching_more = False
+        self.load_failed.emit(message)
 
-import matplotlib.pyplot as plt
 
 class GraphDialog(QDialog):
     """Popup dialog for selecting graph options and displaying graphs."""
-    def __init__(self, db, table_name, columns):
+    MAX_GROUPS = 1000  # Bars or slices beyond this are unreadable anyway
+    SERVER_BUCKETS = "Server Buckets"
+
+    def __init__(self, db, executor, table_name, columns, filters=None):
         super().__init__()
         self.db = db
+        self.executor = executor
         self.table_name = table_name
         self.columns = columns
+        self.filters = filters or {}
         self.setWindowTitle("Create Graph")
-        self.setGeometry(300, 300, 400, 300)
+        self.setGeometry(300, 300, 900, 700)
 
         # Layout for graph options
         self.layout = QFormLayout()
@@ -26,6 +635,7 @@ class GraphDialog(QDialog):
         # Graph type selection
         self.graph_type = QComboBox()
         self.graph_type.addItems(["Bar Chart", "Pie Chart", "Line Chart"])
+        self.graph_type.currentTextChanged.connect(self.update_options)
         self.layout.addRow("Graph Type:", self.graph_type)
 
         # X-axis column selection
@@ -38,67 +648,149 @@ class GraphDialog(QDialog):
         self.y_axis_column.addItems(columns)
         self.layout.addRow("Y-Axis:", self.y_axis_column)
 
+        # Aggregate applied to the Y values of each group
+        self.aggregate = QComboBox()
+        self.aggregate.addItems(OracleDatabase.AGGREGATES)
+        self.layout.addRow("Aggregate:", self.aggregate)
+
+        # Line charts either fetch every point and downsample to the screen,
+        # or let the database reduce the series to a fixed number of buckets.
+        # Matplotlib is only imported once a graph dialog is opened.
+        from PlotCanvas import PlotCanvas
+
+        self.line_mode = QComboBox()
+        self.line_mode.addItems(PlotCanvas.DECIMATION_METHODS + (self.SERVER_BUCKETS,))
+        self.line_mode.currentTextChanged.connect(self.update_options)
+        self.layout.addRow("Line Points:", self.line_mode)
+
+        self.line_points = QSpinBox()
+        self.line_points.setRange(10, 10000)
+        self.line_points.setValue(500)
+        self.layout.addRow("Buckets:", self.line_points)
+
+        if self.filters:
+            filter_text = ", ".join(f"{column} ~ {value}" for column, value in self.filters.items())
+            self.layout.addRow("Filters:", QLabel(filter_text))
+
         # Create Graph button
         self.create_button = QPushButton("Create Graph")
         self.create_button.clicked.connect(self.create_graph)
         self.layout.addRow(self.create_button)
 
+        # The graph is drawn inside the dialog
+        self.plot = PlotCanvas(self)
+        self.layout.addRow(self.plot)
+
         self.setLayout(self.layout)
+        self.update_options()
+
+    def update_options(self):
+        """Enable the options that apply to the selected graph type."""
+        is_line = self.graph_type.currentText() == "Line Chart"
+        server_buckets = self.line_mode.currentText() == self.SERVER_BUCKETS
+        self.line_mode.setEnabled(is_line)
+        self.line_points.setEnabled(is_line and server_buckets)
+        self.aggregate.setEnabled(not is_line or server_buckets)
 
     def create_graph(self):
-        """Fetch data and generate the selected graph."""
+        """Fetch the series in the background, then generate the selected graph."""
         graph_type = self.graph_type.currentText()
         x_column = self.x_axis_column.currentText()
         y_column = self.y_axis_column.currentText()
+        aggregate = self.aggregate.currentText()
+        line_mode = self.line_mode.currentText()
+
+        self.create_button.setEnabled(False)
+        self.create_button.setText("Loading...")
+        if graph_type == "Line Chart" and line_mode != self.SERVER_BUCKETS:
+            # Every point as NumPy arrays; the canvas decimates them to its width
+            self.executor.submit(
+                self.db.get_column_arrays, self.table_name, [x_column, y_column], self.filters, x_column,
+                on_result=lambda arrays: self.show_line(x_column, y_column, line_mode, arrays),
+                on_error=self.show_graph_error,
+                measure_render=True
+            )
+            return
 
+        if graph_type == "Line Chart":
+            buckets, max_groups = self.line_points.value(), None
+        else:
+            buckets, max_groups = None, self.MAX_GROUPS
+        self.executor.submit(
+            self.db.get_aggregated_data, self.table_name, x_column, y_column, aggregate, self.filters,
+            buckets, max_groups,
+            on_result=lambda series: self.show_graph(graph_type, x_column, y_column, aggregate, series),
+            on_error=self.show_graph_error,
+            measure_render=True
+        )
+
+    def show_graph_error(self, message):
+        """Report a failed graph query."""
+        self.reset_create_button()
+        QMessageBox.critical(self, "Error", f"Could not generate graph: {message}")
+
+    def reset_create_button(self):
+        self.create_button.setEnabled(True)
+        self.create_button.setText("Create Graph")
+
+    def show_line(self, x_column, y_column, method, arrays):
+        """Draw a line chart from full NumPy columns."""
+        self.reset_create_button()
         try:
-            # Fetch table data
-            rows, columns = self.db.get_table_data(self.table_name)
-            x_index = columns.index(x_column)
-            y_index = columns.index(y_column)
+            x_data, y_data = arrays
+            self.plot.plot_line(x_data, y_data, x_column, y_column,
+                                f"{y_column} vs {x_column} ({len(x_data):,} points)", method)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not generate graph: {e}")
 
-            x_data = [row[x_index] for row in rows]
-            y_data = [row[y_index] for row in rows]
+    def show_graph(self, graph_type, x_column, y_column, aggregate, series):
+        """Generate the selected graph from the aggregated series."""
+        self.reset_create_button()
+
+        try:
+            rows, _ = series
+            x_data = [row[0] for row in rows]
+            y_data = [row[1] for row in rows]
+            y_label = f"{aggregate}({y_column})"
+            truncated = ""
+            if graph_type != "Line Chart" and len(rows) >= self.MAX_GROUPS:
+                truncated = f" (first {len(rows):,} groups)"
 
             # Generate the graph
-            plt.figure(figsize=(10, 6))
             if graph_type == "Bar Chart":
-                plt.bar(x_data, y_data)
-                plt.xlabel(x_column)
-                plt.ylabel(y_column)
-                plt.title(f"{y_column} vs {x_column}")
+                self.plot.plot_bar(x_data, y_data, x_column, y_label, f"{y_label} vs {x_column}{truncated}")
             elif graph_type == "Pie Chart":
-                plt.pie(y_data, labels=x_data, autopct='%1.1f%%')
-                plt.title(f"{y_column} Distribution")
+                self.plot.plot_pie(x_data, y_data, f"{y_label} Distribution{truncated}")
             elif graph_type == "Line Chart":
-                plt.plot(x_data, y_data, marker='o')
-                plt.xlabel(x_column)
-                plt.ylabel(y_column)
-                plt.title(f"{y_column} vs {x_column}")
-
-            plt.show()
+                self.plot.plot_line(x_data, y_data, x_column, y_label, f"{y_label} vs {x_column}", "LTTB")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not generate graph: {e}")
 
 
 class EditEntryDialog(QDialog):
-    """Popup dialog for editing an entry."""
-    def __init__(self, db, table_name, columns, entry_id, current_values):
+    """
+    Popup dialog for editing an entry. Only the fields that were changed are
+    saved, and only if nobody changed the entry since it was read.
+    """
+    def __init__(self, db, executor, table_name, version):
         super().__init__()
         self.db = db
+        self.executor = executor
         self.table_name = table_name
-        self.columns = columns
-        self.entry_id = entry_id
+        self.version = version
+        self.updated_row = None  # ColumnarResult of the saved row
         self.setWindowTitle("Edit Entry")
         self.setGeometry(300, 300, 400, 400)
 
         # Layout for form inputs
         self.layout = QFormLayout()
         self.inputs = {}
+        self.original_text = {}
 
         # Create input fields, pre-filled with current values
-        for column, value in zip(columns, current_values):
-            line_edit = QLineEdit(str(value))  # Pre-fill with current value
+        for column, value in zip(version.columns, version.values):
+            self.original_text[column] = "" if value is None else str(value)
+            line_edit = QLineEdit(self.original_text[column])  # Pre-fill with current value
             self.inputs[column] = line_edit
             self.layout.addRow(column, line_edit)
 
@@ -110,23 +802,87 @@ class EditEntryDialog(QDialog):
         self.setLayout(self.layout)
 
     def save_changes(self):
-        """Collect data and save the changes."""
-        updates = {column: self.inputs[column].text() for column in self.columns}
-        try:
-            self.db.edit_entry(self.table_name, self.entry_id, updates)
-            QMessageBox.information(self, "Success", "Entry updated successfully!")
-            self.accept()  # Close the dialog
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not update entry: {e}")
+        """Save the fields whose text differs from the values the entry was read with."""
+        updates = {column: line_edit.text() for column, line_edit in self.inputs.items()
+                   if line_edit.text() != self.original_text[column]}
+        if not updates:
+            QMessageBox.warning(self, "Warning", "No changes entered.")
+            return
+        self.save_button.setEnabled(False)
+        self.executor.submit(self.db.update_row, self.table_name, self.version, updates,
+                             on_result=self.changes_saved, on_error=self.save_failed)
+
+    def changes_saved(self, row):
+        self.updated_row = row
+        QMessageBox.information(self, "Success", "Entry updated successfully!")
+        self.accept()  # Close the dialog
+
+    def save_failed(self, message):
+        self.save_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Could not update entry: {message}")
+
+
+class BulkEditDialog(QDialog):
+    """Popup dialog for applying the same changes to several entries."""
+    def __init__(self, db, executor, table_name, columns, entry_ids, key_columns=()):
+        super().__init__()
+        self.db = db
+        self.executor = executor
+        self.table_name = table_name
+        self.columns = [column for column in columns if column not in key_columns]  # Keys identify the entries
+        self.entry_ids = entry_ids
+        self.setWindowTitle(f"Edit {len(entry_ids)} Entries")
+        self.setGeometry(300, 300, 400, 400)
+
+        # Layout for form inputs
+        self.layout = QFormLayout()
+        self.layout.addRow(QLabel("Only the fields you fill in are changed."))
+        self.inputs = {}
+
+        for column in self.columns:
+            line_edit = QLineEdit()
+            self.inputs[column] = line_edit
+            self.layout.addRow(column, line_edit)
+
+        # Add save button
+        self.save_button = QPushButton("Save Changes")
+        self.save_button.clicked.connect(self.save_changes)
+        self.layout.addRow(self.save_button)
+
+        self.setLayout(self.layout)
+
+    def save_changes(self):
+        """Apply the filled-in fields to every selected entry in one batch."""
+        updates = {column: self.inputs[column].text() for column in self.columns if self.inputs[column].text()}
+        if not updates:
+            QMessageBox.warning(self, "Warning", "No changes entered.")
+            return
+        changes = [(entry_id, updates) for entry_id in self.entry_ids]
+        self.save_button.setEnabled(False)
+        self.executor.submit(self.db.edit_entries, self.table_name, changes,
+                             on_result=self.changes_saved, on_error=self.save_failed)
+
+    def changes_saved(self, errors):
+        if errors:
+            QMessageBox.warning(self, "Warning", f"Some entries were not updated:\n{batch_error_text(errors)}")
+        else:
+            QMessageBox.information(self, "Success", f"{len(self.entry_ids)} entries updated successfully!")
+        self.accept()  # Close the dialog
+
+    def save_failed(self, message):
+        self.save_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Could not update entries: {message}")
 
 
 class AddEntryDialog(QDialog):
     """Popup dialog for adding a new entry."""
-    def __init__(self, db, table_name, columns):
+    def __init__(self, db, executor, table_name, columns):
         super().__init__()
         self.db = db
+        self.executor = executor
         self.table_name = table_name
         self.columns = columns
+        self.inserted_row = None  # ColumnarResult of the new row, as stored
         self.setWindowTitle("Add New Entry")
         self.setGeometry(300, 300, 400, 400)
 
@@ -147,61 +903,223 @@ class AddEntryDialog(QDialog):
         self.setLayout(self.layout)
 
     def add_entry(self):
-        """Collect data and add the entry."""
+        """Collect data and add the entry; empty fields are left to the column defaults."""
         data = {column: self.inputs[column].text() for column in self.columns}
-        try:
-            self.db.add_entry(self.table_name, data)
-            QMessageBox.information(self, "Success", "Entry added successfully!")
-            self.accept()  # Close the dialog
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not add entry: {e}")
+        self.add_button.setEnabled(False)
+        self.executor.submit(self.db.insert_row, self.table_name, data,
+                             on_result=self.entry_added, on_error=self.add_failed)
+
+    def entry_added(self, row):
+        self.inserted_row = row
+        QMessageBox.information(self, "Success", "Entry added successfully!")
+        self.accept()  # Close the dialog
+
+    def add_failed(self, message):
+        self.add_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Could not add entry: {message}")
+
+
+class TableTab(QWidget):
+    """
+    One tab of the workspace: a table, or the result of a custom query, with
+    its own paged model, view and filter inputs, kept while other tabs are
+    shown. Filter edits are debounced and applied to this tab only.
+    """
+    status_message = pyqtSignal(str)
+
+    def __init__(self, db, executor, table_name=None, query=None, parent=None):
+        """
+        :param table_name: Table shown in the tab.
+        :param query: SELECT statement shown instead of a table; its rows cannot be edited.
+        """
+        super().__init__(parent)
+        self.db = db
+        self.executor = executor
+        self.table_name = table_name
+        self.query = query
+        self.released = False  # The rows were dropped to stay within the memory budget
+        self.filters = {}
+        self.filter_modes = {}
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        # Scroll area for filters
+        self.filters_container = QScrollArea()
+        self.filters_container_widget = QWidget()
+        self.filters_layout = QVBoxLayout()
+        self.filters_container_widget.setLayout(self.filters_layout)
+        self.filters_container.setWidget(self.filters_container_widget)
+        self.filters_container.setWidgetResizable(True)
+        layout.addWidget(self.filters_container)
+
+        # Filter edits are debounced, then queried on a worker thread
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(300)
+        self.filter_timer.timeout.connect(self.apply_filters)
+
+        # Table view backed by a model that fetches rows in pages
+        self.model = PagedTableModel(self.db, self.executor, query=query)
+        self.model.load_failed.connect(
+            lambda message: QMessageBox.critical(self, "Error", f"Could not fetch table data: {message}")
+        )
+        # Filter inputs are created from the columns of the first result
+        self.model.modelReset.connect(self.create_filter_inputs)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        # Header clicks call PagedTableModel.sort, which sorts on the server
+        self.view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.setSortingEnabled(True)
+        # Several rows can be selected for bulk edit and delete
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        layout.addWidget(self.view)
+
+    def create_filter_inputs(self):
+        """Create one filter input per column, once the columns are known."""
+        if self.filters or not self.model.columns:
+            return
+        for column in self.model.columns:
+            label = QLabel(column)
+            label.setFont(QFont("Arial", 12))
+            line_edit = QLineEdit()
+            line_edit.setFont(QFont("Arial", 12))
+            line_edit.setPlaceholderText("text, or for numbers and dates: 5, >= 5, 1..10")
+            line_edit.textChanged.connect(self.filter_timer.start)
+            mode = QComboBox()
+            mode.addItems(FILTER_MODES)
+            mode.currentTextChanged.connect(self.filter_timer.start)
+            self.filters[column] = line_edit
+            self.filter_modes[column] = mode
+
+            field = QWidget()
+            field_layout = QHBoxLayout()
+            field_layout.setContentsMargins(0, 0, 0, 0)
+            field_layout.addWidget(line_edit)
+            field_layout.addWidget(mode)
+            field.setLayout(field_layout)
+            self.filters_layout.addWidget(label)
+            self.filters_layout.addWidget(field)
+
+    def load(self, filters=None, sort_column=None, sort_order="ASC"):
+        """
+        Loads the tab's table (or query) in the background; further rows are
+        fetched lazily as the view scrolls.
+        """
+        self.released = False
+        # Show the sort being loaded, without the header asking the model to sort again
+        header = self.view.horizontalHeader()
+        header.blockSignals(True)
+        header.setSortIndicator(self.model.columns.index(sort_column) if sort_column in self.model.columns else -1,
+                                Qt.DescendingOrder if sort_order == "DESC" else Qt.AscendingOrder)
+        header.blockSignals(False)
+        self.model.load_table(self.table_name, filters, sort_column, sort_order)
+
+    def reload(self):
+        """Reload the tab after its table changed, keeping the current filters and sort."""
+        self.filter_timer.stop()
+        self.load(self.model.filters, self.model.sort_column, self.model.sort_order)
+
+    def release(self):
+        """Drop the loaded rows to free memory; they are loaded again by restore()."""
+        self.filter_timer.stop()
+        self.model.release()
+        self.released = True
+
+    def restore(self):
+        """Load a released tab again, with the filters and sort it had."""
+        if self.released:
+            self.reload()
+
+    def apply_filters(self):
+        """
+        Applies filters once typing pauses. When every row of the result is
+        already loaded the model filters them in memory; otherwise it runs the
+        query on a worker thread, cancels any query still in flight and shows
+        only the latest result.
+        """
+        # Collect filters from the input fields
+        filters = {}
+        for column, input_field in self.filters.items():
+            if input_field.text():
+                filters[column] = Filter(input_field.text(), self.filter_modes[column].currentText())
+
+        # Filter the loaded rows or reload the data, keeping the current sort
+        self.released = False
+        if self.model.apply_filters(self.table_name, filters):
+            self.status_message.emit(f"Filtered {self.model.rowCount():,} loaded rows locally")
+
+    def selected_rows(self):
+        """Return the selected row numbers, or the current row when no full row is selected."""
+        rows = sorted(index.row() for index in self.view.selectionModel().selectedRows())
+        if not rows and self.view.currentIndex().isValid():
+            rows = [self.view.currentIndex().row()]
+        return rows
 
 
 class DatabaseViewer(QMainWindow):
-    def __init__(self, db: OracleDatabase):
+    def __init__(self, db: OracleDatabase, memory_budget=512 * 1024 * 1024):
+        """
+        :param db: OracleDatabase to browse.
+        :param memory_budget: Bytes of loaded rows all tabs may hold together; beyond it the
+                              least recently shown tabs release their rows.
+        """
         super().__init__()
         self.db = db
-        self.db.connect()
+        self.memory_budget = memory_budget
 
         self.setWindowTitle("Oracle Database Viewer")
         self.setGeometry(100, 100, 1000, 800)
 
+        # Every database call runs on the executor's worker threads
+        self.executor = QueryExecutor(self.db, parent=self)
+        self.executor.running_changed.connect(self.show_running_queries)
+
         # Central widget and layout
         container = QWidget()
         self.setCentralWidget(container)
         self.main_layout = QVBoxLayout()
         container.setLayout(self.main_layout)
 
-        # Dropdown for table selection
+        # Dropdown for table selection: choosing a table opens its tab, or shows it if already open
+        self.selector_layout = QHBoxLayout()
         self.table_selector = QComboBox()
         self.table_selector.setFont(QFont("Arial", 12))
-        self.main_layout.addWidget(self.table_selector)
-        self.table_selector.currentIndexChanged.connect(self.setup_table_and_filters)
-
-        # Scroll area for filters
-        self.filters_container = QScrollArea()
-        self.filters_container_widget = QWidget()
-        self.filters_layout = QVBoxLayout()
-        self.filters_container_widget.setLayout(self.filters_layout)
-        self.filters_container.setWidget(self.filters_container_widget)
-        self.filters_container.setWidgetResizable(True)
-        self.main_layout.addWidget(self.filters_container)
-
-        # Table widget to display data
-        self.table_widget = QTableWidget()
-        self.table_widget.setSortingEnabled(True)  # Enable sorting by clicking headers
-        self.main_layout.addWidget(self.table_widget)
+        self.selector_layout.addWidget(self.table_selector, 1)
+        self.table_selector.currentIndexChanged.connect(self.open_selected_table)
+        self.table_selector.activated.connect(self.open_selected_table)
+        self.query_button = QPushButton("New Query")
+        self.query_button.clicked.connect(self.open_query_tab)
+        self.selector_layout.addWidget(self.query_button)
+        # Cached results only change with this application's writes; Refresh reads the current rows
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.setShortcut("F5")
+        self.refresh_button.clicked.connect(self.refresh_current_tab)
+        self.selector_layout.addWidget(self.refresh_button)
+        self.main_layout.addLayout(self.selector_layout)
+
+        # Workspace: one tab per open table or query, each with its own model and filters
+        self.tabs = QTabWidget()
+        self.tabs.setTabsClosable(True)
+        self.tabs.setMovable(True)
+        self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.tabs.currentChanged.connect(self.tab_changed)
+        self.main_layout.addWidget(self.tabs)
+        self.tab_history = []  # Open tabs, least recently shown first
+        self.query_count = 0
 
         # Add, Edit, and Delete Buttons
         self.add_button = QPushButton("Add Entry")
         self.add_button.clicked.connect(self.open_add_entry_dialog)
         self.main_layout.addWidget(self.add_button)
 
-        self.edit_button = QPushButton("Edit Selected Entry")
+        self.edit_button = QPushButton("Edit Selected Entries")
         self.edit_button.clicked.connect(self.open_edit_entry_dialog)
         self.main_layout.addWidget(self.edit_button)
 
-        self.delete_button = QPushButton("Delete Selected Entry")
+        self.delete_button = QPushButton("Delete Selected Entries")
         self.delete_button.clicked.connect(self.delete_selected_entry)
         self.main_layout.addWidget(self.delete_button)
 
@@ -209,11 +1127,39 @@ class DatabaseViewer(QMainWindow):
         self.graph_button.clicked.connect(self.open_graph_dialog)
         self.main_layout.addWidget(self.graph_button)
 
+        self.import_button = QPushButton("Import Data")
+        self.import_button.clicked.connect(self.import_data)
+        self.main_layout.addWidget(self.import_button)
+
+        self.export_button = QPushButton("Export Data")
+        self.export_button.clicked.connect(self.export_data)
+        self.main_layout.addWidget(self.export_button)
+
+        # Transaction mode: changes share one commit until Commit or Rollback is pressed
+        self.transaction_layout = QHBoxLayout()
+        self.transaction_button = QPushButton("Start Transaction")
+        self.transaction_button.clicked.connect(self.begin_transaction)
+        self.transaction_layout.addWidget(self.transaction_button)
+        self.commit_button = QPushButton("Commit")
+        self.commit_button.clicked.connect(self.commit_transaction)
+        self.transaction_layout.addWidget(self.commit_button)
+        self.rollback_button = QPushButton("Rollback")
+        self.rollback_button.clicked.connect(self.rollback_transaction)
+        self.transaction_layout.addWidget(self.rollback_button)
+        self.main_layout.addLayout(self.transaction_layout)
+        self.show_transaction_state()
+
+        # Query profiler, docked at the bottom and opened from the View menu
+        self.profiler_panel = ProfilerPanel(self.db, self.executor, self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.profiler_panel)
+        self.profiler_panel.hide()
+        self.menuBar().addMenu("View").addAction(self.profiler_panel.toggleViewAction())
+
         # Apply styling
         self.apply_styles()
 
-        # Load initial table list
-        self.refresh_table_list()
+        # Connect and load the table list in the background, after the window is shown
+        self.open_database()
 
     def apply_styles(self):
         """Applies QSS styles to modernize the UI."""
@@ -232,7 +1178,7 @@ class DatabaseViewer(QMainWindow):
                 selection-background-color: #0078d7;
                 selection-color: #ffffff;
             }
-            QTableWidget {
+            QTableView {
                 border: 1px solid #cccccc;
                 background-color: #ffffff;
                 font-size: 12px;
@@ -254,163 +1200,511 @@ class DatabaseViewer(QMainWindow):
                 font-size: 14px;
                 padding: 5px;
                 border: none;
-                cursor: pointer;
             }
         """)
 
+    def show_running_queries(self, count):
+        """Shows how many background queries are running in the status bar."""
+        if count:
+            self.statusBar().showMessage(f"Running {count} quer{'y' if count == 1 else 'ies'}...")
+        else:
+            self.statusBar().showMessage("Ready")
+
+    def open_database(self):
+        """
+        Connect and fetch the table list on a worker thread, so the window is
+        painted before the database answers. The controls stay disabled until then.
+        """
+        self.centralWidget().setEnabled(False)
+        self.executor.submit(self.connect_and_list_tables, on_result=self.database_opened,
+                             on_error=self.database_open_failed)
+        self.statusBar().showMessage("Connecting to the database...")
+
+    def connect_and_list_tables(self):
+        """Open the connection and read the table names (runs on a worker thread)."""
+        self.db.open_connection()
+        return self.db.get_table_names()
+
+    def database_opened(self, table_names):
+        """Fills the table list and enables the controls once connected."""
+        self.centralWidget().setEnabled(True)
+        self.table_selector.addItems(table_names)
+
+    def database_open_failed(self, message):
+        """Reports a failed connection; the controls stay disabled."""
+        self.statusBar().showMessage("Not connected")
+        QMessageBox.critical(self, "Error", f"Could not connect to the database: {message}")
+
     def refresh_table_list(self):
         """Refreshes the list of tables in the dropdown."""
         self.table_selector.clear()
-        try:
-            tables = self.db.get_table_names()
-            self.table_selector.addItems(tables)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not fetch table list: {e}")
-
-    def setup_table_and_filters(self):
-        """Set up filters and load table entries when a new table is selected."""
+        self.executor.submit(
+            self.db.get_table_names,
+            on_result=self.table_selector.addItems,
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not fetch table list: {message}")
+        )
+
+    @property
+    def current_tab(self):
+        """The tab shown in the workspace, or None."""
+        return self.tabs.currentWidget()
+
+    @property
+    def table_model(self):
+        """Model of the tab shown, or None."""
+        tab = self.current_tab
+        return tab.model if tab is not None else None
+
+    @property
+    def table_view(self):
+        """View of the tab shown, or None."""
+        tab = self.current_tab
+        return tab.view if tab is not None else None
+
+    def open_tabs(self):
+        return [self.tabs.widget(index) for index in range(self.tabs.count())]
+
+    def table_tab(self, table_name):
+        """The open tab of a table, or None."""
+        for tab in self.open_tabs():
+            if tab.table_name == table_name:
+                return tab
+        return None
+
+    def selected_table_tab(self):
+        """The tab shown if it holds a table, warning the user otherwise."""
+        tab = self.current_tab
+        if tab is None:
+            QMessageBox.warning(self, "Warning", "No table selected.")
+            return None
+        if tab.table_name is None:
+            QMessageBox.warning(self, "Warning", "Query results cannot be changed; open the table instead.")
+            return None
+        return tab
+
+    def open_selected_table(self):
+        """Show the tab of the table chosen in the dropdown, opening and loading it if needed."""
         selected_table = self.table_selector.currentText()
         if not selected_table:
             return
-
-        # Fetch and display table entries
-        self.load_table_data(selected_table)
-
-        # Clear and set up filter inputs dynamically based on the table's attributes
-        self.setup_filter_inputs(selected_table)
-
-    def setup_filter_inputs(self, table_name):
-        """Set up filter inputs dynamically based on the table's attributes."""
-        try:
-            # Clear existing filters
-            while self.filters_layout.count():
-                widget = self.filters_layout.takeAt(0).widget()
-                widget.deleteLater()
-
-            # Fetch table attributes
-            columns = self.db.get_table_attributes(table_name)
-
-            # Create input fields for each attribute
-            self.filters = {}
-            for column in columns:
-                label = QLabel(column)
-                label.setFont(QFont("Arial", 12))
-                line_edit = QLineEdit()
-                line_edit.setFont(QFont("Arial", 12))
-                line_edit.textChanged.connect(self.apply_filters)
-                self.filters[column] = line_edit
-                self.filters_layout.addWidget(label)
-                self.filters_layout.addWidget(line_edit)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not fetch attributes for table {table_name}: {e}")
+        tab = self.table_tab(selected_table)
+        if tab is None:
+            self.load_table_data(selected_table)
+        else:
+            self.tabs.setCurrentWidget(tab)
+
+    def open_query_tab(self):
+        """Ask for a SELECT statement and show its result in a new tab."""
+        query, accepted = QInputDialog.getMultiLineText(self, "New Query", "SELECT statement:")
+        query = query.strip().rstrip(";").strip()
+        if not accepted or not query:
+            return
+        self.query_count += 1
+        tab = self.add_tab(TableTab(self.db, self.executor, query=query), f"Query {self.query_count}")
+        self.tabs.setTabToolTip(self.tabs.indexOf(tab), query)
+        tab.load()
+
+    def add_tab(self, tab, title):
+        """Add a tab to the workspace and show it."""
+        tab.status_message.connect(self.statusBar().showMessage)
+        tab.model.memory_changed.connect(self.enforce_memory_budget)
+        self.tabs.addTab(tab, title)
+        self.tabs.setCurrentWidget(tab)
+        return tab
+
+    def close_tab(self, index):
+        """Close a tab, cancelling its loads and dropping its rows."""
+        tab = self.tabs.widget(index)
+        tab.release()
+        self.tabs.removeTab(index)
+        if tab in self.tab_history:
+            self.tab_history.remove(tab)
+        tab.deleteLater()
+
+    def tab_changed(self, index):
+        """Load the shown tab again if it was released, and keep the dropdown and buttons in step with it."""
+        tab = self.tabs.widget(index)
+        is_table = tab is not None and tab.table_name is not None
+        for button in (self.add_button, self.edit_button, self.delete_button, self.graph_button,
+                       self.import_button, self.export_button):
+            button.setEnabled(is_table)
+        if tab is None:
+            return
+        if tab in self.tab_history:
+            self.tab_history.remove(tab)
+        self.tab_history.append(tab)
+        if is_table:
+            self.table_selector.blockSignals(True)
+            self.table_selector.setCurrentText(tab.table_name)
+            self.table_selector.blockSignals(False)
+        tab.restore()
+
+    def enforce_memory_budget(self):
+        """
+        Release the rows of the least recently shown tabs while all tabs together
+        hold more than the memory budget. The tab shown is never released; a
+        released tab loads its rows again, with the same filters and sort, when shown.
+        """
+        used = sum(tab.model.memory_bytes() for tab in self.open_tabs())
+        for tab in list(self.tab_history):
+            if used <= self.memory_budget:
+                break
+            if tab is self.current_tab or tab.released:
+                continue
+            used -= tab.model.memory_bytes()
+            tab.release()
+            self.statusBar().showMessage(f"Released the rows of {self.tabs.tabText(self.tabs.indexOf(tab))} "
+                                         f"to stay within the memory budget")
 
     def open_add_entry_dialog(self):
         """Open the add entry popup dialog."""
-        selected_table = self.table_selector.currentText()
-        if not selected_table:
-            QMessageBox.warning(self, "Warning", "No table selected.")
+        tab = self.selected_table_tab()
+        if tab is None:
             return
+        selected_table = tab.table_name
 
+        self.executor.submit(
+            self.db.get_table_attributes, selected_table,
+            on_result=lambda columns: self.show_add_entry_dialog(selected_table, columns),
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not open add entry dialog: {message}")
+        )
+
+    def show_add_entry_dialog(self, selected_table, columns):
         try:
-            columns = self.db.get_table_attributes(selected_table)
-            dialog = AddEntryDialog(self.db, selected_table, columns)
+            dialog = AddEntryDialog(self.db, self.executor, selected_table, columns)
             if dialog.exec_():
-                self.load_table_data(selected_table)  # Reload table data after adding entry
+                self.entries_added(selected_table, dialog.inserted_row)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not open add entry dialog: {e}")
 
+    def entries_added(self, table_name, row):
+        """Show a new row in place when its table is open, keeping filters, sort and scroll position."""
+        tab = self.table_tab(table_name)
+        if tab is not None and not tab.released:
+            tab.model.insert_row(row)
+
     def open_edit_entry_dialog(self):
-        """Open the edit entry popup dialog."""
-        selected_table = self.table_selector.currentText()
-        if not selected_table:
-            QMessageBox.warning(self, "Warning", "No table selected.")
+        """Open the edit entry popup dialog, or the bulk edit dialog for several entries."""
+        tab = self.selected_table_tab()
+        if tab is None:
             return
+        selected_table = tab.table_name
 
-        selected_row = self.table_widget.currentRow()
-        if selected_row == -1:
+        selected_rows = tab.selected_rows()
+        if not selected_rows:
             QMessageBox.warning(self, "Warning", "No entry selected.")
             return
 
-        # Get the ID and current values of the selected row
-        entry_id = self.table_widget.item(selected_row, 0).text()
-        current_values = [self.table_widget.item(selected_row, col).text() for col in
-                          range(self.table_widget.columnCount())]
+        # Edited rows are patched into the model they were read from, even if another tab is shown by then
+        model = tab.model
+        columns = list(model.columns)
+        locators = [model.row_locator(row) for row in selected_rows]
+        model.read_rows(
+            selected_rows,
+            on_result=lambda rows: self.edit_rows(selected_table, columns, rows, model, locators),
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not open edit dialog: {message}")
+        )
+
+    def edit_rows(self, selected_table, columns, rows, model, locators):
+        """Open the edit dialog for rows read from the view, or the bulk edit dialog for several."""
+        if len(rows) > 1:
+            self.executor.submit(
+                self.table_metadata, selected_table,
+                on_result=lambda metadata: self.show_bulk_edit_dialog(selected_table, metadata, columns, rows,
+                                                                      model, locators),
+                on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not open edit dialog: {message}")
+            )
+            return
 
+        # Read the entry again with its version, so the dialog shows current values and can detect conflicts
+        self.executor.submit(
+            self.read_row_version, selected_table, columns, rows[0],
+            on_result=lambda version: self.show_edit_entry_dialog(selected_table, version, model, locators[0]),
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not open edit entry dialog: {message}")
+        )
+
+    def table_metadata(self, table_name):
+        """Metadata of a table, for identifying its rows (runs on a worker thread)."""
+        metadata = self.db.get_table_metadata(table_name)
+        if metadata is None:
+            raise ValueError(f"Table {table_name} does not exist.")
+        return metadata
+
+    def read_row_version(self, table_name, columns, values):
+        """Read a shown row again by its key, with its ROWID and ORA_ROWSCN (runs on a worker thread)."""
+        return self.db.get_row_version(table_name, self.table_metadata(table_name).row_key(columns, values))
+
+    def remove_rows(self, table_name, columns, rows):
+        """Remove shown rows by their keys (runs on a worker thread)."""
+        metadata = self.table_metadata(table_name)
+        return self.db.remove_entries(table_name, [metadata.row_key(columns, values) for values in rows])
+
+    def show_bulk_edit_dialog(self, selected_table, metadata, columns, rows, model, locators):
+        try:
+            entry_ids = [metadata.row_key(columns, values) for values in rows]
+            dialog = BulkEditDialog(self.db, self.executor, selected_table, columns, entry_ids, metadata.primary_key)
+            if not dialog.exec_():
+                return
+            if not metadata.primary_key:
+                # Rows are identified by all their values, which the edit just changed
+                self.reload_table(selected_table)
+                return
+            # Read back only the edited rows and patch them into the view
+            self.executor.submit(
+                self.db.get_rows, selected_table, entry_ids,
+                on_result=lambda edited: self.entries_edited(selected_table, metadata, entry_ids, model, locators,
+                                                             edited),
+                on_error=lambda message: self.reload_table(selected_table)
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not open edit dialog: {e}")
+
+    def entries_edited(self, table_name, metadata, entry_ids, model, locators, edited):
+        """Replace edited rows with their stored values; rows that were not found any more are removed."""
+        positions = {tuple(metadata.row_key(edited.columns, values).values()): position
+                     for position, values in enumerate(edited.rows())}
+        found = [(locator, positions[tuple(key.values())]) for locator, key in zip(locators, entry_ids)
+                 if tuple(key.values()) in positions]
+        missing = [locator for locator, key in zip(locators, entry_ids) if tuple(key.values()) not in positions]
+        patched = model.replace_rows([locator for locator, _ in found],
+                                     edited.take([position for _, position in found]))
+        if not (patched and model.remove_rows(missing)):
+            self.reload_table(table_name)  # The rows are no longer loaded; reload the table instead
+
+    def show_edit_entry_dialog(self, selected_table, version, model, locator):
         try:
-            # Fetch table attributes
-            columns = self.db.get_table_attributes(selected_table)
             # Open the EditEntryDialog
-            dialog = EditEntryDialog(self.db, selected_table, columns, entry_id, current_values)
-            if dialog.exec_():
-                self.load_table_data(selected_table)  # Reload table data after editing entry
+            dialog = EditEntryDialog(self.db, self.executor, selected_table, version)
+            if dialog.exec_() and not model.replace_rows([locator], dialog.updated_row):
+                self.reload_table(selected_table)  # The row is no longer loaded; reload the table instead
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not open edit entry dialog: {e}")
 
     def delete_selected_entry(self):
-        """Delete the selected entry from the table."""
-        selected_table = self.table_selector.currentText()
-        if not selected_table:
-            QMessageBox.warning(self, "Warning", "No table selected.")
+        """Delete the selected entries from the table in one batch."""
+        tab = self.selected_table_tab()
+        if tab is None:
             return
+        selected_table = tab.table_name
 
-        selected_row = self.table_widget.currentRow()
-        if selected_row == -1:
+        selected_rows = tab.selected_rows()
+        if not selected_rows:
             QMessageBox.warning(self, "Warning", "No entry selected.")
             return
 
-        # Get the ID of the selected row (assuming 'ID' is the first column)
-        entry_id = self.table_widget.item(selected_row, 0).text()
-        try:
-            self.db.remove_entry(selected_table, entry_id)
+        if len(selected_rows) > 1:
+            answer = QMessageBox.question(self, "Confirm", f"Delete {len(selected_rows)} entries?")
+            if answer != QMessageBox.Yes:
+                return
+
+        # The rows are removed by their primary keys (or all their values when the table has none)
+        model = tab.model
+        columns = list(model.columns)
+        locators = [model.row_locator(row) for row in selected_rows]
+        model.read_rows(
+            selected_rows,
+            on_result=lambda rows: self.executor.submit(
+                self.remove_rows, selected_table, columns, rows,
+                on_result=lambda errors: self.entry_deleted(selected_table, model, locators, errors),
+                on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not delete entry: {message}")
+            ),
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not delete entry: {message}")
+        )
+
+    def entry_deleted(self, selected_table, model, locators, errors):
+        if errors:
+            QMessageBox.warning(self, "Warning", f"Some entries were not deleted:\n{batch_error_text(errors)}")
+        elif len(locators) == 1:
             QMessageBox.information(self, "Success", "Entry deleted successfully!")
-            self.load_table_data(selected_table)  # Reload table data after deleting entry
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not delete entry: {e}")
-
-    def load_table_data(self, table_name, filters=None, sort_column=None, sort_order="ASC"):
-        """Loads the data from the selected table into the table widget."""
-        try:
-            rows, columns = self.db.get_table_data(table_name, filters, sort_column, sort_order)
+        else:
+            QMessageBox.information(self, "Success", f"{len(locators)} entries deleted successfully!")
 
-            # Populate the table widget
-            self.table_widget.setColumnCount(len(columns))
-            self.table_widget.setHorizontalHeaderLabels(columns)
-            self.table_widget.setRowCount(len(rows))
+        # Remove the deleted rows from the view; a failure of the whole batch has no row index
+        failed = {index for index, _ in errors}
+        if None in failed:
+            return
+        deleted = [locator for index, locator in enumerate(locators) if index not in failed]
+        if not model.remove_rows(deleted):
+            self.reload_table(selected_table)  # The rows are no longer loaded; reload the table instead
+
+    def import_data(self):
+        """Stream a CSV or Parquet file into the selected table in the background."""
+        tab = self.selected_table_tab()
+        if tab is None:
+            return
+        selected_table = tab.table_name
 
-            for row_idx, row_data in enumerate(rows):
-                for col_idx, cell_data in enumerate(row_data):
-                    self.table_widget.setItem(row_idx, col_idx, QTableWidgetItem(str(cell_data)))
+        path, _ = QFileDialog.getOpenFileName(self, f"Import into {selected_table}", "",
+                                              "Data files (*.csv *.parquet);;All files (*)")
+        if not path:
+            return
 
-            # Adjust column widths
-            self.table_widget.horizontalHeader().setStretchLastSection(True)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Could not fetch data from table {table_name}: {e}")
+        cancel_event = threading.Event()
+        progress = QProgressDialog(f"Importing into {selected_table}...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Import Data")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.canceled.connect(cancel_event.set)
+        progress.show()
+
+        self.executor.submit(
+            DataTransfer.import_file, self.db, selected_table, path, cancel_event=cancel_event,
+            on_progress=lambda status: progress.setLabelText(
+                f"Imported {status['rows']:,} rows ({status['rows_per_second']:,.0f} rows/s), "
+                f"{status['errors']:,} errors"
+            ),
+            on_result=lambda result: self.data_imported(selected_table, progress, result),
+            on_error=lambda message: self.import_failed(progress, message)
+        )
+
+    def data_imported(self, selected_table, progress, result):
+        progress.reset()
+        summary = (f"Imported {result['imported']:,} of {result['rows']:,} rows "
+                   f"in {result['seconds']:.1f} s.")
+        if result["errors"]:
+            QMessageBox.warning(self, "Import Finished", f"{summary}\n{batch_error_text(result['errors'])}")
+        else:
+            QMessageBox.information(self, "Import Finished", summary)
+        self.reload_table(selected_table)
+
+    def import_failed(self, progress, message):
+        progress.reset()
+        QMessageBox.critical(self, "Error", f"Could not import data: {message}")
+
+    def export_data(self):
+        """Stream the current view (filters and sort included) to a file in the background."""
+        tab = self.selected_table_tab()
+        if tab is None:
+            return
+        model = tab.model
 
-    def apply_filters(self):
-        """Applies filters dynamically as text is entered in the filter boxes."""
-        selected_table = self.table_selector.currentText()
-        if not selected_table:
+        path, _ = QFileDialog.getSaveFileName(
+            self, f"Export {model.table_name}", f"{model.table_name}.csv",
+            "CSV (*.csv);;JSON Lines (*.jsonl);;Parquet (*.parquet);;Arrow (*.arrow)"
+        )
+        if not path:
             return
 
-        # Collect filters from the input fields
-        filters = {}
-        for column, input_field in self.filters.items():
-            if input_field.text():
-                filters[column] = input_field.text()
+        cancel_event = threading.Event()
+        progress = QProgressDialog(f"Exporting {model.table_name}...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Export Data")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.canceled.connect(cancel_event.set)
+        progress.show()
+
+        self.executor.submit(
+            DataTransfer.export_table, self.db, model.table_name, path, model.filters,
+            model.sort_column, model.sort_order, cancel_event=cancel_event, sort_keys=model.placement_keys(),
+            on_progress=lambda status: progress.setLabelText(
+                f"Exported {status['rows']:,} rows ({status['rows_per_second']:,.0f} rows/s)"
+            ),
+            on_result=lambda result: self.data_exported(progress, path, result),
+            on_error=lambda message: self.export_failed(progress, message)
+        )
+
+    def data_exported(self, progress, path, result):
+        progress.reset()
+        if result["cancelled"]:
+            QMessageBox.information(self, "Export Cancelled", "The export was cancelled.")
+            return
+        QMessageBox.information(self, "Export Finished",
+                                f"Exported {result['rows']:,} rows to {path} in {result['seconds']:.1f} s.")
+
+    def export_failed(self, progress, message):
+        progress.reset()
+        QMessageBox.critical(self, "Error", f"Could not export data: {message}")
+
+    def show_transaction_state(self):
+        """Enables the transaction buttons that apply to the current mode."""
+        in_transaction = self.db.transaction_connection is not None
+        self.transaction_button.setEnabled(not in_transaction)
+        self.commit_button.setEnabled(in_transaction)
+        self.rollback_button.setEnabled(in_transaction)
+        self.transaction_button.setText("Transaction Active" if in_transaction else "Start Transaction")
+
+    def begin_transaction(self):
+        """Starts transaction mode; later changes are committed together."""
+        self.executor.submit(
+            self.db.begin,
+            on_result=lambda _: self.show_transaction_state(),
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not start transaction: {message}")
+        )
+
+    def commit_transaction(self):
+        """Commits every change made since the transaction started."""
+        self.executor.submit(
+            self.db.commit,
+            on_result=lambda _: self.show_transaction_state(),
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not commit transaction: {message}")
+        )
+
+    def rollback_transaction(self):
+        """Discards every change made since the transaction started and reloads the table."""
+        self.executor.submit(
+            self.db.rollback,
+            on_result=lambda _: self.transaction_rolled_back(),
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not roll back transaction: {message}")
+        )
+
+    def transaction_rolled_back(self):
+        self.show_transaction_state()
+        for tab in self.open_tabs():
+            self.reload_table(tab.table_name)
+
+    def refresh_current_tab(self):
+        """
+        Reload the shown tab from the database, bypassing the result cache, to see
+        changes other sessions committed. Its filters and sort are kept.
+        """
+        tab = self.current_tab
+        if tab is None:
+            return
+        if tab.table_name is not None:
+            self.db.invalidate_results(tab.table_name)
+        tab.reload()
+
+    def reload_table(self, table_name):
+        """
+        Reload the tab of a table after the table changed, keeping its filters
+        and sort. Released tabs are left alone; they load current rows when shown.
+        """
+        tab = self.table_tab(table_name) if table_name is not None else None
+        if tab is not None and not tab.released:
+            tab.reload()
 
-        # Reload the table data with the filters
-        self.load_table_data(selected_table, filters=filters)
+    def load_table_data(self, table_name, filters=None, sort_column=None, sort_order="ASC"):
+        """
+        Loads a table into its tab in the background, opening the tab if needed,
+        and shows it. Further rows are fetched lazily as the view scrolls.
+        """
+        try:
+            tab = self.table_tab(table_name)
+            if tab is None:
+                tab = self.add_tab(TableTab(self.db, self.executor, table_name), table_name)
+            else:
+                self.tabs.setCurrentWidget(tab)
+            tab.filter_timer.stop()
+            tab.load(filters, sort_column, sort_order)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Could not fetch data from table {table_name}: {e}")
 
     def open_graph_dialog(self):
         """Open the graph selection popup dialog."""
-        selected_table = self.table_selector.currentText()
-        if not selected_table:
-            QMessageBox.warning(self, "Warning", "No table selected.")
+        tab = self.selected_table_tab()
+        if tab is None:
             return
+        selected_table = tab.table_name
+        # Chart the same rows the tab shows
+        filters = tab.model.filters
+
+        self.executor.submit(
+            self.db.get_table_attributes, selected_table,
+            on_result=lambda columns: self.show_graph_dialog(selected_table, columns, filters),
+            on_error=lambda message: QMessageBox.critical(self, "Error", f"Could not open graph dialog: {message}")
+        )
 
+    def show_graph_dialog(self, selected_table, columns, filters=None):
         try:
-            columns = self.db.get_table_attributes(selected_table)
-            dialog = GraphDialog(self.db, selected_table, columns)
+            dialog = GraphDialog(self.db, self.executor, selected_table, columns, filters)
             dialog.exec_()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Could not open graph dialog: {e}")
@@ -0,0 +1,444 @@
+"""
+End-to-end benchmarks of the viewer: loading, scrolling, filtering, sorting,
+CRUD, graphs, export and tabs, measured through OracleDatabase and the real Qt
+widgets on the offscreen platform. Each scenario reports its median latency,
+its peak Python memory (tracemalloc) and, with the SQLite backend, the
+number of simulated round trips. Results are compared with a stored
+baseline, and regressions make the script exit with status 1.
+
+    python benchmarks/benchmark_suite.py                      # run and compare with baseline.json
+    python benchmarks/benchmark_suite.py --save-baseline      # record a new baseline
+    python benchmarks/benchmark_suite.py --scenarios load_page filter_server --repeat 10
+
+The default backend is fake_oracledb (SQLite). --backend oracle runs the same
+scenarios against a real database; use a scratch schema, since the project
+tables are dropped and recreated there.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+import project_schema  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCHMARKS_DIR, "baseline.json")
+
+
+class SQLiteBackend:
+    """fake_oracledb: SQLite tables behind the python-oracledb API, with simulated round trip latency."""
+    name = "sqlite"
+
+    def __init__(self, args):
+        import fake_oracledb
+        self.driver = fake_oracledb
+        fake_oracledb.round_trip_latency = args.latency / 1000
+        self.connect_args = ("bench", "bench", "localhost/fake")
+
+    def install(self):
+        """Make OracleDatabase import the fake driver."""
+        sys.modules["oracledb"] = self.driver
+
+    def create_table(self, table_name, columns, primary_key, indexes, rows):
+        self.driver.create_table(table_name, columns, rows, indexes, primary_key=primary_key)
+
+    def round_trips(self):
+        return self.driver.stats["round_trips"]
+
+
+class OracleBackend:
+    """A real Oracle schema, reached with python-oracledb. Round trips are not counted."""
+    name = "oracle"
+
+    def __init__(self, args):
+        import oracledb
+        if not args.dsn:
+            raise SystemExit("--backend oracle needs --user, --password and --dsn")
+        self.driver = oracledb
+        self.connect_args = (args.user, args.password, args.dsn)
+
+    def install(self):
+        pass
+
+    def create_table(self, table_name, columns, primary_key, indexes, rows, batch_size=10000):
+        user, password, dsn = self.connect_args
+        definitions = ", ".join(f"{name} {definition}" for name, definition in columns)
+        if primary_key:
+            definitions += f", PRIMARY KEY ({', '.join(primary_key)})"
+        placeholders = ", ".join(f":{position}" for position in range(1, len(columns) + 1))
+        with self.driver.connect(user=user, password=password, dsn=dsn) as connection, \
+                connection.cursor() as cursor:
+            try:
+                cursor.execute(f"DROP TABLE {table_name} CASCADE CONSTRAINTS PURGE")
+            except self.driver.DatabaseError:
+                pass  # The table did not exist yet
+            cursor.execute(f"CREATE TABLE {table_name} ({definitions})")
+            for index_columns in indexes:
+                cursor.execute(f"CREATE INDEX {table_name}_{'_'.join(index_columns)}_IDX "
+                               f"ON {table_name} ({', '.join(index_columns)})")
+            for start in range(0, len(rows), batch_size):
+                cursor.executemany(f"INSERT INTO {table_name} VALUES ({placeholders})",
+                                   rows[start:start + batch_size])
+            connection.commit()
+
+    def round_trips(self):
+        return None
+
+
+BACKENDS = {"sqlite": SQLiteBackend, "oracle": OracleBackend}
+
+SCENARIOS = {
+    "load_page": "open STUDENT and show its first page",
+    "scroll_all": "scroll through every page of STUDENT",
+    "filter_server": "prefix filter on STUDENT.NUME, run in the database",
+    "filter_local": "contains filter on the fully loaded PROFESOR table",
+    "sort_server": "sort STUDENT by NUME descending, run in the database",
+    "sort_local": "sort the fully loaded PROFESOR table by SALARIU",
+    "crud_single": "add, edit and delete one STUDENT row in a filtered view, patching the view after each",
+    "crud_bulk": "add, edit and delete 1,000 STUDENT rows in batches",
+    "graph_bar": "bar chart of AVG(MEDIE_ADMITERE) by NATIONALITATE",
+    "graph_line": "line chart of every MEDIE_ADMITERE by ID, decimated to the canvas",
+    "export_csv": "export the filtered STUDENT view to CSV",
+    "open_tabs": "open every table in its own tab at once and wait for all first pages",
+}
+
+
+class BenchmarkSuite:
+    """Seeds the backend, opens the viewer offscreen and runs the scenarios."""
+    def __init__(self, backend, students):
+        self.backend = backend
+        self.students = students
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.errors = []
+        self.watched_models = set()  # Models whose load errors fail the benchmark
+
+    def seed(self):
+        for table_name, (columns, primary_key, indexes) in project_schema.TABLES.items():
+            rows = project_schema.generate_rows(table_name, self.students)
+            self.backend.create_table(table_name, columns, primary_key, indexes, rows)
+
+    def start(self):
+        """Create the application, the database and the viewer window."""
+        self.backend.install()
+        # Imported only now, so OracleDatabase picks up the backend's driver
+        import DataTransfer
+        import UserInterface
+        from PyQt5.QtWidgets import QApplication, QMessageBox
+
+        # Message boxes would block the benchmark waiting for a click
+        for name in ("information", "warning", "critical"):
+            setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.Ok))
+        QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+
+        self.ui = UserInterface
+        self.data_transfer = DataTransfer
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+        self.db = UserInterface.OracleDatabase(*self.backend.connect_args, use_pool=True)
+        self.db.connect()
+        self.viewer = UserInterface.DatabaseViewer(self.db)
+        self.viewer.show()
+        self.wait(lambda: not self.viewer.executor.tasks)
+        # The viewer imports these on first use; startup_benchmark.py measures that,
+        # so they are loaded here rather than counted in one scenario's peak memory
+        import LocalQueryEngine  # noqa: F401
+        import PlotCanvas  # noqa: F401
+
+    def stop(self):
+        self.viewer.executor.wait_for_done()
+        self.viewer.close()
+        self.db.close()
+        self.temp_dir.cleanup()
+
+    def wait(self, predicate, timeout=120):
+        """Process Qt events until predicate() holds."""
+        deadline = time.perf_counter() + timeout
+        while not predicate():
+            if self.errors:
+                raise RuntimeError(self.errors.pop())
+            if time.perf_counter() > deadline:
+                raise TimeoutError("Benchmark step timed out")
+            self.app.processEvents()
+            time.sleep(0.0005)
+
+    def call(self, function, *args, **kwargs):
+        """Run a function on the viewer's executor, as the UI does, and wait for its result."""
+        outcome = {}
+        self.viewer.executor.submit(function, *args, on_result=lambda result: outcome.setdefault("result", result),
+                                    on_error=lambda message: outcome.setdefault("error", message), **kwargs)
+        self.wait(lambda: outcome)
+        if "error" in outcome:
+            raise RuntimeError(outcome["error"])
+        return outcome["result"]
+
+    @property
+    def model(self):
+        """Model of the tab the viewer shows."""
+        return self.viewer.table_model
+
+    def open_tab(self, table_name, filters=None, sort_column=None, sort_order="ASC"):
+        """Load a table into its tab without waiting, failing the benchmark on load errors."""
+        self.viewer.load_table_data(table_name, filters, sort_column, sort_order)
+        if self.model not in self.watched_models:
+            self.watched_models.add(self.model)
+            self.model.load_failed.connect(self.errors.append)
+        return self.model
+
+    def load(self, table_name, filters=None, sort_column=None, sort_order="ASC"):
+        model = self.open_tab(table_name, filters, sort_column, sort_order)
+        self.wait(lambda: model.load_task is None and model.table_name == table_name)
+
+    def load_all(self, table_name, filters=None):
+        """Load a table and every one of its pages, so it is filtered and sorted locally."""
+        self.load(table_name, filters)
+        while self.model.canFetchMore():
+            self.model.fetchMore()
+            self.wait(lambda: not self.model.fetching_more)
+
+    def column_index(self, column_name):
+        return self.model.columns.index(column_name)
+
+    # Scenarios: prepare_<name> runs untimed before every repetition of run_<name>
+
+    def run_load_page(self):
+        self.load("STUDENT")
+
+    def run_scroll_all(self):
+        self.load_all("STUDENT")
+
+    def prepare_filter_server(self):
+        self.load("STUDENT")
+
+    def run_filter_server(self):
+        self.model.apply_filters("STUDENT", {"NUME": self.ui.Filter("Pop", "prefix")})
+        self.wait(lambda: self.model.load_task is None)
+
+    def prepare_filter_local(self):
+        self.load_all("PROFESOR")
+
+    def run_filter_local(self):
+        if not self.model.apply_filters("PROFESOR", {"MAIL": self.ui.Filter("ana", "contains")}):
+            raise RuntimeError("PROFESOR was not filtered locally")
+
+    def prepare_sort_server(self):
+        self.load("STUDENT")
+
+    def run_sort_server(self):
+        self.model.sort(self.column_index("NUME"), self.ui.Qt.DescendingOrder)
+        self.wait(lambda: self.model.load_task is None)
+
+    def prepare_sort_local(self):
+        self.load_all("PROFESOR")
+
+    def run_sort_local(self):
+        self.model.sort(self.column_index("SALARIU"), self.ui.Qt.AscendingOrder)
+
+    def student(self, student_id):
+        return {"ID": student_id, "NUME": "Popovici", "PRENUME": "Mark", "NATIONALITATE": "Roman",
+                "MEDIE_ADMITERE": 9.5, "CNP": f"9{student_id:012d}", "MAIL": f"bench{student_id}@unibuc.ro",
+                "TELEFON": f"09{student_id:08d}"}
+
+    def prepare_crud_single(self):
+        self.load_all("STUDENT", {"NUME": self.ui.Filter("Pop", "prefix")})
+
+    def run_crud_single(self):
+        # The same calls DatabaseViewer makes: the changed row comes back from the database and is patched in
+        student_id = self.students + 1
+        view_row = self.model.insert_row(self.call(self.db.insert_row, "STUDENT", self.student(student_id)))
+        if view_row is None:
+            raise RuntimeError("The new STUDENT row is not shown")
+        locator = self.model.row_locator(view_row)
+        version = self.call(self.db.get_row_version, "STUDENT", student_id)
+        row = self.call(self.db.update_row, "STUDENT", version, {"MEDIE_ADMITERE": "9.75"})
+        if not self.model.replace_rows([locator], row):
+            raise RuntimeError("The edited STUDENT row was not patched")
+        errors = self.call(self.db.remove_entries, "STUDENT", [student_id])
+        if errors or not self.model.remove_rows([locator]):
+            raise RuntimeError("The STUDENT row was not deleted")
+
+    def run_crud_bulk(self):
+        student_ids = range(self.students + 1, self.students + 1001)
+        for errors in (
+            self.call(self.db.add_entries, "STUDENT", [self.student(student_id) for student_id in student_ids]),
+            self.call(self.db.edit_entries, "STUDENT",
+                      [(student_id, {"MEDIE_ADMITERE": 9.75}) for student_id in student_ids]),
+            self.call(self.db.remove_entries, "STUDENT", list(student_ids)),
+        ):
+            if errors:
+                raise RuntimeError(errors[0][1])
+
+    def graph(self, graph_type, x_column, y_column, aggregate, line_mode="LTTB"):
+        dialog = self.ui.GraphDialog(self.db, self.viewer.executor, "STUDENT", self.model.columns)
+        dialog.show()
+        dialog.graph_type.setCurrentText(graph_type)
+        dialog.x_axis_column.setCurrentText(x_column)
+        dialog.y_axis_column.setCurrentText(y_column)
+        dialog.aggregate.setCurrentText(aggregate)
+        dialog.line_mode.setCurrentText(line_mode)
+        dialog.create_graph()
+        self.wait(dialog.create_button.isEnabled)
+        dialog.close()
+
+    def prepare_graph_bar(self):
+        self.load("STUDENT")
+
+    def run_graph_bar(self):
+        self.graph("Bar Chart", "NATIONALITATE", "MEDIE_ADMITERE", "AVG")
+
+    def prepare_graph_line(self):
+        self.load("STUDENT")
+
+    def run_graph_line(self):
+        self.graph("Line Chart", "ID", "MEDIE_ADMITERE", "SUM")
+
+    def prepare_open_tabs(self):
+        while self.viewer.tabs.count():
+            self.viewer.close_tab(0)
+        self.wait(lambda: not self.viewer.executor.tasks)
+
+    def run_open_tabs(self):
+        # Every tab submits its first page at once; the executor loads them concurrently
+        models = [self.open_tab(table_name) for table_name in project_schema.TABLES]
+        self.wait(lambda: all(model.load_task is None and model.columns for model in models))
+
+    def run_export_csv(self):
+        path = os.path.join(self.temp_dir.name, "students.csv")
+        self.call(self.data_transfer.export_table, self.db, "STUDENT", path,
+                  {"NATIONALITATE": self.ui.Filter("Roman", "exact")}, "NUME")
+
+    def measure(self, name, repeat):
+        """
+        Run a scenario once under tracemalloc for its peak memory, which also
+        warms caches and code paths, then repeat times for its latency.
+        :return: Dictionary of median and minimum milliseconds, peak KB and round trips.
+        """
+        prepare = getattr(self, f"prepare_{name}", None)
+        run = getattr(self, f"run_{name}")
+        if prepare is not None:
+            prepare()
+        self.wait(lambda: not self.viewer.executor.tasks)
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings = []
+        round_trips = None
+        for _ in range(repeat):
+            if prepare is not None:
+                prepare()
+            self.wait(lambda: not self.viewer.executor.tasks)
+            trips_before = self.backend.round_trips()
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+            if trips_before is not None:
+                round_trips = self.backend.round_trips() - trips_before
+        return {
+            "median_ms": round(statistics.median(timings) * 1000, 3),
+            "min_ms": round(min(timings) * 1000, 3),
+            "peak_kb": round(peak / 1024, 1),
+            "round_trips": round_trips,
+        }
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """
+    Compare results with a baseline.
+    A scenario regresses when its median time or peak memory grows beyond the
+    tolerance (and by more than an absolute noise floor), or when it
+    needs more round trips.
+    :return: List of (scenario, description of the regression) tuples.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["median_ms"] > reference["median_ms"] * (1 + time_tolerance) and \
+                result["median_ms"] - reference["median_ms"] > 10:
+            regressions.append((name, f"median {reference['median_ms']:.1f} -> {result['median_ms']:.1f} ms"))
+        if result["peak_kb"] > reference["peak_kb"] * (1 + memory_tolerance) and \
+                result["peak_kb"] - reference["peak_kb"] > 256:
+            regressions.append((name, f"peak memory {reference['peak_kb']:,.0f} -> {result['peak_kb']:,.0f} KB"))
+        if result["round_trips"] is not None and reference.get("round_trips") is not None and \
+                result["round_trips"] > reference["round_trips"]:
+            regressions.append((name, f"round trips {reference['round_trips']} -> {result['round_trips']}"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="sqlite")
+    parser.add_argument("--students", type=int, default=50000, help="rows of STUDENT; other tables scale with it")
+    parser.add_argument("--latency", type=float, default=0.5,
+                        help="simulated round trip latency in milliseconds (sqlite backend)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions per scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline file to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed relative slowdown")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="allowed relative memory growth")
+    parser.add_argument("--user", help="database user (oracle backend)")
+    parser.add_argument("--password", help="database password (oracle backend)")
+    parser.add_argument("--dsn", help="connect string (oracle backend)")
+    args = parser.parse_args()
+
+    backend = BACKENDS[args.backend](args)
+    suite = BenchmarkSuite(backend, args.students)
+    seed_start = time.perf_counter()
+    suite.seed()
+    print(f"Seeded {args.students:,} students on {backend.name} in {time.perf_counter() - seed_start:.1f} s")
+    suite.start()
+
+    results = {}
+    print(f"{'scenario':<14} {'median ms':>10} {'min ms':>10} {'peak KB':>10} {'round trips':>12}  description")
+    try:
+        for name in args.scenarios:
+            result = suite.measure(name, args.repeat)
+            results[name] = result
+            trips = "" if result["round_trips"] is None else result["round_trips"]
+            print(f"{name:<14} {result['median_ms']:>10.1f} {result['min_ms']:>10.1f} {result['peak_kb']:>10,.0f} "
+                  f"{trips:>12}  {SCENARIOS[name]}")
+    finally:
+        suite.stop()
+
+    settings = {"backend": backend.name, "students": args.students,
+                "latency_ms": args.latency if backend.name == "sqlite" else None}
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(dict(settings, python=platform.python_version(), results=results), file, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare with; run with --save-baseline to record one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if any(baseline.get(key) != value for key, value in settings.items()):
+        print(f"Baseline {args.baseline} was recorded with different settings "
+              f"({', '.join(f'{key}={baseline.get(key)}' for key in settings)}); not compared.")
+        return 0
+
+    regressions = compare(results, baseline["results"], args.time_tolerance, args.memory_tolerance)
+    if not regressions:
+        print(f"No regressions against {args.baseline}.")
+        return 0
+    print(f"{len(regressions)} regression(s) against {args.baseline}:")
+    for name, description in regressions:
+        print(f"  {name}: {description}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
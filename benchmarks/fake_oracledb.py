@@ -0,0 +1,445 @@
+"""
+Local stand-in for the subset of the python-oracledb API used by OracleDatabase.
+
+Tables live in a shared in-memory SQLite database, Oracle-only SQL is rewritten
+to its SQLite equivalent and the user_* data dictionary views are maintained as
+plain tables. Every simulated server round trip is counted in ``stats`` and
+delayed by ``round_trip_latency`` seconds, so fetch tuning can be measured
+without an Oracle instance.
+
+Install it before importing OracleDatabase:
+    sys.modules["oracledb"] = fake_oracledb
+"""
+import datetime
+import decimal
+import re
+import sqlite3
+import threading
+import time
+
+POOL_GETMODE_WAIT = 0
+DB_TYPE_NUMBER = "NUMBER"
+DB_TYPE_DATE = "DATE"
+DB_TYPE_TIMESTAMP = "TIMESTAMP"
+
+round_trip_latency = 0.0005  # Seconds added to every simulated round trip
+connect_latency = 0.0  # Seconds added to connect() and create_pool(), like logging on to a server
+stats = {"round_trips": 0, "rows_fetched": 0}
+
+_DATABASE_URI = "file:fake_oracledb?mode=memory&cache=shared"
+_lock = threading.RLock()  # Connections serialize on the SQLite engine like sessions on a server process
+_keeper = sqlite3.connect(_DATABASE_URI, uri=True, check_same_thread=False)
+text_indexes = {}  # Table name -> columns with a simulated Oracle Text index
+
+# Bind the Python types python-oracledb accepts for NUMBER and DATE columns
+sqlite3.register_adapter(decimal.Decimal, float)
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+# and return DATE columns as datetime, as python-oracledb does
+sqlite3.register_converter("DATE", lambda value: datetime.datetime.fromisoformat(value.decode()))
+
+# Oracle syntax rewritten to SQLite syntax before execution
+SQL_REWRITES = [
+    (re.compile(r"OFFSET\s+:(\w+)\s+ROWS\s+FETCH\s+NEXT\s+:(\w+)\s+ROWS\s+ONLY", re.I), r"LIMIT :\2 OFFSET :\1"),
+    (re.compile(r"FETCH\s+FIRST\s+:(\w+)\s+ROWS\s+ONLY", re.I), r"LIMIT :\1"),
+    # SQLite keeps no change numbers; every row reports the same SCN
+    (re.compile(r"\bORA_ROWSCN\b", re.I), "0"),
+    # Plans written by EXPLAIN PLAN are read back from plan_table
+    (re.compile(r"TABLE\s*\(\s*DBMS_XPLAN\.DISPLAY\s*\(\s*'PLAN_TABLE'\s*,\s*:(\w+)[^)]*\)\s*\)", re.I),
+     r"plan_table WHERE statement_id = :\1"),
+]
+RETURNING_INTO = re.compile(r"\s+RETURNING\s+(.+?)\s+INTO\s+((?::\w+\s*,\s*)*:\w+)\s*$", re.I | re.S)
+EXPLAIN_PLAN = re.compile(r"\s*EXPLAIN\s+PLAN\s+SET\s+STATEMENT_ID\s*=\s*'([^']*)'\s+FOR\s+(.*)", re.I | re.S)
+
+
+class Error(Exception):
+    pass
+
+
+class DatabaseError(Error):
+    pass
+
+
+def round_trip():
+    """Account for one client/server round trip."""
+    stats["round_trips"] += 1
+    if round_trip_latency:
+        time.sleep(round_trip_latency)
+
+
+def reset_stats():
+    stats["round_trips"] = 0
+    stats["rows_fetched"] = 0
+
+
+def translate(sql, parameters):
+    """Rewrite Oracle SQL and binds into their SQLite equivalents."""
+    for pattern, replacement in SQL_REWRITES:
+        sql = pattern.sub(replacement, sql)
+    if isinstance(parameters, (list, tuple)):
+        names = list(dict.fromkeys(re.findall(r"(?<!:):(\w+)", sql)))
+        parameters = dict(zip(names, parameters))
+    return sql, parameters or {}
+
+
+class BatchError:
+    """Per-row error reported by executemany(..., batcherrors=True)."""
+    def __init__(self, offset, message):
+        self.offset = offset
+        self.message = message
+
+
+class Var:
+    """Output variable made by Cursor.var; RETURNING ... INTO fills it with one value per changed row."""
+    def __init__(self, var_type):
+        self.type = var_type
+        self.values = []
+
+    def convert(self, value):
+        if isinstance(value, str) and self.type in (DB_TYPE_DATE, DB_TYPE_TIMESTAMP, datetime.datetime):
+            return datetime.datetime.fromisoformat(value)
+        return value
+
+    def getvalue(self, pos=0):
+        return self.values
+
+
+class Cursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.arraysize = 100
+        self.prefetchrows = 2
+        self.rowcount = 0
+        self.description = None
+        self._cursor = None
+        self._buffer = []
+        self._exhausted = True
+        self._batch_errors = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        self._buffer = []
+        if self._cursor is not None:
+            with _lock:
+                self._cursor.close()
+            self._cursor = None
+
+    def execute(self, statement, parameters=None):
+        explain = EXPLAIN_PLAN.match(statement)
+        if explain:
+            self._explain(explain.group(1), explain.group(2), parameters)
+            return None
+        variables = []
+        returning = RETURNING_INTO.search(statement)
+        if returning:
+            # SQLite returns the rows of RETURNING like a query; hand them to the output variables instead
+            parameters = dict(parameters)
+            variables = [parameters.pop(name.strip()[1:]) for name in returning.group(2).split(",")]
+            statement = f"{statement[:returning.start()]} RETURNING {returning.group(1)}"
+        sql, parameters = translate(statement, parameters)
+        round_trip()
+        with _lock:
+            try:
+                self._cursor = self.connection._sqlite.execute(sql, parameters)
+                returned = self._cursor.fetchall() if returning else None
+            except sqlite3.Error as e:
+                raise DatabaseError(str(e)) from e
+            self.rowcount = self._cursor.rowcount
+            self.description = self._cursor.description
+            self._buffer = []
+            self._exhausted = self.description is None
+            if returning:
+                for position, variable in enumerate(variables):
+                    variable.values = [variable.convert(row[position]) for row in returned]
+                self.rowcount = len(returned)
+                self.description = None
+                self._exhausted = True
+            if not self._exhausted and self.prefetchrows:
+                self._fill(self.prefetchrows)
+        if re.match(r"\s*(CREATE|DROP|ALTER)\b", sql, re.I):
+            refresh_dictionary()
+
+    def _explain(self, statement_id, statement, parameters):
+        """EXPLAIN PLAN stand-in: store SQLite's query plan in plan_table, one line per step."""
+        sql, parameters = translate(statement, parameters)
+        round_trip()
+        with _lock:
+            try:
+                steps = self.connection._sqlite.execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+            except sqlite3.Error as e:
+                raise DatabaseError(str(e)) from e
+            depths = {0: -1}
+            lines = [f"Plan for {' '.join(statement.split())}"]
+            for step_id, parent, _, detail in steps:
+                depths[step_id] = depths.get(parent, -1) + 1
+                lines.append("  " * depths[step_id] + detail)
+            self.connection._sqlite.executemany("INSERT INTO plan_table VALUES (?, ?)",
+                                                [(statement_id, line) for line in lines])
+        self.description = None
+        self.rowcount = len(lines)
+        self._exhausted = True
+
+    def executemany(self, statement, parameters, batcherrors=False):
+        """Run a statement for every set of binds in one simulated round trip."""
+        round_trip()
+        self._batch_errors = []
+        self.rowcount = 0
+        with _lock:
+            for offset, row in enumerate(parameters):
+                sql, binds = translate(statement, row)
+                try:
+                    self.rowcount += self.connection._sqlite.execute(sql, binds).rowcount
+                except sqlite3.Error as e:
+                    if not batcherrors:
+                        raise DatabaseError(str(e)) from e
+                    self._batch_errors.append(BatchError(offset, str(e)))
+
+    def var(self, var_type, *args, **kwargs):
+        return Var(var_type)
+
+    def getbatcherrors(self):
+        return self._batch_errors
+
+    def _fill(self, count):
+        """Move up to count rows from SQLite into the client buffer."""
+        with _lock:
+            try:
+                rows = self._cursor.fetchmany(count)
+            except sqlite3.Error as e:
+                raise DatabaseError(str(e)) from e
+        if len(rows) < count:
+            self._exhausted = True
+        stats["rows_fetched"] += len(rows)
+        self._buffer.extend(rows)
+
+    def _next_batch(self):
+        if not self._buffer and not self._exhausted:
+            round_trip()
+            self._fill(max(self.arraysize, 1))
+
+    def fetchone(self):
+        self._next_batch()
+        return self._buffer.pop(0) if self._buffer else None
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        rows = []
+        while len(rows) < size:
+            self._next_batch()
+            if not self._buffer:
+                break
+            take = size - len(rows)
+            rows.extend(self._buffer[:take])
+            del self._buffer[:take]
+        return rows
+
+    def fetchall(self):
+        rows = []
+        while True:
+            self._next_batch()
+            if not self._buffer:
+                return rows
+            rows.extend(self._buffer)
+            self._buffer = []
+
+
+def _text_contains(text, query):
+    """CONTAINS(column, '{words}') stand-in: score 1 when every word occurs in the text."""
+    if text is None or query is None:
+        return 0
+    words = query.strip("{}").replace("}}", "}").upper().split()
+    return int(all(word in str(text).upper() for word in words))
+
+
+class Connection:
+    def __init__(self, **params):
+        self.params = params
+        self._sqlite = sqlite3.connect(_DATABASE_URI, uri=True, check_same_thread=False,
+                                       detect_types=sqlite3.PARSE_DECLTYPES)
+        self._sqlite.execute("PRAGMA read_uncommitted = true")
+        self._sqlite.execute("PRAGMA case_sensitive_like = true")  # LIKE is case-sensitive in Oracle
+        self._sqlite.create_function("CONTAINS", 2, _text_contains, deterministic=True)
+        self._sqlite.create_function("TO_CHAR", 1, lambda value: None if value is None else str(value),
+                                     deterministic=True)
+        # SQLite rowids are integers; Oracle ROWIDs travel as text
+        self._sqlite.create_function("ROWIDTOCHAR", 1, lambda value: None if value is None else str(value),
+                                     deterministic=True)
+        self._sqlite.create_function("CHARTOROWID", 1, lambda value: None if value is None else int(value),
+                                     deterministic=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def cursor(self):
+        return Cursor(self)
+
+    def commit(self):
+        round_trip()
+        with _lock:
+            self._sqlite.commit()
+
+    def rollback(self):
+        round_trip()
+        with _lock:
+            self._sqlite.rollback()
+
+    def cancel(self):
+        self._sqlite.interrupt()
+
+    def ping(self):
+        round_trip()
+
+    def close(self):
+        self._sqlite.close()
+
+
+class ConnectionPool:
+    def __init__(self, **params):
+        self.params = params
+
+    def acquire(self):
+        return Connection(**self.params)
+
+    def release(self, connection):
+        connection.close()
+
+    def close(self, force=False):
+        pass
+
+
+def connect(**params):
+    time.sleep(connect_latency)
+    return Connection(**params)
+
+
+def create_pool(**params):
+    time.sleep(connect_latency)
+    return ConnectionPool(**params)
+
+
+def parse_column_type(declared_type):
+    """Split an Oracle column type such as NUMBER(5,2) into its dictionary attributes."""
+    match = re.match(r"\s*(\w+)\s*(?:\(\s*(\d+)\s*(?:,\s*(\d+)\s*)?\))?", declared_type or "VARCHAR2")
+    data_type = match.group(1).upper()
+    size = int(match.group(2)) if match.group(2) else None
+    scale = int(match.group(3)) if match.group(3) else None
+    if data_type == "NUMBER":
+        return data_type, 22, size, scale
+    if data_type == "DATE":
+        return data_type, 7, None, None
+    return data_type, size or 4000, None, None
+
+
+def refresh_dictionary():
+    """Rebuild the user_* dictionary tables from the SQLite schema."""
+    with _lock:
+        _keeper.executescript("""
+            DROP TABLE IF EXISTS user_tables;
+            DROP TABLE IF EXISTS user_tab_columns;
+            DROP TABLE IF EXISTS user_constraints;
+            DROP TABLE IF EXISTS user_cons_columns;
+            DROP TABLE IF EXISTS user_indexes;
+            DROP TABLE IF EXISTS user_ind_columns;
+            CREATE TABLE user_tables (table_name TEXT);
+            CREATE TABLE user_tab_columns (
+                table_name TEXT, column_name TEXT, data_type TEXT, data_length INTEGER,
+                data_precision INTEGER, data_scale INTEGER, nullable TEXT, column_id INTEGER
+            );
+            CREATE TABLE user_constraints (constraint_name TEXT, constraint_type TEXT, table_name TEXT);
+            CREATE TABLE user_cons_columns (constraint_name TEXT, table_name TEXT, column_name TEXT, position INTEGER);
+            CREATE TABLE user_indexes (
+                index_name TEXT, table_name TEXT, index_type TEXT, uniqueness TEXT, ityp_name TEXT
+            );
+            CREATE TABLE user_ind_columns (index_name TEXT, table_name TEXT, column_name TEXT, column_position INTEGER);
+        """)
+        tables = [row[0] for row in _keeper.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'user\\_%' ESCAPE '\\' "
+            "AND name <> 'plan_table'"
+        )]
+        for table_name in tables:
+            _keeper.execute("INSERT INTO user_tables VALUES (?)", (table_name,))
+            primary_key = []
+            for column_id, name, declared_type, not_null, _, key_position in _keeper.execute(
+                    f"PRAGMA table_info({table_name})").fetchall():
+                data_type, data_length, precision, scale = parse_column_type(declared_type)
+                _keeper.execute(
+                    "INSERT INTO user_tab_columns VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (table_name, name, data_type, data_length, precision, scale,
+                     "N" if not_null or key_position else "Y", column_id + 1)
+                )
+                if key_position:
+                    primary_key.append((key_position, name))
+
+            if primary_key:
+                # SQLite backs the primary key with an automatic index, as Oracle does
+                constraint_name = f"{table_name}_PK"
+                _keeper.execute("INSERT INTO user_constraints VALUES (?, 'P', ?)", (constraint_name, table_name))
+                _keeper.execute("INSERT INTO user_indexes VALUES (?, ?, 'NORMAL', 'UNIQUE', NULL)",
+                                (constraint_name, table_name))
+                for position, name in sorted(primary_key):
+                    _keeper.execute("INSERT INTO user_cons_columns VALUES (?, ?, ?, ?)",
+                                    (constraint_name, table_name, name, position))
+                    _keeper.execute("INSERT INTO user_ind_columns VALUES (?, ?, ?, ?)",
+                                    (constraint_name, table_name, name, position))
+
+            for _, index_name, unique, origin, _ in _keeper.execute(f"PRAGMA index_list({table_name})").fetchall():
+                if origin == "pk":
+                    continue
+                _keeper.execute("INSERT INTO user_indexes VALUES (?, ?, 'NORMAL', ?, NULL)",
+                                (index_name.upper(), table_name, "UNIQUE" if unique else "NONUNIQUE"))
+                for position, _, name in _keeper.execute(f"PRAGMA index_info({index_name})").fetchall():
+                    _keeper.execute("INSERT INTO user_ind_columns VALUES (?, ?, ?, ?)",
+                                    (index_name.upper(), table_name, name, position + 1))
+
+            for name in text_indexes.get(table_name.upper(), ()):
+                index_name = f"{table_name}_{name}_CTX".upper()
+                _keeper.execute("INSERT INTO user_indexes VALUES (?, ?, 'DOMAIN', 'NONUNIQUE', 'CONTEXT')",
+                                (index_name, table_name))
+                _keeper.execute("INSERT INTO user_ind_columns VALUES (?, ?, ?, 1)", (index_name, table_name, name))
+        _keeper.commit()
+
+
+def create_table(table_name, columns, rows=(), indexes=(), context_indexes=(), primary_key=()):
+    """
+    Create and fill a table directly, without simulated round trips.
+    :param table_name: Name of the table.
+    :param columns: List of (column name, Oracle column definition) pairs.
+    :param primary_key: Columns of a composite primary key.
+    :param rows: Iterable of row tuples.
+    :param indexes: Iterable of column lists to create non-unique indexes on.
+    :param context_indexes: Columns reported as having an Oracle Text (CONTEXT) index.
+    """
+    text_indexes[table_name.upper()] = [name.upper() for name in context_indexes]
+    definitions = ", ".join(f"{name} {definition}" for name, definition in columns)
+    if primary_key:
+        definitions += f", PRIMARY KEY ({', '.join(primary_key)})"
+    placeholders = ", ".join("?" for _ in columns)
+    with _lock:
+        _keeper.execute(f"DROP TABLE IF EXISTS {table_name}")
+        _keeper.execute(f"CREATE TABLE {table_name} ({definitions})")
+        _keeper.executemany(f"INSERT INTO {table_name} VALUES ({placeholders})", rows)
+        for index_columns in indexes:
+            index_name = f"{table_name}_{'_'.join(index_columns)}_IDX"
+            _keeper.execute(f"CREATE INDEX {index_name} ON {table_name} ({', '.join(index_columns)})")
+        _keeper.commit()
+    refresh_dictionary()
+
+
+with _lock:
+    _keeper.execute("CREATE TABLE IF NOT EXISTS plan_table (statement_id TEXT, plan_table_output TEXT)")
+refresh_dictionary()
@@ -0,0 +1,118 @@
+"""
+Synthetic tables shaped like the schema of the project's SQL script
+(FACULTATE, DEPARTAMENT, SERIE, GRUPA, STUDENT, DISCIPLINA, PROFESOR,
+PROGRAMA, CONTRACT_DE_STUDII and PREDARE), generated deterministically at
+any scale so benchmark runs are comparable.
+"""
+import datetime
+import random
+
+# Table name -> (columns as (name, Oracle definition) pairs, composite primary key, indexed column lists)
+TABLES = {
+    "FACULTATE": ([
+        ("ID", "NUMBER(5,0) PRIMARY KEY"), ("NUME", "VARCHAR2(50) NOT NULL"), ("ADRESA", "VARCHAR2(100) NOT NULL"),
+        ("TELEFON", "VARCHAR2(15) NOT NULL"), ("EMAIL", "VARCHAR2(50) NOT NULL"),
+    ], (), [("NUME",)]),
+    "DEPARTAMENT": ([
+        ("ID", "NUMBER(5,0) PRIMARY KEY"), ("ID_FACULTATE", "NUMBER(5,0)"), ("NUME", "VARCHAR2(50) NOT NULL"),
+        ("DURATA", "NUMBER(2,0) NOT NULL"),
+    ], (), [("ID_FACULTATE",)]),
+    "SERIE": ([
+        ("ID", "NUMBER(5,0) PRIMARY KEY"), ("ID_DEPARTAMENT", "NUMBER(5,0)"), ("NUME", "VARCHAR2(50) NOT NULL"),
+    ], (), [("ID_DEPARTAMENT",)]),
+    "GRUPA": ([
+        ("ID", "NUMBER(5,0) PRIMARY KEY"), ("ID_SERIE", "NUMBER(5,0)"), ("NUME", "VARCHAR2(50) NOT NULL"),
+    ], (), [("ID_SERIE",)]),
+    "STUDENT": ([
+        ("ID", "NUMBER(10,0) PRIMARY KEY"), ("NUME", "VARCHAR2(50) NOT NULL"), ("PRENUME", "VARCHAR2(50) NOT NULL"),
+        ("NATIONALITATE", "VARCHAR2(50) NOT NULL"), ("MEDIE_ADMITERE", "NUMBER(5,2) NOT NULL"),
+        ("CNP", "VARCHAR2(16) NOT NULL"), ("MAIL", "VARCHAR2(50) NOT NULL"), ("TELEFON", "VARCHAR2(15) NOT NULL"),
+    ], (), [("NUME",), ("MAIL",)]),
+    "DISCIPLINA": ([
+        ("ID", "NUMBER(5,0) PRIMARY KEY"), ("NUME", "VARCHAR2(50) NOT NULL"),
+    ], (), [("NUME",)]),
+    "PROFESOR": ([
+        ("ID", "NUMBER(10,0) PRIMARY KEY"), ("NUME", "VARCHAR2(50) NOT NULL"), ("PRENUME", "VARCHAR2(50) NOT NULL"),
+        ("MAIL", "VARCHAR2(50) NOT NULL"), ("SALARIU", "NUMBER(7,2) NOT NULL"), ("TELEFON", "VARCHAR2(15) NOT NULL"),
+    ], (), [("MAIL",)]),
+    "PROGRAMA": ([
+        ("SERIE_ID", "NUMBER(5,0)"), ("DISCIPLINA_ID", "NUMBER(5,0)"), ("NR_ORE", "NUMBER(3,0) NOT NULL"),
+        ("NR_CREDITE", "NUMBER(3,0) NOT NULL"),
+    ], ("SERIE_ID", "DISCIPLINA_ID"), []),
+    "CONTRACT_DE_STUDII": ([
+        ("GRUPA_ID", "NUMBER(5,0)"), ("STUDENT_ID", "NUMBER(10,0)"), ("FORMA_FINANTARE", "VARCHAR2(10) NOT NULL"),
+        ("DATA_INCEPERE", "DATE"), ("DATA_FINALIZARE", "DATE"),
+    ], ("GRUPA_ID", "STUDENT_ID"), [("STUDENT_ID",)]),
+    "PREDARE": ([
+        ("PROFESOR_ID", "NUMBER(10,0)"), ("DISCIPLINA_ID", "NUMBER(5,0)"), ("SALA", "NUMBER(10,0)"),
+    ], ("PROFESOR_ID", "DISCIPLINA_ID"), []),
+}
+
+LAST_NAMES = ["Popescu", "Ionescu", "Popa", "Dumitru", "Stan", "Stoica", "Gheorghe", "Rusu", "Munteanu", "Matei",
+              "Constantin", "Serban", "Moldovan", "Lazar", "Florea", "Dinu", "Barbu", "Nistor", "Ene", "Toma"]
+FIRST_NAMES = ["Alex", "Maria", "Andrei", "Elena", "Mihai", "Ioana", "Stefan", "Ana", "Vlad", "Cristina",
+               "Radu", "Diana", "Matei", "Irina", "Bogdan", "Alina", "Tudor", "Raluca", "Paul", "Oana"]
+NATIONALITIES = ["Roman", "Moldovean", "Bulgar", "Maghiar", "Italian", "Francez"]
+SUBJECTS = ["Algebra", "Analiza", "Geometrie", "Programare", "Baze de date", "Retele", "Fizica", "Chimie",
+            "Drept civil", "Drept penal", "Statistica", "Logica", "Grafica", "Compilatoare", "Securitate"]
+
+
+def table_sizes(students):
+    """Row counts of every table for a given number of students."""
+    professors = max(students // 50, 10)
+    return {
+        "FACULTATE": 10, "DEPARTAMENT": 40, "SERIE": 200, "GRUPA": 800, "STUDENT": students,
+        "DISCIPLINA": 300, "PROFESOR": professors, "PROGRAMA": 200 * 10, "CONTRACT_DE_STUDII": students,
+        "PREDARE": professors * 3,
+    }
+
+
+def generate_rows(table_name, students, seed=262):
+    """
+    Generate the rows of one table as tuples in column order.
+    :param table_name: One of TABLES.
+    :param students: Number of students; the other tables are sized from it (see table_sizes).
+    :param seed: Seed of the random generator, so every run produces the same data.
+    """
+    generator = random.Random(f"{seed}-{table_name}")
+    count = table_sizes(students)[table_name]
+    if table_name == "FACULTATE":
+        return [(i, f"Facultatea {i}", f"Str Academiei, nr. {i * 3}", f"021{i:07d}", f"facultate{i}@unibuc.ro")
+                for i in range(1, count + 1)]
+    if table_name == "DEPARTAMENT":
+        return [(i, (i - 1) // 4 + 1, f"Departament {i}", generator.choice((3, 4))) for i in range(1, count + 1)]
+    if table_name == "SERIE":
+        return [(i, (i - 1) // 5 + 1, f"Seria {chr(65 + (i - 1) % 5)}{i}") for i in range(1, count + 1)]
+    if table_name == "GRUPA":
+        return [(i, (i - 1) // 4 + 1, f"Grupa {(i - 1) % 4 + 1}") for i in range(1, count + 1)]
+    if table_name == "STUDENT":
+        rows = []
+        for i in range(1, count + 1):
+            last_name, first_name = generator.choice(LAST_NAMES), generator.choice(FIRST_NAMES)
+            rows.append((i, last_name, first_name, generator.choice(NATIONALITIES),
+                         round(generator.uniform(5, 10), 2), f"{generator.choice((5, 6))}{i:012d}",
+                         f"{last_name.lower()}.{first_name.lower()}{i}@unibuc.ro", f"07{i:08d}"))
+        return rows
+    if table_name == "DISCIPLINA":
+        return [(i, f"{SUBJECTS[(i - 1) % len(SUBJECTS)]} {(i - 1) // len(SUBJECTS) + 1}") for i in range(1, count + 1)]
+    if table_name == "PROFESOR":
+        rows = []
+        for i in range(1, count + 1):
+            last_name, first_name = generator.choice(LAST_NAMES), generator.choice(FIRST_NAMES)
+            rows.append((i, last_name, first_name, f"{first_name.lower()}.{last_name.lower()}{i}@unibuc.ro",
+                         round(generator.uniform(3000, 12000), 2), f"074{i:07d}"))
+        return rows
+    if table_name == "PROGRAMA":
+        return [(serie, discipline, generator.choice((28, 42, 56)), generator.choice((4, 5, 6)))
+                for serie in range(1, 201) for discipline in generator.sample(range(1, 301), 10)]
+    if table_name == "CONTRACT_DE_STUDII":
+        rows = []
+        for student in range(1, count + 1):
+            start = datetime.datetime(2019, 9, 1) + datetime.timedelta(days=generator.randrange(5 * 365))
+            rows.append((generator.randrange(1, 801), student, generator.choice(("buget", "taxa")),
+                         start, start + datetime.timedelta(days=365)))
+        return rows
+    if table_name == "PREDARE":
+        return [(professor, discipline, generator.randrange(100, 400))
+                for professor in range(1, count // 3 + 1) for discipline in generator.sample(range(1, 301), 3)]
+    raise ValueError(f"Unknown table {table_name}.")
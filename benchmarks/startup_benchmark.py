@@ -0,0 +1,137 @@
+"""
+Measures the cold start of the viewer: each run starts a fresh interpreter
+that builds the window the way main.py does, on the offscreen platform and
+with fake_oracledb (SQLite) as the driver, and reports
+
+    imports       importing UserInterface (PyQt and the application modules)
+    first paint   interpreter start until the main window is first painted
+    tables        interpreter start until the table list is filled
+
+The time spent creating the benchmark tables is left out. The script exits
+with status 1 when the median first paint exceeds the budget, or when NumPy or
+matplotlib were imported before it (they are meant to load on first use).
+
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --budget-ms 800 --connect-latency 500 --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFERRED_MODULES = ("numpy", "matplotlib")
+
+
+def run_child(args):
+    """Start the viewer in this process and print its timings as JSON."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+    sys.path.insert(0, BENCHMARKS_DIR)
+    setup_start = time.time()
+    import fake_oracledb
+    import project_schema
+
+    for table_name, (columns, primary_key, indexes) in project_schema.TABLES.items():
+        fake_oracledb.create_table(table_name, columns, (), indexes, primary_key=primary_key)
+    fake_oracledb.round_trip_latency = args.latency / 1000
+    fake_oracledb.connect_latency = args.connect_latency / 1000
+    sys.modules["oracledb"] = fake_oracledb
+    setup = time.time() - setup_start
+
+    import_start = time.time()
+    import UserInterface
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+    imports = time.time() - import_start
+
+    timings = {}
+
+    class PaintWatcher(QObject):
+        """Notes when the window is painted for the first time."""
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Paint and "first_paint" not in timings:
+                timings["first_paint"] = time.time()
+                timings["deferred_loaded"] = [name for name in DEFERRED_MODULES if name in sys.modules]
+            return False
+
+    app = UserInterface.QApplication(sys.argv[:1])
+    db = UserInterface.OracleDatabase("bench", "bench", "localhost/fake", use_pool=True, pool_min=1, pool_max=4,
+                                      result_cache_bytes=64 * 1024 * 1024)
+    viewer = UserInterface.DatabaseViewer(db)
+    watcher = PaintWatcher()
+    viewer.installEventFilter(watcher)
+    viewer.show()
+
+    def check_loaded():
+        if viewer.table_selector.count() and "first_paint" in timings:
+            timings["tables"] = time.time()
+            app.quit()
+
+    poll = QTimer()
+    poll.timeout.connect(check_loaded)
+    poll.start(1)
+    QTimer.singleShot(int(args.timeout * 1000), app.quit)
+    app.exec_()
+    viewer.executor.wait_for_done()
+    db.close()
+
+    if "tables" not in timings:
+        raise SystemExit("The table list was not loaded before the timeout")
+    print(json.dumps({
+        "imports_ms": imports * 1000,
+        "first_paint_ms": (timings["first_paint"] - args.launched - setup) * 1000,
+        "tables_ms": (timings["tables"] - args.launched - setup) * 1000,
+        "deferred_loaded": timings["deferred_loaded"],
+    }))
+
+
+def measure(args):
+    """Run the viewer in a fresh interpreter and return its timings."""
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--latency", str(args.latency),
+               "--connect-latency", str(args.connect_latency), "--timeout", str(args.timeout),
+               "--launched", repr(time.time())]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="cold starts to measure")
+    parser.add_argument("--budget-ms", type=float, default=1000, help="allowed median time to first paint")
+    parser.add_argument("--latency", type=float, default=0.5, help="simulated round trip latency in milliseconds")
+    parser.add_argument("--connect-latency", type=float, default=200,
+                        help="simulated time to log on, in milliseconds")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for the table list")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--launched", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args)
+        return 0
+
+    runs = [measure(args) for _ in range(args.repeat)]
+    print(f"{'':<12} {'median ms':>10} {'min ms':>10}")
+    for name, key in (("imports", "imports_ms"), ("first paint", "first_paint_ms"), ("tables", "tables_ms")):
+        values = [run[key] for run in runs]
+        print(f"{name:<12} {statistics.median(values):>10.1f} {min(values):>10.1f}")
+
+    failures = []
+    first_paint = statistics.median(run["first_paint_ms"] for run in runs)
+    if first_paint > args.budget_ms:
+        failures.append(f"median first paint {first_paint:.1f} ms exceeds the budget of {args.budget_ms:.0f} ms")
+    loaded = sorted({name for run in runs for name in run["deferred_loaded"]})
+    if loaded:
+        failures.append(f"{', '.join(loaded)} imported before the first paint")
+    if not failures:
+        print(f"Within the startup budget of {args.budget_ms:.0f} ms.")
+        return 0
+    for failure in failures:
+        print(failure)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,12 +6,15 @@ if __name__ == "__main__":
     password = "1234"
     dsn = "localhost:1521/xe"  # e.g., "hostname:port/service_name"
 
-    db = OracleDatabase(user, password, dsn)
-    db.connect()
+    db = OracleDatabase(user, password, dsn, use_pool=True, pool_min=1, pool_max=4,
+                        result_cache_bytes=64 * 1024 * 1024, result_ttl=60)
+    # Cached pages are read again after a minute, or at once with Refresh (F5), to show other sessions' commits
+    # The viewer connects in the background once its window is shown
 
     app = QApplication(sys.argv)
     viewer = DatabaseViewer(db)
     viewer.show()
     app.exec_()
 
+    viewer.executor.wait_for_done()
     db.close()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import datetime
+import decimal
+
+import numpy as np
+import pytest
+
+from ColumnarResult import ColumnarResult, StringColumn
+
+COLUMNS = ["ID", "NUME", "MEDIE", "DATA"]
+ROWS = [
+    (1, "Ana", 9.5, datetime.datetime(2024, 1, 1)),
+    (2, "Bogdan", None, datetime.datetime(2024, 1, 2)),
+    (3, None, 7.25, None),
+    (4, "Dan", 8.0, datetime.datetime(2024, 1, 4)),
+]
+
+
+def make_result(rows=ROWS):
+    return ColumnarResult.from_rows(rows, COLUMNS)
+
+
+def test_from_rows_uses_typed_columns():
+    result = make_result()
+    assert result.arrays[0].dtype == np.int64
+    assert isinstance(result.arrays[1], StringColumn)
+    assert result.arrays[2].dtype == np.float64
+    assert result.arrays[3].dtype.kind == "M"
+    assert list(result.rows()) == ROWS
+
+
+def test_replace_rows():
+    result = make_result()
+    edited = ColumnarResult.from_rows([(2, "Bogdana", 6.5, None), (4, None, None, datetime.datetime(2025, 5, 5))],
+                                      COLUMNS)
+    replaced = result.replace_rows([3, 1], edited)
+    assert list(replaced.rows()) == [
+        ROWS[0],
+        (4, None, None, datetime.datetime(2025, 5, 5)),
+        ROWS[2],
+        (2, "Bogdana", 6.5, None),
+    ]
+    # The original result is left unchanged
+    assert list(result.rows()) == ROWS
+
+
+def test_replace_rows_with_a_row_of_nulls_keeps_the_column_types():
+    replaced = make_result().replace_rows([0], ColumnarResult.from_rows([(1, None, None, None)], COLUMNS))
+    assert replaced.arrays[2].dtype == np.float64
+    assert replaced.arrays[3].dtype.kind == "M"
+    assert replaced.row(0)[1] is None and replaced.row(1)[1] == "Bogdan"
+
+
+def test_remove_rows():
+    result = make_result()
+    assert list(result.remove_rows([0, 2]).rows()) == [ROWS[1], ROWS[3]]
+    assert len(result.remove_rows([])) == len(ROWS)
+    assert len(result.remove_rows([0, 1, 2, 3])) == 0
+
+
+def test_decimals_and_large_integers_stay_exact():
+    rows = [(decimal.Decimal("0.1"), 2 ** 60 + 1), (decimal.Decimal("0.2"), 0.5)]
+    result = ColumnarResult.from_rows(rows, ["A", "B"])
+    assert result.arrays[0].dtype == object and result.arrays[1].dtype == object
+    assert list(result.rows()) == rows
+    # Graphs still get floats
+    assert result.column_array(0).dtype == np.float64
+
+
+
+def test_arrow_decimals_stay_exact():
+    pyarrow = pytest.importorskip("pyarrow")
+    D = decimal.Decimal
+    table = pyarrow.table({
+        "COUNT": pyarrow.array([D(1), D(20)], pyarrow.decimal128(38, 10)),
+        "PRICE": pyarrow.array([D("2.50"), D(3)], pyarrow.decimal128(10, 2)),
+        "BIG": pyarrow.array([D(10 ** 30), None], pyarrow.decimal128(38, 0)),
+        "ID": pyarrow.array([D(7), None], pyarrow.decimal128(10, 0)),
+    })
+    result = ColumnarResult.from_arrow(table)
+    assert result.arrays[0].dtype == np.int64 and result.arrays[2].dtype == object
+    assert list(result.rows()) == [(1, D("2.5"), 10 ** 30, 7), (20, 3, None, None)]
+    assert str(result.value(0, 0)) == "1" and type(result.value(1, 1)) is int
+
+def test_concatenate_keeps_large_integers_exact():
+    joined = ColumnarResult.concatenate([ColumnarResult.from_rows([(2 ** 60 + 1,)], ["A"]),
+                                         ColumnarResult.from_rows([(0.5,)], ["A"])])
+    assert joined.value(0, 0) == 2 ** 60 + 1
+    small = ColumnarResult.concatenate([ColumnarResult.from_rows([(1,)], ["A"]),
+                                        ColumnarResult.from_rows([(0.5,)], ["A"])])
+    assert small.arrays[0].dtype == np.float64
@@ -0,0 +1,153 @@
+import datetime
+import decimal
+
+import pytest
+
+from FilterPlanner import Filter, FilterPlanner, RangeCondition, TextCondition
+from MetadataCache import ColumnMetadata, IndexMetadata, TableMetadata
+
+
+def make_metadata(indexes=(), context_indexes=()):
+    metadata = TableMetadata("STUDENT")
+    metadata.columns = [
+        ColumnMetadata("ID", "NUMBER", 22, 10, 0),
+        ColumnMetadata("MEDIE", "NUMBER", 22, 4, 2),
+        ColumnMetadata("NUME", "VARCHAR2", 50),
+        ColumnMetadata("DESCRIERE", "VARCHAR2", 4000),
+        ColumnMetadata("DATA_NASTERE", "DATE", 7),
+    ]
+    for column_name in indexes:
+        index = IndexMetadata(f"{column_name}_IDX", "NORMAL", False)
+        index.columns.append(column_name)
+        metadata.indexes[index.name] = index
+    for column_name in context_indexes:
+        index = IndexMetadata(f"{column_name}_CTX", "DOMAIN", False, "CONTEXT")
+        index.columns.append(column_name)
+        metadata.indexes[index.name] = index
+    return metadata
+
+
+@pytest.fixture
+def planner():
+    return FilterPlanner(make_metadata())
+
+
+def bounds(condition):
+    return condition.low, condition.high, condition.include_low, condition.include_high
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("5", (5, 5, True, True)),
+    (" = 5 ", (5, 5, True, True)),
+    (">= 10", (10, None, True, True)),
+    ("> 10", (10, None, False, True)),
+    ("<= 10", (None, 10, True, True)),
+    ("< 10", (None, 10, True, False)),
+    ("1..20", (1, 20, True, True)),
+    ("..20", (None, 20, True, True)),
+    ("1.5..", (decimal.Decimal("1.5"), None, True, True)),
+])
+def test_parse_range_numbers(planner, text, expected):
+    assert bounds(planner.parse_range(text, planner.column("ID"))) == expected
+
+
+def test_parse_range_date_without_time_covers_the_whole_day(planner):
+    column = planner.column("DATA_NASTERE")
+    day, next_day = datetime.datetime(2024, 1, 31), datetime.datetime(2024, 2, 1)
+    assert bounds(planner.parse_range("2024-01-31", column)) == (day, next_day, True, False)
+    assert bounds(planner.parse_range("> 2024-01-31", column)) == (next_day, None, True, True)
+    assert bounds(planner.parse_range("<= 2024-01-31", column)) == (None, next_day, True, False)
+    assert bounds(planner.parse_range("2024-01-01..2024-01-31", column)) == \
+        (datetime.datetime(2024, 1, 1), next_day, True, False)
+
+
+def test_parse_range_date_with_time_is_exact(planner):
+    moment = datetime.datetime(2024, 1, 31, 12, 30)
+    assert bounds(planner.parse_range("2024-01-31 12:30:00", planner.column("DATA_NASTERE"))) == \
+        (moment, moment, True, True)
+
+
+def test_parse_range_rejects_text(planner):
+    with pytest.raises((ValueError, ArithmeticError)):
+        planner.parse_range("abc", planner.column("ID"))
+
+
+@pytest.mark.parametrize("text", ["nan", "NaN", "inf", "-Infinity", "sNaN", ">= inf", "1..nan"])
+def test_parse_range_rejects_numbers_oracle_cannot_hold(planner, text):
+    with pytest.raises(ValueError):
+        planner.parse_range(text, planner.column("ID"))
+    condition = planner.condition("ID", text)
+    assert isinstance(condition, TextCondition)
+    assert planner.plan({"ID": text})[0] == " WHERE UPPER(TO_CHAR(ID)) LIKE :filter0 ESCAPE '\\'"
+
+
+def test_condition_falls_back_to_text_for_values_that_do_not_parse(planner):
+    condition = planner.condition("ID", "abc")
+    assert isinstance(condition, TextCondition)
+    assert condition.mode == "contains"
+
+
+def test_prefix_mode_matches_the_text_of_numbers(planner):
+    condition = planner.condition("ID", Filter("12", "prefix"))
+    assert isinstance(condition, TextCondition)
+    assert planner.predicate("ID", condition, "f") == ("UPPER(TO_CHAR(ID)) LIKE :f ESCAPE '\\'", {"f": "12%"})
+
+
+def test_predicate_for_ranges(planner):
+    assert planner.predicate("ID", planner.condition("ID", "5"), "f") == ("ID = :f", {"f": 5})
+    assert planner.predicate("ID", planner.condition("ID", "1..20"), "f") == \
+        ("ID >= :f AND ID <= :f_high", {"f": 1, "f_high": 20})
+    assert planner.predicate("ID", planner.condition("ID", "< 3"), "f") == ("ID < :f_high", {"f_high": 3})
+    assert planner.predicate("ID", RangeCondition(), "f") == ("ID IS NOT NULL", {})
+
+
+def test_predicate_for_text_modes(planner):
+    assert planner.predicate("NUME", planner.condition("NUME", "ab"), "f") == \
+        ("UPPER(NUME) LIKE :f ESCAPE '\\'", {"f": "%AB%"})
+    assert planner.predicate("NUME", planner.condition("NUME", Filter("ab", "prefix")), "f") == \
+        ("UPPER(NUME) LIKE :f ESCAPE '\\'", {"f": "AB%"})
+    assert planner.predicate("NUME", planner.condition("NUME", Filter("Ab", "exact")), "f") == \
+        ("NUME = :f", {"f": "Ab"})
+
+
+def test_predicate_escapes_like_wildcards(planner):
+    _, parameters = planner.predicate("NUME", planner.condition("NUME", "50%_a\\b"), "f")
+    assert parameters == {"f": "%50\\%\\_A\\\\B%"}
+
+
+def test_prefix_filters_do_not_depend_on_indexes():
+    without_index = FilterPlanner(make_metadata()).plan({"NUME": Filter("Pop", "prefix")})
+    with_index = FilterPlanner(make_metadata(indexes=["NUME"])).plan({"NUME": Filter("Pop", "prefix")})
+    assert with_index == without_index
+
+
+def test_contains_uses_oracle_text_index():
+    planner = FilterPlanner(make_metadata(context_indexes=["DESCRIERE"]))
+    assert planner.predicate("DESCRIERE", planner.condition("DESCRIERE", "a}b"), "f") == \
+        ("CONTAINS(DESCRIERE, :f) > 0", {"f": "{a}}b}"})
+
+
+def test_plan_skips_empty_filters(planner):
+    assert planner.plan({"NUME": "", "ID": None}) == ("", {})
+    clause, parameters = planner.plan({"NUME": "ab", "ID": ">= 3"})
+    assert clause == " WHERE UPPER(NUME) LIKE :filter0 ESCAPE '\\' AND ID >= :filter1"
+    assert parameters == {"filter0": "%AB%", "filter1": 3}
+
+
+@pytest.mark.parametrize("column_name, value, other_value, expected", [
+    ("NUME", "abc", "ab", True),
+    ("NUME", "ab", "abc", False),
+    ("NUME", "xaby", "ab", True),
+    ("NUME", Filter("abc", "prefix"), Filter("ab", "prefix"), True),
+    ("NUME", Filter("xab", "prefix"), Filter("ab", "prefix"), False),
+    ("NUME", Filter("ab", "prefix"), "ab", False),
+    ("NUME", Filter("Ab", "exact"), Filter("ab", "exact"), False),
+    ("ID", "5", ">= 3", True),
+    ("ID", "2..4", "1..5", True),
+    ("ID", "1..5", "2..4", False),
+    ("ID", "> 3", ">= 3", True),
+    ("ID", ">= 3", "> 3", False),
+    ("ID", "5", "abc", False),
+])
+def test_implies(planner, column_name, value, other_value, expected):
+    assert planner.implies(column_name, value, other_value) is expected
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+import LocalQueryEngine as local_query_engine
+from ColumnarResult import ColumnarResult, StringColumn
+from FilterPlanner import Filter, FilterPlanner
+from LocalQueryEngine import LocalQueryEngine, find_rows
+from MetadataCache import ColumnMetadata, TableMetadata
+
+ROWS = [
+    (1, "Popescu", 2, "b"),
+    (2, "Ionescu", 1, "a"),
+    (3, "Popa", 2, "a"),
+    (4, None, None, "c"),
+    (5, "popovici", 1, "b"),
+    (6, "Marin", 2, "a"),
+]
+
+
+def make_engine(rows=ROWS):
+    metadata = TableMetadata("STUDENT")
+    metadata.columns = [
+        ColumnMetadata("ID", "NUMBER", 22, 10, 0),
+        ColumnMetadata("NUME", "VARCHAR2", 50),
+        ColumnMetadata("AN", "NUMBER", 22, 1, 0),
+        ColumnMetadata("GRUPA", "VARCHAR2", 5),
+    ]
+    return LocalQueryEngine(ColumnarResult.from_rows(rows, ["ID", "NUME", "AN", "GRUPA"]), FilterPlanner(metadata))
+
+
+def ids(engine, rows):
+    return [engine.result.value(int(row), 0) for row in rows]
+
+
+@pytest.fixture
+def searched_rows(monkeypatch):
+    """Rows handed to find_rows by each text search (None for the whole column)."""
+    calls = []
+
+    def recording_find_rows(column, needle, rows=None, anchor="contains"):
+        calls.append(None if rows is None else rows.tolist())
+        return find_rows(column, needle, rows, anchor)
+
+    monkeypatch.setattr(local_query_engine, "find_rows", recording_find_rows)
+    return calls
+
+
+def test_find_rows_anchors():
+    column = StringColumn.from_values(["abc", "xabc", "ab", ""])
+    assert find_rows(column, b"ab").tolist() == [0, 1, 2]
+    assert find_rows(column, b"ab", anchor="prefix").tolist() == [0, 2]
+    assert find_rows(column, b"ab", anchor="exact").tolist() == [2]
+    assert find_rows(column, b"ab", np.array([1, 2, 3])).tolist() == [1, 2]
+
+
+def test_filter_matches_text_case_insensitively():
+    engine = make_engine()
+    assert ids(engine, engine.filter({"NUME": "pop"})) == [1, 3, 5]
+    assert ids(engine, engine.filter({"NUME": Filter("pop", "prefix"), "AN": "2"})) == [1, 3]
+
+
+def test_narrower_filter_only_searches_previous_matches(searched_rows):
+    engine = make_engine()
+    engine.filter({"NUME": "pop"})
+    assert ids(engine, engine.filter({"NUME": "pope"})) == [1]
+    assert searched_rows == [None, [0, 2, 4]]
+
+
+def test_wider_filter_searches_every_row_again(searched_rows):
+    engine = make_engine()
+    engine.filter({"NUME": "pope"})
+    assert ids(engine, engine.filter({"NUME": "po"})) == [1, 3, 5]
+    assert searched_rows == [None, None]
+
+
+def test_match_cache_is_dropped_with_the_result(searched_rows):
+    engine = make_engine()
+    engine.filter({"NUME": "pop"})
+    engine.remove_rows([0])
+    assert ids(engine, engine.filter({"NUME": "pope"})) == []
+    assert searched_rows == [None, None]
+
+
+@pytest.mark.parametrize("value", ["nan", "sNaN", "inf"])
+def test_repeating_a_non_finite_number_filter(value):
+    engine = make_engine()
+    for _ in range(2):
+        assert not engine.can_filter({"AN": value})
+        # Evaluated anyway, the value is matched as text instead of raising
+        assert ids(engine, engine.filter({"AN": value})) == []
+
+
+def test_range_filter_skips_nulls():
+    engine = make_engine()
+    assert ids(engine, engine.filter({"AN": ">= 1"})) == [1, 2, 3, 5, 6]
+
+
+def test_sort_by_several_keys():
+    engine = make_engine()
+    rows = np.arange(len(ROWS), dtype=np.int64)
+    # Nulls sort last ascending and first descending, as in Oracle
+    assert ids(engine, engine.sort(rows, [("AN", False), ("GRUPA", True)])) == [5, 2, 1, 3, 6, 4]
+    assert ids(engine, engine.sort(rows, [("AN", True), ("GRUPA", False)])) == [4, 3, 6, 1, 2, 5]
+
+
+def test_sort_keeps_the_current_order_of_ties():
+    engine = make_engine()
+    rows = np.array([5, 2, 0, 3, 1, 4], dtype=np.int64)
+    assert ids(engine, engine.sort(rows, [("GRUPA", False)])) == [6, 3, 2, 1, 5, 4]
+
+
+def test_text_filters_on_numbers_are_left_to_the_database():
+    engine = make_engine()
+    assert engine.can_filter({"NUME": "pop", "AN": ">= 1"})
+    assert not engine.can_filter({"AN": Filter("1", "prefix")})
+    assert not engine.can_filter({"AN": "abc"})
+
+
+def test_text_filters_on_numbers_without_metadata():
+    engine = LocalQueryEngine(ColumnarResult.from_rows([(1, "a"), (2, "b")], ["ID", "NUME"]))
+    assert engine.can_filter({"NUME": "a"})
+    assert not engine.can_filter({"ID": "1"})
@@ -0,0 +1,78 @@
+import ResultCache as result_cache
+from ResultCache import ResultCache
+
+ROWS = [(1, "a"), (2, "b")]
+COLUMNS = ["ID", "NUME"]
+ENTRY_SIZE = ResultCache.estimate_size(ROWS, COLUMNS)
+
+
+def key(name):
+    return ResultCache.make_key(f"SELECT * FROM {name}", {})
+
+
+def test_make_key_normalizes_whitespace_and_bind_order():
+    assert ResultCache.make_key("SELECT *\n  FROM t WHERE a = :a AND b = :b", {"b": 2, "a": 1}) == \
+        ResultCache.make_key("SELECT * FROM t WHERE a = :a AND b = :b", {"a": 1, "b": 2})
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_bytes=2 * ENTRY_SIZE)
+    cache.put(key("a"), "A", ROWS, COLUMNS)
+    cache.put(key("b"), "B", ROWS, COLUMNS)
+    assert cache.get(key("a")) is not None  # "b" is now the least recently used
+    cache.put(key("c"), "C", ROWS, COLUMNS)
+    assert cache.get(key("b")) is None
+    assert cache.get(key("a")) is not None and cache.get(key("c")) is not None
+    assert cache.size == 2 * ENTRY_SIZE
+
+
+def test_results_larger_than_the_cache_are_not_stored():
+    cache = ResultCache(max_bytes=ENTRY_SIZE - 1)
+    cache.put(key("a"), "A", ROWS, COLUMNS)
+    assert cache.get(key("a")) is None and cache.size == 0
+
+
+def test_replacing_an_entry_keeps_the_size_right():
+    cache = ResultCache(max_bytes=10 * ENTRY_SIZE)
+    cache.put(key("a"), "A", ROWS, COLUMNS)
+    cache.put(key("a"), "A", ROWS, COLUMNS)
+    assert len(cache.entries) == 1 and cache.size == ENTRY_SIZE
+
+
+def test_invalidate_one_table():
+    cache = ResultCache(max_bytes=10 * ENTRY_SIZE)
+    cache.put(key("a1"), "a", ROWS, COLUMNS)
+    cache.put(key("a2"), "A", ROWS, COLUMNS)
+    cache.put(key("b"), "B", ROWS, COLUMNS)
+    cache.invalidate("a")
+    assert cache.get(key("a1")) is None and cache.get(key("a2")) is None
+    assert cache.get(key("b")) is not None
+    assert cache.size == ENTRY_SIZE
+
+
+def test_invalidate_everything():
+    cache = ResultCache(max_bytes=10 * ENTRY_SIZE)
+    cache.put(key("a"), "A", ROWS, COLUMNS)
+    cache.put(key("b"), "B", ROWS, COLUMNS)
+    cache.invalidate()
+    assert not cache.entries and cache.size == 0
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = ResultCache(max_bytes=10 * ENTRY_SIZE, ttl=60)
+    cache.put(key("a"), "A", ROWS, COLUMNS)
+    now[0] += 59
+    assert cache.get(key("a")) is not None
+    now[0] += 2
+    assert cache.get(key("a")) is None
+    assert cache.size == 0
+
+
+def test_hits_and_misses_are_counted():
+    cache = ResultCache(max_bytes=10 * ENTRY_SIZE)
+    cache.get(key("a"))
+    cache.put(key("a"), "A", ROWS, COLUMNS)
+    cache.get(key("a"))
+    assert (cache.hits, cache.misses) == (1, 1)